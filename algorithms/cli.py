@@ -0,0 +1,142 @@
+"""
+Batch entry point: load points and ranges from files, run one strategy and
+write the indices of the selected points.
+
+    python -m algorithms.cli epsnet --points points.npy --colors colors.npy \\
+        --ranges ranges.npy --range-kind rectangle --vc 4 --epsilon 0.1 \\
+        --strategy auto --output epsnet.npy
+
+Indices are row numbers of the points file. Outputs ending in .npy are
+written with numpy, anything else as text (one index per line).
+"""
+
+import argparse
+import numpy as np
+
+from typing import List
+
+from core.fairness import FairConfig
+from core.loaders import RANGE_KINDS, load_points, load_ranges
+from algorithms.epsnet import EpsNetStrategy, HalvingStrategy, build_epsnet
+from algorithms.hittingset import HittingSetStrategy, find_hitting_set
+from algorithms.fairness.fair_epsnet import build_fair_epsnet
+from algorithms.fairness.fair_hittingset import find_fair_hitting_set
+
+
+def _columns(value: str) -> List[str]:
+    return value.split(",") if value else None
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m algorithms.cli", description=__doc__.split("\n\n")[0])
+    parser.add_argument("problem", choices=["epsnet", "hitting-set"])
+    parser.add_argument("--points", required=True, help=".npy, .csv or .parquet file")
+    parser.add_argument("--colors", help=".npy file with the colors (for .npy points)")
+    parser.add_argument("--weights", help=".npy file with the weights (for .npy points)")
+    parser.add_argument("--coord-columns", type=_columns, help="comma separated (CSV / Parquet)")
+    parser.add_argument("--color-column")
+    parser.add_argument("--weight-column")
+    parser.add_argument("--ranges", required=True, help=".npy, .csv or .parquet file")
+    parser.add_argument("--range-kind", choices=RANGE_KINDS, required=True)
+    parser.add_argument("--range-columns", type=_columns, help="comma separated (CSV / Parquet)")
+    parser.add_argument("--strategy", default="auto", help="strategy name, e.g. sample, disc, greedy, auto")
+    parser.add_argument("--guarantee", help="guarantee for the auto strategy")
+    parser.add_argument("--epsilon", type=float)
+    parser.add_argument("--vc", type=int)
+    parser.add_argument("--success-prob", type=float)
+    parser.add_argument("--c1", type=float)
+    parser.add_argument("--fair", type=int, metavar="K", help="fair variant with K colors")
+    parser.add_argument(
+        "--prune", action="store_true", help="hitting set: only geometric candidates (greedy, geometric)"
+    )
+    parser.add_argument(
+        "--halving",
+        choices=[h.value for h in HalvingStrategy],
+        help="eps-net: halving step (disc, sketch_merge)",
+    )
+    parser.add_argument("--chunksize", type=int, default=1_000_000, help="rows per CSV chunk")
+    parser.add_argument("--output", required=True)
+    return parser
+
+
+def run(args: argparse.Namespace) -> np.ndarray:
+    """Run the command and return the selected indices."""
+    point_array = load_points(
+        args.points,
+        coord_columns=args.coord_columns,
+        color_column=args.color_column,
+        weight_column=args.weight_column,
+        colors_path=args.colors,
+        weights_path=args.weights,
+        chunksize=args.chunksize,
+    )
+    range_array = load_ranges(args.ranges, args.range_kind, args.range_columns, args.chunksize)
+    print(f"[run] n: {len(point_array)}, m: {len(range_array)}, d: {point_array.dim}")
+    points = point_array.to_points()
+    ranges = range_array.to_ranges()
+
+    if args.problem == "epsnet":
+        strategy = EpsNetStrategy(args.strategy)
+        names = ["epsilon"] if strategy == EpsNetStrategy.KD_TREE else ["vc", "epsilon", "c1"]
+        if strategy in (EpsNetStrategy.SAMPLE, EpsNetStrategy.LAS_VEGAS, EpsNetStrategy.AUTO):
+            names.append("success_prob")
+        if strategy in (EpsNetStrategy.DISCREPANCY, EpsNetStrategy.SKETCH_MERGE) and args.fair is None:
+            names.append("halving")
+    else:
+        strategy = HittingSetStrategy(args.strategy)
+        names = ["c1"] if args.fair else []
+        if strategy in (HittingSetStrategy.GEOMETRIC, HittingSetStrategy.AUTO):
+            names.append("vc")
+    if strategy.value == "auto":
+        names.append("guarantee")
+    if args.problem == "epsnet" and strategy in (EpsNetStrategy.SAMPLE, EpsNetStrategy.KD_TREE):
+        rangespace = []  # never read
+    else:
+        # Rows are computed when a strategy reads them
+        rangespace = point_array.get_range_space(ranges, lazy=True)
+    kwargs = {"points": points, "rangespace": rangespace}
+    if args.problem == "hitting-set" and args.prune:
+        kwargs["ranges"] = ranges
+    elif args.problem == "epsnet" and strategy == EpsNetStrategy.AUTO:
+        kwargs["ranges"] = ranges  # lets the planner consider KD_TREE
+    for name in names:
+        if getattr(args, name) is not None:
+            kwargs[name] = getattr(args, name)
+    fairconfig = FairConfig(args.fair) if args.fair else None
+
+    if args.problem == "epsnet":
+        if strategy == EpsNetStrategy.SKETCH_MERGE:
+            kwargs.setdefault("c1", 0)
+        if fairconfig is None:
+            result = build_epsnet(strategy=strategy, **kwargs)
+        else:
+            if strategy == EpsNetStrategy.SAMPLE:
+                counts = np.bincount(point_array.colors, minlength=args.fair)
+                kwargs["color_ratios"] = (counts / len(points)).tolist()
+            result = build_fair_epsnet(strategy=strategy, fairconfig=fairconfig, **kwargs)
+    else:
+        if fairconfig is None:
+            result = find_hitting_set(strategy=strategy, **kwargs)
+        else:
+            result = find_fair_hitting_set(strategy=strategy, fairconfig=fairconfig, **kwargs)
+
+    position = {p: i for i, p in enumerate(points)}
+    return np.asarray(sorted({position[p] for p in result}), dtype=np.int64)
+
+
+def write_indices(path: str, indices: np.ndarray):
+    if path.endswith(".npy"):
+        np.save(path, indices)
+    else:
+        np.savetxt(path, indices, fmt="%d")
+
+
+def main(argv: List[str] = None):
+    args = get_parser().parse_args(argv)
+    indices = run(args)
+    write_indices(args.output, indices)
+    print(f"[main] wrote {len(indices)} indices to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+from typing import Iterable, List
+
+from core.points import Point
+from core.fairness import FairConfig
+from core.sampling import WeightedReservoir
+from algorithms.epsnet import get_epsnet_size
+from algorithms.fairness.streaming import FairEpsNetSampler
+
+
+class DynamicEpsNet:
+    def __init__(
+        self,
+        vc,
+        epsilon,
+        success_prob=0.9,
+        c1=1,
+        c2=1,
+        fairconfig: FairConfig = None,
+        trials=4,
+        weighted=False,
+        points: List[Point] = None,
+    ):
+        """
+        Eps-net maintained under point insertions.
+
+        Replaces rebuilding with build_epsnet_sample / build_fair_epsnet_sample:
+        the sample is a weighted reservoir of size m = get_epsnet_size(...), so
+        an insertion costs amortized O(1) (O(trials + 1) for the fair variant)
+        and the net always has min(m, n) points. m does not depend on n, so
+        the reservoirs never have to grow as points arrive; resize() shrinks
+        them for a larger epsilon.
+
+        The fair variant keeps a FairEpsNetSampler. The trial sample is picked
+        once per change of the reservoirs, and the augmented net is only
+        rebuilt when a reservoir or a per-color quota changed.
+
+        Parameters:
+            vc: VC-dimension of the ranges.
+            epsilon (float): Epsilon parameter for the eps-net.
+            success_prob (float): Success probability of the sample.
+            c1, c2: Same constants as build_epsnet_sample (c1) and
+                build_fair_epsnet_sample (c1, c2).
+            fairconfig (FairConfig): If given, maintain a fair eps-net.
+            trials (int): Number of independent samples for the fair variant.
+            weighted (bool): Sample (and compute color ratios) by Point.weight.
+            points (List[Point]): Initial points (optional).
+        """
+        self.vc = vc
+        self.epsilon = epsilon
+        self.success_prob = success_prob
+        self.c1 = c1
+        self.c2 = c2
+        self.fairconfig = fairconfig
+        self.weighted = weighted
+        self.n = 0
+
+        if fairconfig is None:
+            self.m = get_epsnet_size(epsilon, vc, success_prob, c1)
+            self.sample = WeightedReservoir(self.m)
+        else:
+            self.sampler = FairEpsNetSampler(
+                vc, epsilon, fairconfig, success_prob, c1, c2, trials, weighted
+            )
+            self.m = self.sampler.m
+            self.k = self.sampler.k
+            self.v = self.sampler.v
+
+        self._version = 0  # bumped whenever the eps-net may change
+        self._picked = None  # (trial sample, its color counts) of the current reservoirs
+        self._quotas = None
+        self._cache = None  # (version, epsnet)
+        for p in points or []:
+            self.insert(p)
+
+    def __len__(self):
+        return self.n
+
+    def insert(self, point: Point):
+        self.n += 1
+        if self.fairconfig is None:
+            weight = point.weight if self.weighted else 1
+            if self.sample.add(point, weight):
+                self._version += 1
+        elif self.sampler.add(point):
+            self._picked = None
+            self._version += 1
+        elif self._picked is not None and self.quotas() != self._quotas:
+            # Same sample, but the color ratios moved a quota
+            self._version += 1
+
+    def insert_many(self, points: Iterable[Point]):
+        for p in points:
+            self.insert(p)
+
+    def resize(self, epsilon=None, success_prob=None):
+        """
+        Change epsilon / success_prob in place.
+
+        The reservoirs keep their largest keys, so a larger epsilon (smaller
+        net) needs no pass over the points. A smaller epsilon needs points
+        that were already dropped and raises ValueError.
+        """
+        epsilon = epsilon if epsilon is not None else self.epsilon
+        success_prob = success_prob if success_prob is not None else self.success_prob
+        c = self.c1 if self.fairconfig is None else self.c2
+        m = get_epsnet_size(epsilon, self.vc, success_prob, c)
+        if m > self.m:
+            raise ValueError(f"Cannot grow the eps-net from {self.m} to {m} points without a rebuild.")
+        self.epsilon, self.success_prob = epsilon, success_prob
+        if m < self.m:
+            print(f"[DynamicEpsNet] resize: {self.m} -> {m}")
+            self.m = m
+            if self.fairconfig is None:
+                self.sample.shrink(m)
+            else:
+                self.sampler.shrink(m)
+                self._picked = None
+            self._version += 1
+
+    @property
+    def color_ratios(self) -> List[float]:
+        return self.sampler.color_ratios
+
+    def _pick(self):
+        """Trial sample of the current reservoirs (picked once per change)."""
+        if self._picked is None:
+            sample = self.sampler._pick_sample(self.color_ratios)
+            counts = [0] * self.k
+            for p in sample:
+                counts[p.color] += 1
+            self._picked = (sample, counts)
+        return self._picked
+
+    def quotas(self) -> List[int]:
+        """
+        Number of points of every color the augmentation adds to the sample
+        (same formula as _augment_epsnet, negative means over-represented).
+        """
+        sample, counts = self._pick()
+        W = len(sample)
+        return [int(self.v * r * W - c) for r, c in zip(self.color_ratios, counts)]
+
+    @property
+    def epsnet(self) -> List[Point]:
+        """The (fair) eps-net of the points inserted so far."""
+        if self.n == 0:
+            return []
+        if self.fairconfig is None:
+            return self.sample.items()
+        if self._cache is not None and self._cache[0] == self._version:
+            return list(self._cache[1])
+
+        sample, _ = self._pick()
+        self._quotas = self.quotas()
+        print(f"[DynamicEpsNet] n: {self.n}, epsnet size m: {min(self.m, self.n)}, v: {self.v}")
+        epsnet = self.sampler._augment(sample, self.color_ratios)
+        self._cache = (self._version, epsnet)
+        return list(epsnet)
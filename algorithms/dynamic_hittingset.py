@@ -0,0 +1,232 @@
+import random
+
+from typing import Dict, Iterable, List, Set
+
+from core.points import Point
+from core.fairness import FairConfig
+from algorithms.hittingset import find_hitting_set_greedy
+from algorithms.fairness.fair_hittingset import _get_fair_padding
+
+
+class DynamicHittingSet:
+    def __init__(
+        self,
+        points: List[Point] = None,
+        rangespace: List[Set[Point]] = None,
+        fairconfig: FairConfig = None,
+        color_ratios: List[float] = None,
+    ):
+        """
+        Hitting set maintained under insertions and deletions of points and ranges.
+
+        Keeps an inverted index (point -> ranges) and, for every range, the
+        number of hitting-set points inside it. Updates only look at the
+        ranges they touch: an uncovered range is repaired greedily among the
+        points of the uncovered ranges, and on range deletion the hitting-set
+        points of that range are dropped if every range they hit stays covered.
+
+        Parameters:
+            points (List[Point]): Initial points (optional).
+            rangespace (List[Set[Point]]): Initial ranges (optional). The initial
+                hitting set is computed with find_hitting_set_greedy.
+            fairconfig (FairConfig): If given, after every update the hitting set is
+                padded so that its colors match color_ratios. Only the colors
+                whose padding is off are touched.
+            color_ratios (List[float]): Target color ratios (default: ratios of the
+                initial points, uniform without initial points).
+        """
+        self.ranges: Dict[int, Set[Point]] = {}
+        self.point_ranges: Dict[Point, Set[int]] = {}
+        self.hits: Dict[int, int] = {}  # range id -> hitting-set points in the range
+        self._hitting_set: Dict[Point, None] = {}  # insertion ordered set
+        self._next_id = 0
+
+        self.fairconfig = fairconfig
+        self.color_counts: Dict[int, int] = {}
+        self._padding: Dict[int, Set[Point]] = {}  # color -> points added only for fairness
+        self._by_color: Dict[int, List[Point]] = {}
+        self._color_pos: Dict[Point, int] = {}
+
+        points = points or []
+        for p in points:
+            self._add_point(p)
+        ids = [self._add_range(r) for r in rangespace or []]
+
+        if fairconfig is not None and color_ratios is None:
+            if points:
+                color_ratios = [
+                    len(self._by_color.get(color, [])) / len(points)
+                    for color in range(fairconfig.k)
+                ]
+            else:
+                color_ratios = [1 / fairconfig.k] * fairconfig.k
+        self.color_ratios = color_ratios
+
+        # Empty ranges can never be hit, keep them out of the greedy
+        initial = [self.ranges[i] for i in ids if self.ranges[i]]
+        if initial:
+            for p in find_hitting_set_greedy(points, initial):
+                self._select(p)
+        self._repair_fairness()
+
+    @property
+    def hitting_set(self) -> List[Point]:
+        return list(self._hitting_set)
+
+    def uncovered(self) -> int:
+        """Number of non-empty ranges not hit by the current hitting set."""
+        return sum(1 for rid, r in self.ranges.items() if r and self.hits[rid] == 0)
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def insert_point(self, point: Point, range_ids: Iterable[int] = ()):
+        """Insert a point, optionally as a member of existing ranges."""
+        self._add_point(point)
+        range_ids = list(range_ids)
+        for rid in range_ids:
+            self.ranges[rid].add(point)
+            self.point_ranges[point].add(rid)
+        # Ranges that were empty so far may now be hit
+        self._repair(range_ids)
+        self._repair_fairness()
+
+    def delete_point(self, point: Point):
+        rids = self.point_ranges.pop(point)
+        for rid in rids:
+            self.ranges[rid].discard(point)
+        self._remove_color(point)
+        if point in self._hitting_set:
+            del self._hitting_set[point]
+            self._padding.get(point.color, set()).discard(point)
+            self.color_counts[point.color] -= 1
+            for rid in rids:
+                self.hits[rid] -= 1
+            self._repair([rid for rid in rids if self.hits[rid] == 0])
+        self._repair_fairness()
+
+    def insert_range(self, r: Set[Point]) -> int:
+        """Insert a range (a set of known points) and return its id."""
+        rid = self._add_range(r)
+        self._repair([rid])
+        self._repair_fairness()
+        return rid
+
+    def delete_range(self, rid: int):
+        r = self.ranges.pop(rid)
+        del self.hits[rid]
+        for p in r:
+            self.point_ranges[p].discard(rid)
+        for p in r:
+            if p in self._hitting_set and self._is_redundant(p):
+                self._unselect(p)
+        self._repair_fairness()
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _add_point(self, point: Point):
+        self.point_ranges[point] = set()
+        pool = self._by_color.setdefault(point.color, [])
+        self._color_pos[point] = len(pool)
+        pool.append(point)
+
+    def _remove_color(self, point: Point):
+        pool = self._by_color[point.color]
+        i = self._color_pos.pop(point)
+        last = pool.pop()
+        if last is not point:
+            pool[i] = last
+            self._color_pos[last] = i
+
+    def _add_range(self, r: Set[Point]) -> int:
+        rid = self._next_id
+        self._next_id += 1
+        r = set(r)
+        self.ranges[rid] = r
+        for p in r:
+            self.point_ranges[p].add(rid)
+        self.hits[rid] = sum(1 for p in r if p in self._hitting_set)
+        return rid
+
+    def _select(self, point: Point):
+        if point in self._hitting_set:
+            return
+        self._hitting_set[point] = None
+        self.color_counts[point.color] = self.color_counts.get(point.color, 0) + 1
+        for rid in self.point_ranges[point]:
+            self.hits[rid] += 1
+
+    def _unselect(self, point: Point):
+        del self._hitting_set[point]
+        self._padding.get(point.color, set()).discard(point)
+        self.color_counts[point.color] -= 1
+        for rid in self.point_ranges[point]:
+            self.hits[rid] -= 1
+
+    def _is_redundant(self, point: Point) -> bool:
+        return all(self.hits[rid] >= 2 for rid in self.point_ranges[point])
+
+    def _repair(self, rids: List[int]):
+        """Greedy hitting set restricted to the given uncovered ranges."""
+        uncovered = set(rid for rid in rids if self.ranges[rid] and self.hits[rid] == 0)
+        while uncovered:
+            point_hits = {}
+            for rid in uncovered:
+                for p in self.ranges[rid]:
+                    point_hits[p] = point_hits.get(p, 0) + 1
+            best_point = max(point_hits, key=point_hits.get)
+            self._select(best_point)
+            uncovered = set(rid for rid in uncovered if best_point not in self.ranges[rid])
+
+    def _repair_fairness(self):
+        """
+        Pad every color to its share of the points selected for coverage.
+
+        The padding per color follows from the coverage counts in O(k).
+        Colors with surplus padding pop points from it one at a time: a
+        redundant one is released, one that became the only hit of a range
+        is kept as coverage, which changes the coverage counts, so the
+        padding is recomputed. Every padding point is looked at at most
+        once, and colors with a deficit are topped up at the end.
+        """
+        if self.fairconfig is None or not self._hitting_set:
+            return
+        for color in range(self.fairconfig.k):
+            self._padding.setdefault(color, set())
+        while True:
+            coverage_counts = {
+                color: count - len(self._padding[color])
+                for color, count in self.color_counts.items()
+            }
+            needed = _get_fair_padding(coverage_counts, self.color_ratios)
+            surplus = {
+                color: len(padding) - needed.get(color, 0)
+                for color, padding in self._padding.items()
+                if len(padding) > needed.get(color, 0)
+            }
+            if not surplus:
+                break
+            color, to_release = next(iter(surplus.items()))
+            padding = self._padding[color]
+            while to_release > 0:
+                p = padding.pop()
+                if not self._is_redundant(p):
+                    break  # Coverage now, recompute the padding
+                self._unselect(p)
+                to_release -= 1
+        for color in range(self.fairconfig.k):
+            padding = self._padding[color]
+            to_add = needed.get(color, 0) - len(padding)
+            pool = self._by_color.get(color, [])
+            while to_add > 0 and len(self._hitting_set) < len(self.point_ranges):
+                if len(pool) <= self.color_counts.get(color, 0):
+                    break
+                p = random.choice(pool)
+                if p in self._hitting_set:
+                    continue
+                self._select(p)
+                padding.add(p)
+                to_add -= 1
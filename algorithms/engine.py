@@ -0,0 +1,290 @@
+import math
+import threading
+
+from collections import OrderedDict
+from typing import List, Set
+
+from core.points import Point
+from core.ranges import Range
+from core.fairness import FairConfig, FairnessMeasure
+from core.counting import RangeCountingIndex
+from core.sampling import AliasTable
+from core.verification import (
+    is_epsnet_counting,
+    is_fair_epsnet_counting,
+    is_hitting_set,
+)
+from algorithms.epsnet import build_epsnet, get_epsnet_size, EpsNetStrategy
+from algorithms.hittingset import find_hitting_set, HittingSetStrategy
+from algorithms.fairness.fair_epsnet import (
+    build_fair_epsnet,
+    _is_good_epsnet,
+    _augment_epsnet,
+)
+from algorithms.fairness.fair_hittingset import find_fair_hitting_set
+
+
+class FairNetEngine:
+    def __init__(
+        self,
+        points: List[Point],
+        fairconfig: FairConfig = None,
+        max_cached_ranges: int = 4096,
+        max_cached_incidences: int = None,
+    ):
+        """
+        Holds a point set in memory and answers eps-net, hitting set and
+        verification requests against it.
+
+        The spatial (range-counting) index, the per-color index, the alias
+        tables and the range space of every range seen so far are built once
+        and reused by all later calls.
+
+        Parameters:
+            points (List[Point]): The point set.
+            fairconfig (FairConfig): Fairness configuration for the fair variants (optional).
+            max_cached_ranges (int): Maximum number of cached ranges (LRU eviction).
+            max_cached_incidences (int): Maximum total size of the cached ranges
+                (sum of |r ∩ P|); None means unbounded.
+        """
+        self.points = points
+        self.n = len(points)
+        self.fairconfig = fairconfig
+        self.max_cached_ranges = max_cached_ranges
+        self.max_cached_incidences = max_cached_incidences
+
+        self._position = {id(p): i for i, p in enumerate(points)}
+        self._index = None
+        self._alias_tables = {}
+        self._cache = OrderedDict()  # range key -> set of points
+        self._cached_incidences = 0
+        self._lock = threading.Lock()
+
+        self.points_by_color = {}
+        for p in points:
+            self.points_by_color.setdefault(p.color, []).append(p)
+        k = fairconfig.k if fairconfig is not None else len(self.points_by_color)
+        self.color_ratios = [
+            len(self.points_by_color.get(color, [])) / self.n for color in range(k)
+        ]
+
+    # ------------------------------------------------------------------
+    # Cached structures
+    # ------------------------------------------------------------------
+
+    @property
+    def index(self) -> RangeCountingIndex:
+        """Range-counting index, built on first use."""
+        with self._lock:
+            if self._index is None:
+                self._index = RangeCountingIndex(self.points)
+            return self._index
+
+    def alias_table(self, weighted: bool = False) -> AliasTable:
+        """Alias table over the points, uniform or by Point.weight."""
+        with self._lock:
+            if weighted not in self._alias_tables:
+                weights = [p.weight for p in self.points] if weighted else None
+                self._alias_tables[weighted] = AliasTable(self.points, weights)
+            return self._alias_tables[weighted]
+
+    def get_range_space(self, ranges: List[Range]) -> List[Set[Point]]:
+        """Range space of the given ranges, served from the cache when possible."""
+        rangespace = []
+        for r in ranges:
+            key = _range_key(r)
+            with self._lock:
+                subset = self._cache.get(key)
+                if subset is not None:
+                    self._cache.move_to_end(key)
+            if subset is None:
+                subset = set(p for p in self.points if r.contains(p))
+                self._insert(key, subset)
+            rangespace.append(subset)
+        return rangespace
+
+    def _insert(self, key, subset: Set[Point]):
+        with self._lock:
+            if key in self._cache:
+                return
+            self._cache[key] = subset
+            self._cached_incidences += len(subset)
+            while self._cache and (
+                len(self._cache) > self.max_cached_ranges
+                or (
+                    self.max_cached_incidences is not None
+                    and self._cached_incidences > self.max_cached_incidences
+                )
+            ):
+                _, evicted = self._cache.popitem(last=False)
+                self._cached_incidences -= len(evicted)
+
+    def cache_info(self) -> dict:
+        return {
+            "ranges": len(self._cache),
+            "incidences": self._cached_incidences,
+            "max_cached_ranges": self.max_cached_ranges,
+            "max_cached_incidences": self.max_cached_incidences,
+        }
+
+    def clear_cache(self):
+        with self._lock:
+            self._cache.clear()
+            self._cached_incidences = 0
+
+    def indices_of(self, subset: List[Point]) -> List[int]:
+        """Positions of the given points in the engine's point list."""
+        return [self._position[id(p)] for p in subset]
+
+    # ------------------------------------------------------------------
+    # Algorithms
+    # ------------------------------------------------------------------
+
+    def build_epsnet(
+        self,
+        ranges: List[Range],
+        vc,
+        epsilon,
+        strategy: EpsNetStrategy = EpsNetStrategy.SAMPLE,
+        weighted=False,
+        **kwargs,
+    ) -> List[Point]:
+        if strategy == EpsNetStrategy.SAMPLE:
+            # Sampling never reads the range space
+            success_prob = kwargs.get("success_prob", 0.9)
+            c1 = kwargs.get("c1", 1)
+            m = min(get_epsnet_size(epsilon, vc, success_prob, c1), self.n)
+            print(f"[FairNetEngine.build_epsnet] epsnet size m: {int(m)}")
+            return self.alias_table(weighted).sample(math.ceil(m))
+        return build_epsnet(
+            strategy=strategy,
+            points=self.points,
+            rangespace=self.get_range_space(ranges),
+            vc=vc,
+            epsilon=epsilon,
+            **kwargs,
+        )
+
+    def build_fair_epsnet(
+        self,
+        ranges: List[Range],
+        vc,
+        epsilon,
+        strategy: EpsNetStrategy = EpsNetStrategy.SAMPLE,
+        weighted=False,
+        **kwargs,
+    ) -> List[Point]:
+        fairconfig = self._require_fairconfig()
+        if (
+            strategy == EpsNetStrategy.SAMPLE
+            and fairconfig.fairness == FairnessMeasure.DP
+        ):
+            # Same as build_fair_epsnet_sample, on the cached alias table and color index
+            success_prob = kwargs.get("success_prob", 0.9)
+            c1 = kwargs.get("c1", 1)
+            c2 = kwargs.get("c2", 1)
+            k = fairconfig.k
+            m = min(get_epsnet_size(epsilon, vc, success_prob, c2), self.n)
+            v = c1 * math.ceil(math.log(4 * k))
+            print(f"[FairNetEngine.build_fair_epsnet] epsnet size m: {int(m)}, v: {v}")
+            table = self.alias_table(weighted)
+            epsnet = table.sample(math.ceil(m))
+            while not _is_good_epsnet(epsnet, k, v, self.color_ratios):
+                print("[FairNetEngine.build_fair_epsnet] Bad epsnet, resampling...")
+                epsnet = table.sample(math.ceil(m))
+            return _augment_epsnet(
+                epsnet,
+                self.points,
+                self.color_ratios,
+                v,
+                k,
+                points_by_color=self.points_by_color,
+            )
+        if strategy == EpsNetStrategy.SAMPLE:
+            kwargs["color_ratios"] = self.color_ratios
+        return build_fair_epsnet(
+            strategy=strategy,
+            fairconfig=fairconfig,
+            points=self.points,
+            rangespace=self.get_range_space(ranges),
+            vc=vc,
+            epsilon=epsilon,
+            **kwargs,
+        )
+
+    def find_hitting_set(
+        self,
+        ranges: List[Range],
+        strategy: HittingSetStrategy = HittingSetStrategy.GREEDY,
+        **kwargs,
+    ) -> List[Point]:
+        return find_hitting_set(
+            strategy=strategy,
+            points=self.points,
+            rangespace=self.get_range_space(ranges),
+            **kwargs,
+        )
+
+    def find_fair_hitting_set(
+        self,
+        ranges: List[Range],
+        strategy: HittingSetStrategy = HittingSetStrategy.GREEDY,
+        **kwargs,
+    ) -> List[Point]:
+        fairconfig = self._require_fairconfig()
+        if strategy == HittingSetStrategy.GEOMETRIC:
+            kwargs.setdefault("color_ratios", self.color_ratios)
+        return find_fair_hitting_set(
+            strategy=strategy,
+            fairconfig=fairconfig,
+            points=self.points,
+            rangespace=self.get_range_space(ranges),
+            **kwargs,
+        )
+
+    # ------------------------------------------------------------------
+    # Verification
+    # ------------------------------------------------------------------
+
+    def is_epsnet(self, epsnet: List[Point], ranges: List[Range], epsilon) -> bool:
+        return is_epsnet_counting(epsnet, self.points, ranges, epsilon, self.index)
+
+    def is_fair_epsnet(self, epsnet: List[Point], ranges: List[Range], epsilon) -> bool:
+        return is_fair_epsnet_counting(
+            epsnet, self.points, ranges, epsilon, self.index
+        )
+
+    def is_hitting_set(self, hitting_set: List[Point], ranges: List[Range]) -> bool:
+        return is_hitting_set(hitting_set, self.get_range_space(ranges))
+
+    def is_fair_hittingset(self, hitting_set: List[Point], ranges: List[Range]) -> bool:
+        # Same checks as is_fair_hittingset, with the cached color ratios
+        if not is_hitting_set(hitting_set, self.get_range_space(ranges)):
+            print("Not a hitting set!")
+            return False
+        for color, color_ratio in enumerate(self.color_ratios):
+            count = len([p for p in hitting_set if p.color == color])
+            if abs(count / len(hitting_set) - color_ratio) > 0.01:
+                print("Not a fair hitting set!")
+                return False
+        return True
+
+    def _require_fairconfig(self) -> FairConfig:
+        if self.fairconfig is None:
+            raise ValueError("FairNetEngine was created without a FairConfig.")
+        return self.fairconfig
+
+
+def _range_key(r: Range) -> tuple:
+    """Hashable key of a range definition (type and parameters)."""
+    return (type(r).__name__,) + tuple(
+        (name, _freeze(value)) for name, value in sorted(vars(r).items())
+    )
+
+
+def _freeze(value):
+    if isinstance(value, Point):
+        return _freeze(value.point)
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
@@ -0,0 +1,130 @@
+"""
+Local front end for a warm FairNetEngine.
+
+The protocol is one JSON object per line, e.g.
+
+    {"method": "build_epsnet", "ranges": [{"type": "rectangle", "xmin": 0, "xmax": 1,
+     "ymin": 0, "ymax": 1}], "vc": 2, "epsilon": 0.1, "strategy": "sample"}
+
+and the reply is {"result": [...point indices...]} for builders,
+{"result": true/false} for verifiers, or {"error": "..."}. Verifiers take the
+candidate set as "indices" into the engine's point list.
+"""
+
+import asyncio
+import json
+
+from concurrent.futures import ThreadPoolExecutor
+
+from core.points import Point
+from core.ranges import (
+    Range,
+    RectangleRange,
+    HyperRectangleRange,
+    BallRange,
+    HalfspaceRange,
+)
+from algorithms.epsnet import EpsNetStrategy
+from algorithms.hittingset import HittingSetStrategy
+from algorithms.engine import FairNetEngine
+
+
+_BUILDERS = {
+    "build_epsnet": EpsNetStrategy,
+    "build_fair_epsnet": EpsNetStrategy,
+    "find_hitting_set": HittingSetStrategy,
+    "find_fair_hitting_set": HittingSetStrategy,
+}
+_VERIFIERS = ["is_epsnet", "is_fair_epsnet", "is_hitting_set", "is_fair_hittingset"]
+
+
+def decode_range(spec: dict) -> Range:
+    kind = spec["type"]
+    if kind == "rectangle":
+        return RectangleRange(spec["xmin"], spec["xmax"], spec["ymin"], spec["ymax"])
+    elif kind == "hyperrectangle":
+        return HyperRectangleRange(spec["mins"], spec["maxs"])
+    elif kind == "ball":
+        return BallRange(Point(tuple(spec["center"]), None), spec["radius"])
+    elif kind == "halfspace":
+        return HalfspaceRange(spec["normal"], spec["offset"])
+    else:
+        raise ValueError(f"Unknown range type: {kind}")
+
+
+def handle_request(engine: FairNetEngine, request: dict) -> dict:
+    """Run one decoded request against the engine."""
+    request = dict(request)
+    method = request.pop("method", None)
+    ranges = [decode_range(spec) for spec in request.pop("ranges", [])]
+    if method in _BUILDERS:
+        if "strategy" in request:
+            request["strategy"] = _BUILDERS[method](request["strategy"])
+        result = getattr(engine, method)(ranges=ranges, **request)
+        return {"result": engine.indices_of(result)}
+    elif method in _VERIFIERS:
+        subset = [engine.points[i] for i in request.pop("indices")]
+        return {"result": bool(getattr(engine, method)(subset, ranges, **request))}
+    elif method == "cache_info":
+        return {"result": engine.cache_info()}
+    else:
+        raise ValueError(f"Unknown method: {method}")
+
+
+async def serve(
+    engine: FairNetEngine,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    path: str = None,
+    workers: int = 4,
+):
+    """
+    Serve the engine over a local TCP socket (or a unix socket if path is given).
+
+    Requests are read on the event loop and executed on a pool of worker
+    threads, so slow requests do not block other connections and all of
+    them share the same warm caches.
+    """
+    pool = ThreadPoolExecutor(max_workers=workers)
+    loop = asyncio.get_running_loop()
+
+    async def on_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            try:
+                request = json.loads(line)
+                response = await loop.run_in_executor(
+                    pool, handle_request, engine, request
+                )
+            except Exception as e:
+                response = {"error": f"{type(e).__name__}: {e}"}
+            writer.write((json.dumps(response) + "\n").encode())
+            await writer.drain()
+        writer.close()
+
+    if path is not None:
+        server = await asyncio.start_unix_server(on_client, path=path)
+    else:
+        server = await asyncio.start_server(on_client, host=host, port=port)
+    print(f"[serve] listening on {path or f'{host}:{port}'} with {workers} workers")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        pool.shutdown(wait=False)
+
+
+async def request(message: dict, host: str = "127.0.0.1", port: int = 8765, path: str = None):
+    """Send one request to a running server and return the decoded reply."""
+    if path is not None:
+        reader, writer = await asyncio.open_unix_connection(path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    writer.write((json.dumps(message) + "\n").encode())
+    await writer.drain()
+    reply = json.loads(await reader.readline())
+    writer.close()
+    await writer.wait_closed()
+    return reply
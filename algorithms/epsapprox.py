@@ -0,0 +1,157 @@
+import math
+import random
+import numpy as np
+
+from typing import Dict, List, Set
+
+from core.ranges import Range
+from core.points import Point
+from algorithms.epsnet import EpsNetStrategy, HalvingStrategy, _get_halving, _sketch_merge
+
+
+def build_epsapprox(strategy: EpsNetStrategy = EpsNetStrategy.SAMPLE, **kwargs):
+    if strategy == EpsNetStrategy.SAMPLE:
+        return build_epsapprox_sample(**kwargs)
+    elif strategy == EpsNetStrategy.DISCREPANCY:
+        return build_epsapprox_discrepancy(**kwargs)
+    elif strategy == EpsNetStrategy.SKETCH_MERGE:
+        return build_epsapprox_sketch_merge(**kwargs)
+    else:
+        raise NotImplementedError("Strategy not implemented.")
+
+
+def get_epsapprox_size(epsilon, vc, success_prob, c1=1):
+    phi = 1 - success_prob
+    d = vc
+    m = (c1 / epsilon**2) * (d * math.log(d / epsilon) + math.log(1 / phi))
+    return math.ceil(m)
+
+
+def build_epsapprox_sample(
+    points: List[Point],
+    rangespace: List[Set[Point]],
+    vc,
+    epsilon,
+    success_prob=0.9,
+    weights=None,
+    c1=1,
+) -> List[Point]:
+    """
+    Build eps-approximations (eps-samples) by random sampling.
+
+    Reference:
+        - Har-Peled, Sariel. Geometric approximation algorithms. No. 173. American Mathematical Soc., 2011.
+        - Chapter 5
+    """
+    m = get_epsapprox_size(epsilon, vc, success_prob, c1)
+    m = min(m, len(points))
+    print(f"[build_epsapprox_sample] epsapprox size m: {int(m)}")
+    return random.choices(points, weights=weights, k=math.ceil(m))
+
+
+def build_epsapprox_discrepancy(
+    points: List[Point],
+    rangespace: List[Set[Point]],
+    vc,
+    epsilon,
+    c1=1,
+    halving: HalvingStrategy = HalvingStrategy.GREEDY,
+    trials=32,
+) -> List[Point]:
+    """Build eps-approximation by iterative discrepancy halving.
+
+    halving and trials select the halving step as in build_epsnet_discrepancy.
+
+    Reference:
+        - Chazelle, Bernard. The Discrepancy Method: Randomness and Complexity. Cambridge University Press, 2000.
+        - Chapter 4
+    """
+    m = get_epsapprox_size(epsilon, vc, 0.9, c1)
+    m = min(m, len(points))
+    print(f"[build_epsapprox_discrepancy] epsapprox size m: {int(m)}")
+    halve = _get_halving(halving, trials)
+    subset = points
+    while len(subset) >= 2 * m:
+        _, subset = halve(subset, rangespace)
+    return subset
+
+
+def build_epsapprox_sketch_merge(
+    points: List[Point],
+    rangespace: List[Set[Point]],
+    vc,
+    epsilon,
+    c1=0,
+    c2=1,
+    fan_in=2,
+    halving: HalvingStrategy = HalvingStrategy.GREEDY,
+    trials=32,
+) -> List[Point]:
+    """
+    Build eps-approximation by sketch-and-merge discrepancy.
+
+    Parameters:
+        epsilon (float): Epsilon parameter for the eps-approximation.
+        c1 (float): Constant for partition size.
+        fan_in (int): Number of partitions merged at a time (see _sketch_merge).
+        halving (HalvingStrategy): Halving step (see build_epsnet_discrepancy).
+        trials (int): Number of random colorings for HalvingStrategy.BEST_OF_K.
+    """
+    m = get_epsapprox_size(epsilon, vc, 0.9, c2)
+    m = min(m, len(points))
+    print(f"[build_epsapprox_sketch_merge] epsapprox size m: {int(m)}")
+
+    p = m * 2**c1  # size of each partition
+    p = 2 ** math.ceil(math.log2(p))  # round to nearest power of 2
+    print(f"[build_epsapprox_sketch_merge] partition size p: {p}")
+    partitions = []
+    for i in range(0, len(points), p):
+        partitions.append(points[i : i + p])
+    halve = _get_halving(halving, trials)
+    root = _sketch_merge(partitions, rangespace, halving=halve, fan_in=fan_in)
+    while len(root) >= 2 * m:
+        _, root = halve(root, rangespace)
+
+    return root
+
+
+class EpsApproximation:
+    def __init__(self, sample: List[Point], weights: List[float] = None):
+        """
+        Answers approximate range-counting queries from an eps-approximation.
+
+        For every range r, |r ∩ S|/|S| is within epsilon of |r ∩ P|/|P|, so
+        queries only touch the (small) sample S.
+
+        Parameters:
+            sample (List[Point]): An eps-approximation of the point set.
+            weights (List[float]): Weights of the sample points (default is uniform).
+        """
+        self.sample = sample
+        self.coords = np.asarray([p.point for p in sample], dtype=float)
+        self.colors = np.asarray([p.color for p in sample])
+        self.weights = (
+            np.ones(len(sample)) if weights is None else np.asarray(weights, dtype=float)
+        )
+        self.total = float(self.weights.sum())
+        self.color_totals = {
+            color: float(self.weights[self.colors == color].sum())
+            for color in np.unique(self.colors).tolist()
+        }
+
+    def estimate(self, r: Range) -> float:
+        """Estimate of |r ∩ P| / |P|."""
+        mask = r.contains_array(self.coords)
+        return float(self.weights[mask].sum()) / self.total
+
+    def estimate_count(self, r: Range, n: int) -> float:
+        """Estimate of |r ∩ P| for a point set of size n."""
+        return self.estimate(r) * n
+
+    def estimate_by_color(self, r: Range) -> Dict[int, float]:
+        """Estimate of |r ∩ P_c| / |P_c| for every color c."""
+        mask = r.contains_array(self.coords)
+        return {
+            color: float(self.weights[mask & (self.colors == color)].sum()) / total
+            for color, total in self.color_totals.items()
+        }
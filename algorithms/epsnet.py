@@ -1,11 +1,21 @@
 import math
 import random
+import time
+import numpy as np
 
+from concurrent.futures import ProcessPoolExecutor, as_completed, TimeoutError
 from enum import Enum
+from functools import partial
 from typing import List, Set, Tuple
 
 from core.ranges import *
 from core.points import Point
+from core.reduction import dedupe_ranges
+from core.incidence import incidence_matrix, heavy_incidence_matrix, hits_all_rows
+from core.budget import Budget, AnytimeResult
+from core.checkpoint import Checkpoint, input_fingerprint
+from core.profiling import phase
+from core.verification import get_achieved_epsilon
 
 
 class EpsNetStrategy(Enum):
@@ -13,15 +23,50 @@ class EpsNetStrategy(Enum):
     DISCREPANCY = "disc"
     SKETCH_MERGE = "sketch_merge"
     NAIVE_FAIR = "naive_fair"
+    LAS_VEGAS = "las_vegas"
+    KD_TREE = "kdtree"
+    AUTO = "auto"
+
+
+class HalvingStrategy(Enum):
+    GREEDY = "greedy"
+    BEST_OF_K = "best_of_k"
 
 
 def build_epsnet(strategy: EpsNetStrategy = "sample", **kwargs):
-    if strategy == EpsNetStrategy.SAMPLE:
+    if strategy == EpsNetStrategy.AUTO:
+        # Cheapest strategy with the requested guarantee (see algorithms.planner)
+        from algorithms.planner import plan_epsnet, get_builder_kwargs
+
+        plan = plan_epsnet(
+            kwargs["points"],
+            kwargs["rangespace"],
+            kwargs["vc"],
+            kwargs["epsilon"],
+            kwargs.get("success_prob", 0.9),
+            kwargs.pop("guarantee", "probabilistic"),
+            ranges=kwargs.pop("ranges", None),
+        )
+        print(f"[build_epsnet] {plan}")
+        builders = {
+            EpsNetStrategy.SAMPLE: build_epsnet_sample,
+            EpsNetStrategy.DISCREPANCY: build_epsnet_discrepancy,
+            EpsNetStrategy.SKETCH_MERGE: build_epsnet_sketch_merge,
+            EpsNetStrategy.LAS_VEGAS: build_epsnet_las_vegas,
+            EpsNetStrategy.KD_TREE: build_epsnet_kdtree,
+        }
+        builder = builders[plan.strategy]
+        return builder(**get_builder_kwargs(builder, kwargs, builders.values()))
+    elif strategy == EpsNetStrategy.SAMPLE:
         return build_epsnet_sample(**kwargs)
     elif strategy == EpsNetStrategy.DISCREPANCY:
         return build_epsnet_discrepancy(**kwargs)
     elif strategy == EpsNetStrategy.SKETCH_MERGE:
         return build_epsnet_sketch_merge(**kwargs)
+    elif strategy == EpsNetStrategy.LAS_VEGAS:
+        return build_epsnet_las_vegas(**kwargs)
+    elif strategy == EpsNetStrategy.KD_TREE:
+        return build_epsnet_kdtree(**kwargs)
     else:
         raise NotImplementedError("Strategy not implemented.")
 
@@ -59,78 +104,398 @@ def build_epsnet_sample(
     return random.choices(points, weights=weights, k=math.ceil(m))
 
 
+def build_epsnet_las_vegas(
+    points: List[Point],
+    rangespace: List[Set[Point]],
+    vc,
+    epsilon,
+    success_prob=0.9,
+    weights=None,
+    c1=1,
+    trials=8,
+    timeout=None,
+    workers=None,
+    pick="first",
+) -> List[Point]:
+    """
+    Build eps-nets by independent sampling trials, keeping only verified ones.
+
+    Every trial draws a build_epsnet_sample net and checks it against the
+    heavy ranges (|r| >= epsilon * |P|) with one sparse product. The output is
+    always a verified eps-net; the trials run on a process pool if workers is given.
+
+    Parameters:
+        trials (int): Number of independent trials.
+        timeout (float): Seconds to wait for the trials (default: no limit).
+        workers (int): Number of processes (default: in-process).
+        pick (str): "first" returns the first verified net, "smallest" the
+            verified net with the fewest distinct points.
+
+    Returns:
+        List[Point]: The distinct points of the chosen net.
+    """
+    m = get_epsnet_size(epsilon, vc, success_prob, c1)
+    m = min(m, len(points))
+    print(f"[build_epsnet_las_vegas] epsnet size m: {int(m)}, trials: {trials}")
+    A = heavy_incidence_matrix(points, rangespace, epsilon)
+    indices = _run_las_vegas_trials(
+        A, len(points), m, weights, trials, timeout, workers, pick
+    )
+    return [points[i] for i in indices]
+
+
+def _run_las_vegas_trials(
+    A, n, m, weights, trials, timeout, workers, pick, fair=None
+) -> List[int]:
+    """Run sampling trials and return the indices of the chosen verified net."""
+    seeds = [random.getrandbits(64) for _ in range(trials)]
+    best = None
+    start = time.time()
+    if workers is not None and workers > 1:
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_las_vegas_worker,
+            initargs=(A, n, m, weights, fair),
+        )
+        futures = [pool.submit(_las_vegas_trial, seed) for seed in seeds]
+        try:
+            for future in as_completed(futures, timeout=timeout):
+                net = future.result()
+                if net is not None and (best is None or len(net) < len(best)):
+                    best = net
+                    if pick == "first":
+                        break
+        except TimeoutError:
+            print("[_run_las_vegas_trials] timeout reached")
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+    else:
+        _init_las_vegas_worker(A, n, m, weights, fair)
+        for seed in seeds:
+            if timeout is not None and time.time() - start > timeout:
+                print("[_run_las_vegas_trials] timeout reached")
+                break
+            net = _las_vegas_trial(seed)
+            if net is not None and (best is None or len(net) < len(best)):
+                best = net
+                if pick == "first":
+                    break
+    if best is None:
+        raise ValueError("No verified eps-net found within the given trials.")
+    print(f"[_run_las_vegas_trials] verified net size: {len(best)}")
+    return best
+
+
+_las_vegas_worker = {}
+
+
+def _init_las_vegas_worker(A, n, m, weights, fair):
+    _las_vegas_worker.update(A=A, n=n, m=m, weights=weights, fair=fair)
+
+
+def _las_vegas_trial(seed: int) -> List[int]:
+    """One sampling trial; the sampled indices if verified, else None."""
+    state = _las_vegas_worker
+    rng = random.Random(seed)
+    sample = rng.choices(range(state["n"]), weights=state["weights"], k=math.ceil(state["m"]))
+    if state["fair"] is not None:
+        # Same test as _is_good_epsnet on the color counts of the sample
+        colors, k, v, color_ratios = state["fair"]
+        counts = np.bincount(colors[sample], minlength=k)
+        if np.any(counts > v * np.asarray(color_ratios) * len(sample)):
+            return None
+        net = sample  # the augmentation counts repetitions, as in build_fair_epsnet_sample
+    else:
+        net = list(dict.fromkeys(sample))
+    return net if hits_all_rows(state["A"], net) else None
+
+
 def build_epsnet_discrepancy(
-    points: List[Point], rangespace: List[Set[Point]], vc, epsilon, c1=1
+    points: List[Point],
+    rangespace: List[Set[Point]],
+    vc,
+    epsilon,
+    c1=1,
+    reduce=False,
+    budget: Budget = None,
+    checkpoint: Checkpoint = None,
+    weighted=False,
+    halving: HalvingStrategy = HalvingStrategy.GREEDY,
+    trials=32,
 ) -> List[Point]:
     """Build eps-net by iterative discrepancy halving.
 
+    If reduce is set, identical ranges are removed first; they do not change
+    the maximum discrepancy.
+
+    If weighted is set, the discrepancy is measured on Point.weight and the
+    kept points carry the weight of their pairs (see _random_halving). The
+    result is then (subset, weights), a weighted summary of all points.
+
+    halving selects the halving step: the greedy matching coloring
+    (HalvingStrategy.GREEDY) or the best of `trials` random colorings
+    (HalvingStrategy.BEST_OF_K, see _best_of_k_halving).
+
+    If a budget is given, halving stops when it runs out and the current
+    subset is returned as an AnytimeResult with its achieved epsilon.
+
+    If a checkpoint is given, the current subset is saved between halvings
+    and an existing checkpoint file is resumed from.
+
     Reference:
         - Chazelle, Bernard. The Discrepancy Method: Randomness and Complexity. Cambridge University Press, 2000.
         - Chapter 4
     """
+    if reduce:
+        rangespace, _ = dedupe_ranges(rangespace)
     d = vc
     # m = c1 * (d / epsilon) * math.log(d / epsilon)  # TODO: what is constant?
     m = get_epsnet_size(epsilon, d, 0.9, c1)
     m = min(m, len(points))
     print(f"[build_epsnet_discrepancy] epsnet size m: {int(m)}")
+    weights = _get_halving_weights(points, weighted, checkpoint)
+    halve = _get_halving(halving, trials)
     subset = points
+    level = 0
+    position = {p: i for i, p in enumerate(points)} if checkpoint is not None else None
+    state = None
+    if checkpoint is not None:
+        fingerprint = input_fingerprint(
+            points,
+            rangespace,
+            strategy="disc",
+            vc=vc,
+            epsilon=epsilon,
+            c1=c1,
+            reduce=reduce,
+            weighted=weighted,
+            halving=halving.value,
+            trials=trials,
+        )
+        state = checkpoint.load(len(position), fingerprint)
+    if state is not None:
+        subset = [points[i] for i in state["groups"][0]]
+        level = state["level"]
     while len(subset) > 2 * m:
+        if budget is not None and budget.exhausted():
+            break
         # TODO[optimize]: filter-out ranges not hit by subset
-        _, half = _random_halving(subset, rangespace)
+        _, half = halve(subset, rangespace, budget, weights)
         subset = half
-    return subset  # Final size is almost m
+        level += 1
+        if checkpoint is not None and _is_resumable(budget) and checkpoint.due():
+            checkpoint.save(len(position), "halving", level, 0, [[position[p] for p in subset]])
+    if checkpoint is not None and _is_resumable(budget):
+        checkpoint.clear()  # finished, a later run must not resume from it
+    if budget is not None:
+        subset = _anytime_epsnet(subset, points, rangespace, m)
+    return _with_weights(subset, weights)  # Final size is almost m
+
+
+def _get_halving_weights(points: List[Point], weighted: bool, checkpoint: Checkpoint = None) -> dict:
+    if not weighted:
+        return None
+    if checkpoint is not None:
+        raise ValueError("Checkpoints do not store the weights of weighted halvings.")
+    return {p: p.weight for p in points}
+
+
+def _with_weights(subset: List[Point], weights: dict = None):
+    """(subset, weights of the subset) for weighted halvings, else the subset."""
+    if weights is None:
+        return subset
+    return subset, [weights[p] for p in subset]
+
+
+def _get_halving(halving: HalvingStrategy, trials=32):
+    """Halving function (points, rangespace, budget, weights) -> (coloring, half)."""
+    halving = HalvingStrategy(halving)
+    if halving == HalvingStrategy.GREEDY:
+        return _random_halving
+    elif halving == HalvingStrategy.BEST_OF_K:
+        return partial(_best_of_k_halving, trials=trials)
+    raise NotImplementedError("Halving strategy not implemented.")
+
+
+def _is_resumable(budget: Budget = None) -> bool:
+    # A halving cut short by the budget must not be checkpointed
+    return budget is None or not budget.exhausted()
+
+
+def _anytime_epsnet(
+    subset: List[Point], points: List[Point], rangespace: List[Set[Point]], m
+) -> AnytimeResult:
+    achieved = get_achieved_epsilon(subset, rangespace, len(points))
+    complete = len(subset) <= 2 * m
+    print(
+        f"[_anytime_epsnet] size: {len(subset)}, complete: {complete}, epsilon: {achieved}"
+    )
+    return AnytimeResult(subset, complete, epsilon=achieved)
 
 
+@phase("halving")
 def _greedy_discrepancy_halving(
     rangespace: List[Set[Point]],
     matching: List[Tuple[Point, Point]],
+    budget: Budget = None,
+    weights: dict = None,
 ) -> List[Point]:
     """
     Assigns a coloring χ: X → {-1, +1} to minimize max discrepancy over Ranges.
     Greedy heuristic: for each pair in matching, choose +1 or -1 that minimizes max discrepancy.
+
+    With weights (point -> weight), the discrepancy is measured on the
+    weights: keeping a of the pair (a, b) moves the weight of b to a, so
+    a is colored +w_b and b is colored -w_b. The weight of the kept point
+    becomes w_a + w_b (weights is updated in place).
+
+    If the budget runs out, both points of the remaining pairs are kept.
+
+    Every range is read once, restricted to the matched points, so a lazy
+    RangeSpace computes each row at most once per halving (instead of twice
+    per pair once the rows no longer fit in its cache).
     """
     coloring = {}
     half = []
+    matched = {p for pair in matching for p in pair}
+    rows = [[p for p in r if p in matched] for r in rangespace]
 
     for k, pair in enumerate(matching):
+        if budget is not None:
+            if budget.exhausted():
+                for rest in matching[k:]:
+                    half.extend(rest)
+                break
+            budget.spend()
         print(
             f"[_greedy_discrepancy_halving] counter: {k + 1} / {len(matching)}",
             end="\r",
         )
-        coloring[pair[0]], coloring[pair[1]] = 1, -1
+        a, b = pair
+        w_a, w_b = (weights[a], weights[b]) if weights is not None else (1, 1)
+        coloring[a], coloring[b] = w_b, -w_b
         # TODO[optimize]: should we recalculate?
-        max_pos = max(abs(sum(coloring.get(p, 0) for p in r)) for r in rangespace)
+        max_pos = max(abs(sum(coloring.get(p, 0) for p in r)) for r in rows)
 
-        coloring[pair[0]], coloring[pair[0]] = -1, 1
-        max_neg = max(abs(sum(coloring.get(p, 0) for p in r)) for r in rangespace)
+        coloring[a], coloring[b] = -w_a, w_a
+        max_neg = max(abs(sum(coloring.get(p, 0) for p in r)) for r in rows)
 
         # Keep the better choice
         if max_pos < max_neg:
-            coloring[pair[0]], coloring[pair[1]] = 1, -1
-            half.append(pair[0])
+            coloring[a], coloring[b] = w_b, -w_b
+            kept = a
         else:
-            coloring[pair[0]], coloring[pair[1]] = -1, 1
-            half.append(pair[1])
+            kept = b
+        half.append(kept)
+        if weights is not None:
+            weights[kept] = w_a + w_b
     print()
 
     return coloring, half
 
 
-def _random_halving(points: List[Point], rangespace: List[Set[Point]]) -> List[Point]:
+def _random_halving(
+    points: List[Point], rangespace: List[Set[Point]], budget: Budget = None, weights: dict = None
+) -> List[Point]:
+    """
+    Halve by greedy discrepancy over a random matching.
+
+    With weights, points of similar weight are matched (after shuffling)
+    and an odd point out is kept instead of dropped, so the total weight is
+    preserved (see _greedy_discrepancy_halving).
+    """
     shuffled = points.copy()
     random.shuffle(shuffled)
+    if weights is not None:
+        shuffled.sort(key=weights.__getitem__)
 
     # Ensure even number of points (drop last one if needed)
+    odd = []
     if len(shuffled) % 2 == 1:
+        odd = shuffled[-1:] if weights is not None else []
         shuffled = shuffled[:-1]
 
     matching = [(shuffled[i], shuffled[i + 1]) for i in range(0, len(shuffled), 2)]
 
-    return _greedy_discrepancy_halving(rangespace, matching)
+    coloring, half = _greedy_discrepancy_halving(rangespace, matching, budget, weights)
+    return coloring, half + odd
+
+
+@phase("halving")
+def _best_of_k_halving(
+    points: List[Point],
+    rangespace: List[Set[Point]],
+    budget: Budget = None,
+    weights: dict = None,
+    trials=32,
+) -> List[Point]:
+    """
+    Halve by the best of `trials` random matchings with random orientations.
+
+    Column t of the n x trials sign matrix S is the coloring of trial t
+    (the kept point of a pair is +1, the other -1), so the discrepancies
+    of all trials are the column maxima of |A @ S| for the incidence
+    matrix A of the ranges over the points: one sparse product instead of
+    the loop over pairs of _greedy_discrepancy_halving. No pair is colored
+    greedily, so this only pays off when a random coloring is already good.
+
+    Weights are handled as in _random_halving (kept points are colored
+    +w_b, their partners -w_b). The budget is spent for all pairs at once;
+    if it is exhausted already, all points are kept.
+    """
+    n = len(points)
+    if budget is not None:
+        if budget.exhausted():
+            return {}, list(points)
+        budget.spend(n // 2)
+    # Seeded from random, so random.seed makes runs reproducible
+    rng = np.random.default_rng(random.getrandbits(64))
+    w = np.asarray([weights[p] for p in points], dtype=float) if weights is not None else np.ones(n)
+
+    # One random matching per column (similar weights are matched, as in _random_halving)
+    orders = np.argsort(rng.random((n, trials)), axis=0)
+    if weights is not None:
+        orders = np.take_along_axis(orders, np.argsort(w[orders], axis=0, kind="stable"), axis=0)
+    pairs = n // 2
+    a, b = orders[0 : 2 * pairs : 2], orders[1 : 2 * pairs : 2]
+    flip = rng.random((pairs, trials)) < 0.5
+    kept, dropped = np.where(flip, a, b), np.where(flip, b, a)
+    S = np.zeros((n, trials))
+    np.put_along_axis(S, kept, w[dropped], axis=0)
+    np.put_along_axis(S, dropped, -w[dropped], axis=0)
+
+    A = incidence_matrix(points, rangespace)
+    discrepancy = np.abs(A @ S).max(axis=0) if A.shape[0] > 0 else np.zeros(trials)
+    best = int(np.argmin(discrepancy))
+    print(
+        f"[_best_of_k_halving] n: {n}, trials: {trials}, "
+        f"discrepancy: {discrepancy[best]} (median {np.median(discrepancy)})"
+    )
+
+    coloring = {points[i]: S[i, best] for i in orders[: 2 * pairs, best]}
+    half = [points[i] for i in kept[:, best]]
+    if weights is not None:
+        for i, j in zip(kept[:, best], dropped[:, best]):
+            weights[points[i]] = w[i] + w[j]
+        if n % 2 == 1:
+            # The odd point out is kept
+            half.append(points[orders[-1, best]])
+    return coloring, half
 
 
 def build_epsnet_sketch_merge(
-    points: List[Point], rangespace: List[Set[Point]], vc, epsilon, c1, c2=1
+    points: List[Point],
+    rangespace: List[Set[Point]],
+    vc,
+    epsilon,
+    c1,
+    c2=1,
+    budget: Budget = None,
+    checkpoint: Checkpoint = None,
+    weighted=False,
+    fan_in=2,
+    halving: HalvingStrategy = HalvingStrategy.GREEDY,
+    trials=32,
 ) -> List[Point]:
     """
     Build eps-net by sketch-and-merge discrepancy.
@@ -140,6 +505,16 @@ def build_epsnet_sketch_merge(
         ranges (List[Range])
         epsilon (float): Epsilon parameter for the eps-net.
         c1 (float): Constant for partition size.
+        budget (Budget): If given, merging stops when it runs out and the
+            union of the current partitions is returned as an AnytimeResult.
+        checkpoint (Checkpoint): If given, the partition tree is saved between
+            merges (and the root between the final halvings), and an existing
+            checkpoint file is resumed from.
+        weighted (bool): Measure the discrepancy on Point.weight (see
+            _random_halving) and return (root, weights of the root).
+        fan_in (int): Number of partitions merged at a time (see _sketch_merge).
+        halving (HalvingStrategy): Halving step (see build_epsnet_discrepancy).
+        trials (int): Number of random colorings for HalvingStrategy.BEST_OF_K.
     """
     d = vc
 
@@ -156,39 +531,214 @@ def build_epsnet_sketch_merge(
     for i in range(0, len(points), p):
         partitions.append(points[i : i + p])  # TODO: exclude this from timings
     print(f"[build_epsnet_sketch_merge] Starting sketch-and-merge...")
-    root = _sketch_merge(partitions, rangespace)
+    weights = _get_halving_weights(points, weighted, checkpoint)
+    halve = _get_halving(halving, trials)
+    position = {p: i for i, p in enumerate(points)} if checkpoint is not None else None
+    state = None
+    if checkpoint is not None:
+        fingerprint = input_fingerprint(
+            points,
+            rangespace,
+            strategy="sketch_merge",
+            vc=vc,
+            epsilon=epsilon,
+            c1=c1,
+            c2=c2,
+            fan_in=fan_in,
+            weighted=weighted,
+            halving=halving.value,
+            trials=trials,
+        )
+        state = checkpoint.load(len(position), fingerprint)
+    if state is None or state["stage"] == "merge":
+        resume = None
+        if state is not None:
+            partitions = [[points[i] for i in group] for group in state["groups"]]
+            resume = (state["level"], state["step"])
+        root = _sketch_merge(
+            partitions,
+            rangespace,
+            halving=halve,
+            budget=budget,
+            checkpoint=checkpoint,
+            position=position,
+            resume=resume,
+            weights=weights,
+            fan_in=fan_in,
+        )
+    else:
+        root = [points[i] for i in state["groups"][0]]
     # m = c2 * (d / epsilon**2) * math.log(d / epsilon)
     while len(root) > 2 * m:
-        _, root = _random_halving(root, rangespace)
+        if budget is not None and budget.exhausted():
+            break
+        _, root = halve(root, rangespace, budget, weights)
+        if checkpoint is not None and _is_resumable(budget) and checkpoint.due():
+            checkpoint.save(len(position), "halving", 0, 0, [[position[p] for p in root]])
 
-    return root
+    if checkpoint is not None and _is_resumable(budget):
+        checkpoint.clear()  # finished, a later run must not resume from it
+    if budget is not None:
+        root = _anytime_epsnet(root, points, rangespace, m)
+    return _with_weights(root, weights)
 
 
+@phase("sketch_merge")
 def _sketch_merge(
-    partitions: List[Set[Point]], rangespace: List[Set[Point]], halving=_random_halving
+    partitions: List[Set[Point]],
+    rangespace: List[Set[Point]],
+    halving=_random_halving,
+    budget: Budget = None,
+    checkpoint: Checkpoint = None,
+    position: dict = None,
+    resume: Tuple[int, int] = None,
+    weights: dict = None,
+    fan_in: int = 2,
 ) -> List[Set[Point]]:
-    length = len(partitions)
+    """
+    Merge and halve the partitions up to the root, fan_in partitions at a time.
+
+    A group of fan_in nodes is merged and then halved until it is no larger
+    than its largest node, so every level shrinks the number of nodes (and
+    of points) by about fan_in. A larger fan_in means fewer levels, i.e.
+    fewer copies of the points. The last group of a level may be smaller
+    (a single node is carried up as is), so any number of partitions works.
+    Nodes of such groups went through fewer halvings; pass weights for
+    weighted halvings if that matters.
+
+    With weights (point -> weight, updated in place), the halvings are
+    weighted, so partitions of different sizes or levels can be merged and
+    the root is a weighted summary of all points.
+
+    With a checkpoint, the nodes of the current level are saved after every
+    due merge as indices (position maps a point to its index), together
+    with (number of nodes, next merge). Passing that pair as resume, with
+    the saved nodes as partitions and the same fan_in, continues the run
+    where it stopped.
+    """
+    if fan_in < 2:
+        raise ValueError("fan_in must be at least 2.")
+    # Only passed when set, so halvings without these parameters still work
+    kwargs = {"budget": budget} if budget is not None else {}
+    if weights is not None:
+        kwargs["weights"] = weights
+    partitions = list(partitions)
+    length, first = resume if resume is not None else (len(partitions), 0)
     while length > 1:
-        for i in range(length // 2):
+        nodes = math.ceil(length / fan_in)  # on the next level
+        for i in range(first, nodes):
+            if budget is not None and budget.exhausted():
+                # Merged nodes of this level and the nodes not merged yet
+                remaining = partitions[:i] + partitions[fan_in * i : length]
+                return [p for partition in remaining for p in partition]
             print(
-                f"[_sketch_merge] pair: {i + 1} / {length // 2} of total nodes: {length}"
+                f"[_sketch_merge] group: {i + 1} / {nodes} of total nodes: {length}"
             )
-            try:
-                # Merge two partitions
-                merged = list(
-                    set(partitions[2 * i]) | set(partitions[2 * i + 1])
-                )  # Merging
+            group = partitions[fan_in * i : min(fan_in * (i + 1), length)]
+            # Merge the group, in a fixed order so runs can be replayed
+            merged = list(dict.fromkeys(p for partition in group for p in partition))  # Merging
+            target = max(len(partition) for partition in group)
+            while len(merged) > target and len(merged) > 1:
+                if budget is not None and budget.exhausted():
+                    break
                 # TODO[optimize]: we are always passing the whole ranges!
-                _, partitions[i] = halving(merged, rangespace)  # Halving
-            except IndexError:
-                # Odd number of partitions, last one remains
-                raise ValueError(
-                    "Odd number of partitions. The number of points should be 2^k."
-                )
-        length = length // 2
+                _, merged = halving(merged, rangespace, **kwargs)  # Halving
+            partitions[i] = merged
+            if checkpoint is not None and _is_resumable(budget) and checkpoint.due():
+                groups = [[position[p] for p in partition] for partition in partitions[:length]]
+                checkpoint.save(len(position), "merge", length, i + 1, groups)
+        first = 0
+        length = nodes
 
     print()
 
     # You are at the root of the tree
     root = partitions[0]
     return root
+
+
+def build_epsnet_kdtree(
+    points: List[Point],
+    rangespace: List[Set[Point]],
+    epsilon,
+    dims=None,
+) -> List[Point]:
+    """
+    Deterministic eps-net for axis-parallel rectangles and hyperrectangles.
+
+    Only the coordinates are used, the range space is not touched: every
+    box containing at least epsilon * n points is hit (see _box_net), for
+    RectangleRange and HyperRectangleRange in any dimension. The size is
+    O(log^(2(d-1))(1/epsilon) / epsilon) and the running time O(n log n)
+    per level of the recursion, which is meant for low dimension.
+
+    Parameters:
+        points (List[Point])
+        rangespace (List[Set[Point]]): Not used (kept for build_epsnet).
+        epsilon (float): Epsilon parameter for the eps-net.
+        dims (int): Number of coordinates the boxes constrain (default: all).
+    """
+    if not points:
+        return []
+    coords = np.asarray([p.point for p in points], dtype=float)
+    dims = dims if dims is not None else coords.shape[1]
+    picks = _box_net(coords, np.arange(len(points)), list(range(dims)), epsilon * len(points))
+    print(f"[build_epsnet_kdtree] epsnet size: {len(picks)}")
+    return [points[i] for i in picks]
+
+
+def _box_net(
+    coords: np.ndarray,
+    idx: np.ndarray,
+    dims: List[int],
+    threshold: float,
+    colors: np.ndarray = None,
+    k: int = 1,
+) -> List[int]:
+    """
+    Indices of idx hitting every box over dims that contains at least
+    threshold points of idx.
+
+    In one dimension the points are sorted and every t-th one is picked
+    (t = floor(threshold)), so any interval with t points holds a pick.
+    With colors, every floor(threshold / k)-th point of each color is
+    picked instead: one color has threshold / k points in the interval.
+
+    Otherwise the points are sorted along dims[0] and split in halves
+    until the leaves have at most threshold / 4 points. A box covers a
+    contiguous run in that order, which is at most 2 whole nodes per level
+    plus 2 partially covered leaves. The whole nodes then hold at least
+    threshold / 2 points of the box, so one of them holds
+    (threshold - partial) / (2 * levels) and the remaining dims are
+    solved recursively in every node with that threshold.
+    """
+    if len(idx) == 0 or len(idx) < threshold:
+        return []
+    order = idx[np.argsort(coords[idx, dims[0]], kind="stable")]
+    if len(dims) == 1:
+        t = max(1, math.floor(threshold / k))
+        if colors is None:
+            return order[t - 1 :: t].tolist()
+        picks = []
+        for color in range(k):
+            picks += order[colors[order] == color][t - 1 :: t].tolist()
+        return picks
+
+    leaf = max(1, math.floor(threshold / 4))
+    levels = []
+    segments = [(0, len(order))]
+    while segments:
+        levels.append(segments)
+        segments = [
+            half
+            for lo, hi in segments
+            if hi - lo > leaf
+            for half in ((lo, (lo + hi) // 2), ((lo + hi) // 2, hi))
+        ]
+    partial = 2 * leaf if leaf > 1 else 0
+    sub_threshold = (threshold - partial) / (2 * len(levels))
+    picks = set()
+    for segments in levels:
+        for lo, hi in segments:
+            picks.update(_box_net(coords, order[lo:hi], dims[1:], sub_threshold, colors, k))
+    return sorted(picks)
@@ -2,10 +2,41 @@ from typing import List, Set, Tuple
 from algorithms.epsnet import *
 from core.fairness import *
 from algorithms.epsnet import _greedy_discrepancy_halving, _sketch_merge
+from algorithms.epsnet import _run_las_vegas_trials, _box_net
+from core.incidence import heavy_incidence_matrix
+from core.reduction import dedupe_ranges
+from core.profiling import phase
 
 
 def build_fair_epsnet(strategy: EpsNetStrategy, fairconfig: FairConfig, **kwargs):
-    if strategy == EpsNetStrategy.SAMPLE:
+    if strategy == EpsNetStrategy.AUTO:
+        # Cheapest strategy with the requested guarantee (see algorithms.planner)
+        from algorithms.planner import plan_epsnet, get_builder_kwargs
+
+        plan = plan_epsnet(
+            kwargs["points"],
+            kwargs["rangespace"],
+            kwargs["vc"],
+            kwargs["epsilon"],
+            kwargs.get("success_prob", 0.9),
+            kwargs.pop("guarantee", "probabilistic"),
+            k=fairconfig.k,
+            fair=True,
+            ranges=kwargs.pop("ranges", None),
+        )
+        print(f"[build_fair_epsnet] {plan}")
+        builders = {
+            EpsNetStrategy.SAMPLE: build_fair_epsnet_sample,
+            EpsNetStrategy.DISCREPANCY: build_fair_epsnet_discrepancy,
+            EpsNetStrategy.SKETCH_MERGE: build_fair_epsnet_sketch_merge,
+            EpsNetStrategy.LAS_VEGAS: build_fair_epsnet_las_vegas,
+            EpsNetStrategy.KD_TREE: build_fair_epsnet_kdtree,
+        }
+        builder = builders[plan.strategy]
+        return builder(
+            **get_builder_kwargs(builder, dict(kwargs, fairconfig=fairconfig), builders.values())
+        )
+    elif strategy == EpsNetStrategy.SAMPLE:
         return build_fair_epsnet_sample(fairconfig=fairconfig, **kwargs)
     elif strategy == EpsNetStrategy.DISCREPANCY:
         return build_fair_epsnet_discrepancy(fairconfig=fairconfig, **kwargs)
@@ -13,6 +44,10 @@ def build_fair_epsnet(strategy: EpsNetStrategy, fairconfig: FairConfig, **kwargs
         return build_fair_epsnet_sketch_merge(fairconfig=fairconfig, **kwargs)
     elif strategy == EpsNetStrategy.NAIVE_FAIR:
         return build_fair_epsnet_naive(fairconfig=fairconfig, **kwargs)
+    elif strategy == EpsNetStrategy.LAS_VEGAS:
+        return build_fair_epsnet_las_vegas(fairconfig=fairconfig, **kwargs)
+    elif strategy == EpsNetStrategy.KD_TREE:
+        return build_fair_epsnet_kdtree(fairconfig=fairconfig, **kwargs)
     else:  # TODO: implement naive, add as much as we can!
         raise NotImplementedError("Strategy not implemented.")
 
@@ -56,6 +91,113 @@ def build_fair_epsnet_sample(
         raise NotImplementedError("Fairness measure not implemented.")
 
 
+def build_fair_epsnet_las_vegas(
+    points: List[Point],
+    rangespace: List[Set[Point]],
+    vc,
+    epsilon,
+    fairconfig: FairConfig,
+    color_ratios=None,
+    success_prob=0.9,
+    c1=1,
+    c2=1,
+    weights=None,
+    trials=8,
+    timeout=None,
+    workers=None,
+    pick="first",
+) -> List[Point]:
+    """
+    Fair version of build_epsnet_las_vegas.
+
+    Replaces the unbounded resampling loop of build_fair_epsnet_sample by a
+    fixed number of independent trials; a trial is kept only if it passes
+    _is_good_epsnet and hits every heavy range. The kept sample is then
+    augmented as usual.
+    """
+    d = vc
+    m = get_epsnet_size(epsilon, d, success_prob, c2)
+    m = min(m, len(points))
+
+    fairness = fairconfig.fairness
+    k = fairconfig.k
+    v = c1 * math.ceil(math.log(4 * k))
+    print(f"[build_fair_epsnet_las_vegas] epsnet size m: {int(m)}, v: {v}")
+
+    if fairness != FairnessMeasure.DP:
+        # Custom-ratio
+        raise NotImplementedError("Fairness measure not implemented.")
+    if color_ratios is None:
+        color_ratios = [0] * k
+        for p in points:
+            color_ratios[p.color] += 1 / len(points)
+
+    A = heavy_incidence_matrix(points, rangespace, epsilon)
+    colors = np.asarray([p.color for p in points])
+    indices = _run_las_vegas_trials(
+        A,
+        len(points),
+        m,
+        weights,
+        trials,
+        timeout,
+        workers,
+        pick,
+        fair=(colors, k, v, color_ratios),
+    )
+    epsnet = [points[i] for i in indices]
+    return _augment_epsnet(epsnet, points, color_ratios, v, k)
+
+
+def build_fair_epsnet_kdtree(
+    points: List[Point],
+    rangespace: List[Set[Point]],
+    epsilon,
+    fairconfig: FairConfig,
+    color_ratios=None,
+    dims=None,
+) -> List[Point]:
+    """
+    Fair version of build_epsnet_kdtree.
+
+    The representatives are picked per color inside every cell (every
+    t-th point of each color, with t divided by k), so the picks follow the
+    color ratios cell by cell and every heavy box is still hit. The
+    rounding per cell is then fixed by padding every color up to the
+    ratios with points spread along the first coordinate.
+    """
+    if fairconfig.fairness != FairnessMeasure.DP:
+        # Custom-ratio
+        raise NotImplementedError("Fairness measure not implemented.")
+    # Imported here, fair_hittingset imports this module
+    from algorithms.fairness.fair_hittingset import _get_fair_padding
+
+    if not points:
+        return []
+    k = fairconfig.k
+    coords = np.asarray([p.point for p in points], dtype=float)
+    colors = np.asarray([p.color for p in points])
+    if color_ratios is None:
+        color_ratios = (np.bincount(colors, minlength=k) / len(points)).tolist()
+    dims = dims if dims is not None else coords.shape[1]
+    picks = _box_net(
+        coords, np.arange(len(points)), list(range(dims)), epsilon * len(points), colors, k
+    )
+
+    counts = np.bincount(colors[picks], minlength=k) if picks else np.zeros(k, dtype=int)
+    padding = _get_fair_padding(dict(enumerate(counts.tolist())), color_ratios)
+    selected = np.zeros(len(points), dtype=bool)
+    selected[picks] = True
+    order = np.argsort(coords[:, 0], kind="stable")
+    for color, to_add in padding.items():
+        candidates = order[(colors[order] == color) & ~selected[order]]
+        to_add = min(to_add, len(candidates))
+        if to_add > 0:
+            picks += candidates[np.linspace(0, len(candidates) - 1, to_add).astype(int)].tolist()
+    print(f"[build_fair_epsnet_kdtree] epsnet size: {len(picks)}, padding: {padding}")
+    return [points[i] for i in picks]
+
+
 def _is_good_epsnet(
     epsnet: List[Point],
     k: int,
@@ -74,15 +216,20 @@ def _is_good_epsnet(
     return True
 
 
+@phase("augment_epsnet")
 def _augment_epsnet(
     epsnet: List[Point],
     points: List[Point],
     color_ratios: List[float],
     v: int,
     k: int,
+    points_by_color: dict = None,
 ) -> List[Point]:
     """
     Augment the epsnet with points from the point-set.
+
+    points_by_color (optional) maps each color to its points, so the
+    point-set does not have to be scanned once per color.
     """
     print("[_augment_epsnet] epsnet colors count:")
     for color in range(k):
@@ -103,8 +250,12 @@ def _augment_epsnet(
         to_add = to_adds[color]
         if to_add > 0:
             # randomly select points from the point-set
+            if points_by_color is not None:
+                candidates = points_by_color.get(color, [])
+            else:
+                candidates = [p for p in points if (p.color == color)]
             epsnet += random.sample(
-                [p for p in points if (p.color == color)],
+                candidates,
                 # points,
                 to_add,
             )
@@ -131,13 +282,18 @@ def build_fair_epsnet_discrepancy(
     rangespace: List[Set[Point]],
     vc,
     epsilon,
+    reduce=False,
 ) -> List[Point]:
     """Build eps-net by iterative discrepancy halving.
 
+    If reduce is set, identical ranges are removed first.
+
     Reference:
         - Chazelle, Bernard. The Discrepancy Method: Randomness and Complexity. Cambridge University Press, 2000.
         - Chapter 4
     """
+    if reduce:
+        rangespace, _ = dedupe_ranges(rangespace)
     d = vc
     # m = c1 * (d / epsilon) * math.log(d / epsilon)  # TODO: what is constant?
     m = get_epsnet_size(epsilon, d, 0.9)
@@ -151,20 +307,29 @@ def build_fair_epsnet_discrepancy(
     return subset  # Final size is almost m
 
 
+@phase("fair_halving")
 def _fair_havling(
-    points: List[Point], rangespace: List[Set[Point]], fairconfig: FairConfig
+    points: List[Point], rangespace: List[Set[Point]], fairconfig: FairConfig, weights: dict = None
 ) -> List[Point]:
     """
     First finds a fair matching of points, then applies the greedy discrepancy halving.
+
+    With weights, the halving is weighted (see _random_halving): points of
+    a color are matched by weight and an odd point out is kept.
     """
     k = fairconfig.k
     matching = []
+    odd = []
     for color in range(k):
-        # TODO: what if the number of points are not even?
+        # An odd point out is dropped, as in _random_halving
         p_color = [p for p in points if p.color == color]
-        matching += [(p_color[i], p_color[i + 1]) for i in range(0, len(p_color), 2)]
+        if weights is not None:
+            p_color.sort(key=weights.__getitem__)
+            odd += p_color[len(p_color) - len(p_color) % 2 :]
+        matching += [(p_color[i], p_color[i + 1]) for i in range(0, len(p_color) - 1, 2)]
 
-    return _greedy_discrepancy_halving(rangespace, matching)
+    coloring, half = _greedy_discrepancy_halving(rangespace, matching, weights=weights)
+    return coloring, half + odd
 
 
 def build_fair_epsnet_sketch_merge(
@@ -175,6 +340,7 @@ def build_fair_epsnet_sketch_merge(
     c1,
     fairconfig: FairConfig,
     c2=1,
+    fan_in=2,
 ) -> List[Point]:
     """
     Build eps-net by sketch-and-merge discrepancy.
@@ -184,6 +350,7 @@ def build_fair_epsnet_sketch_merge(
         ranges (List[Range])
         epsilon (float): Epsilon parameter for the eps-net.
         c1 (float): Constant for partition size.
+        fan_in (int): Number of partitions merged at a time (see _sketch_merge).
     """
     d = vc
 
@@ -204,6 +371,7 @@ def build_fair_epsnet_sketch_merge(
         partitions,
         rangespace,
         halving=lambda *args: _fair_havling(fairconfig=fairconfig, *args),
+        fan_in=fan_in,
     )
     # m = c2 * (d / epsilon**2) * math.log(d / epsilon)
     while len(root) > 2 * m:
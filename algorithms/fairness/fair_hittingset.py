@@ -1,40 +1,91 @@
+import heapq
 import random
 import math
 import numpy as np
 from scipy.optimize import linprog
+from scipy.sparse import csr_matrix, hstack
 
 from typing import List
 from core.fairness import *
-from algorithms.hittingset import HittingSetStrategy
+from algorithms.hittingset import HittingSetStrategy, find_hitting_set_parallel_greedy
 from core.points import Point
 from core.ranges import Range
+from core.reduction import reduce_range_space, prune_candidates, expand_weights
+from core.incidence import incidence_matrix
+from core.profiling import phase
 from algorithms.fairness.fair_epsnet import _augment_epsnet, build_fair_epsnet_sample
 
 
 def find_fair_hitting_set(
     strategy: HittingSetStrategy, fairconfig: FairConfig, **kwargs
 ) -> List[Point]:
-    if strategy == HittingSetStrategy.GREEDY:
+    if strategy == HittingSetStrategy.AUTO:
+        # Cheapest strategy with the requested guarantee (see algorithms.planner)
+        from algorithms.planner import plan_hitting_set, get_builder_kwargs
+
+        plan = plan_hitting_set(
+            kwargs["points"],
+            kwargs["rangespace"],
+            kwargs.get("vc"),
+            kwargs.pop("guarantee", "deterministic"),
+            k=fairconfig.k,
+            fair=True,
+        )
+        print(f"[find_fair_hitting_set] {plan}")
+        finders = {
+            HittingSetStrategy.GREEDY: find_fair_hitting_set_greedy,
+            HittingSetStrategy.GEOMETRIC: find_fair_hitting_set_geometric,
+            HittingSetStrategy.PARALLEL_GREEDY: find_fair_hitting_set_parallel_greedy,
+            HittingSetStrategy.QUOTA_GREEDY: find_fair_hitting_set_quota_greedy,
+        }
+        finder = finders[plan.strategy]
+        return finder(
+            **get_builder_kwargs(finder, dict(kwargs, fairconfig=fairconfig), finders.values())
+        )
+    elif strategy == HittingSetStrategy.GREEDY:
         return find_fair_hitting_set_greedy(fairconfig=fairconfig, **kwargs)
     elif strategy == HittingSetStrategy.GEOMETRIC:
         return find_fair_hitting_set_geometric(fairconfig=fairconfig, **kwargs)
+    elif strategy == HittingSetStrategy.PARALLEL_GREEDY:
+        return find_fair_hitting_set_parallel_greedy(fairconfig=fairconfig, **kwargs)
+    elif strategy == HittingSetStrategy.QUOTA_GREEDY:
+        return find_fair_hitting_set_quota_greedy(fairconfig=fairconfig, **kwargs)
     else:
         raise NotImplementedError("Strategy not implemented.")
 
 
 def find_fair_hitting_set_greedy(
-    points: List[Point], rangespace: List[Range], fairconfig: FairConfig, c1=1
+    points: List[Point],
+    rangespace: List[Range],
+    fairconfig: FairConfig,
+    c1=1,
+    reduce=False,
+    ranges: List[Range] = None,
 ) -> List[Point]:
     """
     This is a naive implementation that simply adds arbitrary points to the hitting set.
     The number of points to add is O(log k) where k is the number of colors.
+
+    If reduce is set, the greedy runs on the reduced range space (see
+    core.reduction); color ratios and augmentation still use all points.
+    The same holds for the geometric candidates if ranges (the Range
+    objects of the range space) is given (see core.reduction.prune_candidates).
     """
     hitting_set = []  # The resulting hitting set
+    candidates = points
+    if ranges is not None:
+        candidates, rangespace = prune_candidates(points, rangespace, ranges)
+    if reduce:
+        # A representative hits the same ranges as its group, so the
+        # multiplicities do not change the greedy choices
+        candidates, rangespace, _ = reduce_range_space(
+            candidates, rangespace, prune_dominated=True, collapse=True
+        )
     remaining_ranges = rangespace.copy()  # Copy of ranges to track uncovered ranges
 
     while remaining_ranges:
         # Count how many ranges each point hits
-        point_hits = {point: 0 for point in points}
+        point_hits = {point: 0 for point in candidates}
         for r in remaining_ranges:
             for point in r:
                 if point in point_hits:
@@ -63,17 +114,172 @@ def find_fair_hitting_set_greedy(
     return hitting_set
 
 
+def find_fair_hitting_set_parallel_greedy(
+    points: List[Point],
+    rangespace: List[Range],
+    fairconfig: FairConfig,
+    c1=1,
+    delta=0.1,
+    workers=None,
+) -> List[Point]:
+    """
+    Same as find_fair_hitting_set_greedy, with the bucketed parallel greedy
+    (find_hitting_set_parallel_greedy) for the covering step.
+    """
+    hitting_set = find_hitting_set_parallel_greedy(
+        points, rangespace, delta=delta, workers=workers
+    )
+
+    k = fairconfig.k
+    color_ratios = []
+    for color in range(k):
+        rate = [p for p in points if p.color == color]
+        color_ratios.append(len(rate) / len(points))
+
+    # augment more points to the hitting set
+    v = c1 * math.ceil(math.log(4 * k))
+    hitting_set = _augment_epsnet(hitting_set, points, color_ratios, v, k)
+
+    print(f"[find_fair_hitting_set_parallel_greedy] hitting set size: {len(hitting_set)}")
+    return hitting_set
+
+
+def find_fair_hitting_set_quota_greedy(
+    points: List[Point],
+    rangespace: List[Range],
+    fairconfig: FairConfig,
+    color_ratios: List[float] = None,
+) -> List[Point]:
+    """
+    Fair greedy hitting set that respects the color quotas while selecting.
+
+    At every step the best point is taken among the colors that are still
+    under their target ratio (a color whose next point would not exceed it).
+    Only when none of them hits an uncovered range is the best point of any
+    color taken. Once every range is hit, the smallest padding that matches
+    color_ratios is added (_get_fair_padding).
+
+    Gains are kept up to date through the incidence matrix (each covered
+    range decrements its points once) and every color has its own lazy
+    max-heap, so the whole run costs O(I log n) for I incidences.
+
+    Parameters:
+        points (List[Point]): The points to consider.
+        rangespace (List[Set[Point]]): The ranges to cover.
+        fairconfig (FairConfig): Fairness configuration.
+        color_ratios (List[float]): Target color ratios (default: ratios of points).
+    """
+    k = fairconfig.k
+    n = len(points)
+    if color_ratios is None:
+        color_ratios = [0] * k
+        for p in points:
+            color_ratios[p.color] += 1 / n
+
+    A = incidence_matrix(points, rangespace)
+    A_csc = A.tocsc()
+    gains = np.diff(A_csc.indptr).astype(np.int64)
+    uncovered = np.diff(A.indptr) > 0  # Empty ranges cannot be hit
+    remaining = int(uncovered.sum())
+
+    heaps = {color: [] for color in range(k)}
+    by_color = {color: [] for color in range(k)}
+    for i, p in enumerate(points):
+        heaps[p.color].append((-gains[i], i))
+        by_color[p.color].append(i)
+    for heap in heaps.values():
+        heapq.heapify(heap)
+
+    selected = np.zeros(n, dtype=bool)
+    color_counts = {color: 0 for color in range(k)}
+    hitting_set = []
+
+    def top(color):
+        # Lazy max-heap: gains only decrease, so stale entries are re-pushed
+        heap = heaps[color]
+        while heap:
+            gain, i = heap[0]
+            if selected[i]:
+                heapq.heappop(heap)
+            elif -gain != gains[i]:
+                heapq.heapreplace(heap, (-gains[i], i))
+            else:
+                return i
+        return None
+
+    while remaining > 0:
+        size = len(hitting_set)
+        under_quota = [
+            color
+            for color in range(k)
+            if color_counts[color] + 1 <= color_ratios[color] * (size + 1)
+        ]
+        best = None
+        for colors in (under_quota, range(k)):
+            for color in colors:
+                i = top(color)
+                if i is not None and (best is None or gains[i] > gains[best]):
+                    best = i
+            if best is not None and gains[best] > 0:
+                break
+
+        selected[best] = True
+        hitting_set.append(points[best])
+        color_counts[points[best].color] += 1
+        for j in A_csc.indices[A_csc.indptr[best] : A_csc.indptr[best + 1]]:
+            if uncovered[j]:
+                uncovered[j] = False
+                remaining -= 1
+                gains[A.indices[A.indptr[j] : A.indptr[j + 1]]] -= 1
+
+    padding = _get_fair_padding(color_counts, color_ratios)
+    for color, to_add in padding.items():
+        candidates = [i for i in by_color[color] if not selected[i]]
+        for i in random.sample(candidates, min(to_add, len(candidates))):
+            selected[i] = True
+            hitting_set.append(points[i])
+
+    print(f"[find_fair_hitting_set_quota_greedy] hitting set size: {len(hitting_set)}")
+    return hitting_set
+
+
 def find_fair_hitting_set_geometric(
-    points: List[Point], rangespace: List[Range], vc, fairconfig: FairConfig, c1=1, color_ratios=None
+    points: List[Point], rangespace: List[Range], vc, fairconfig: FairConfig, c1=1, color_ratios=None, reduce=False, constraint_generation=False, ranges: List[Range] = None
 ) -> List[Point]:
+    """
+    Find a fair hitting set by sampling a fair eps-net with the LP weights.
+
+    If ranges (the Range objects of the range space) is given, the LP only
+    has columns for the geometric candidates (see core.reduction.prune_candidates),
+    which include a point of every color with a positive ratio. The other
+    points get weight 0, so the augmentation can still use them.
+
+    If reduce is set, the LP runs on the collapsed representatives and their
+    values are spread over the coincident points by multiplicity (see
+    core.reduction.expand_weights), so sampling and augmentation see all points.
+    """
     k = fairconfig.k
     if color_ratios == None:
         color_ratios = []
         for color in range(k):
             rate = [p for p in points if p.color == color]
             color_ratios.append(len(rate) / len(points))
+    all_points = points
+    if ranges is not None:
+        # Every color with a positive ratio needs a candidate for the LP to be feasible
+        colors = [color for color in range(k) if color_ratios[color] > 0]
+        points, rangespace = prune_candidates(points, rangespace, ranges, colors=colors)
+    candidates, sample_rangespace = points, rangespace
+    if reduce:
+        # Ratios above are taken from all points, the LP runs on the reduced instance
+        points, rangespace, multiplicities = reduce_range_space(
+            points, rangespace, prune_dominated=True, collapse=True
+        )
 
-    weights, epsilon = _get_fair_reweights(
+    get_reweights = (
+        _get_fair_reweights_cutting_plane if constraint_generation else _get_fair_reweights
+    )
+    weights, epsilon = get_reweights(
         points=points, rangespace=rangespace, k=k, color_ratios=color_ratios
     )
     print(f"[find_hitting_set_geometric] epsilon: {epsilon}")
@@ -84,7 +290,15 @@ def find_fair_hitting_set_geometric(
         )
     print(f"[find_hitting_set_geometric] weights by color: {weights_by_color}")
 
+    if reduce:
+        weights = expand_weights(candidates, points, weights, multiplicities)
+        points, rangespace = candidates, sample_rangespace
     _reweight_points(points, weights)
+    if ranges is not None:
+        # Sample among the candidates, augment from all points
+        position = {p: i for i, p in enumerate(points)}
+        weights = [weights[position[p]] if p in position else 0 for p in all_points]
+        points = all_points
 
     epsnet = build_fair_epsnet_sample(
         points=points,
@@ -101,6 +315,7 @@ def find_fair_hitting_set_geometric(
     return epsnet
 
 
+@phase("fair_lp_reweights")
 def _get_fair_reweights(
     points: List[Point], rangespace: List[set], k: int, color_ratios: List[float] = None
 ) -> List[float]:
@@ -172,6 +387,86 @@ def _get_fair_reweights(
         raise ValueError("Linear programming failed to find a solution.")
 
 
+@phase("fair_lp_reweights_cutting_plane")
+def _get_fair_reweights_cutting_plane(
+    points: List[Point],
+    rangespace: List[set],
+    k: int,
+    color_ratios: List[float] = None,
+    sample_size: int = None,
+    max_rounds: int = 100,
+    tol: float = 1e-9,
+) -> List[float]:
+    """
+    Same LP as _get_fair_reweights, solved by constraint generation.
+
+    See _get_reweights_cutting_plane: the LP is solved on a sample of the
+    ranges, every range with sum(z_i) < epsilon is added, and the LP is
+    re-solved until none is violated.
+
+    Returns:
+        List[float]: Optimal values of z_i for each point, and epsilon.
+    """
+    n = len(points)  # Number of points
+    m = len(rangespace)  # Number of ranges
+    A = incidence_matrix(points, rangespace).astype(float)
+
+    if len(color_ratios) != k:
+        raise ValueError(
+            "The length of color_ratios must match the number of unique colors."
+        )
+
+    # Objective function: Maximize epsilon
+    c = np.zeros(n + 1)
+    c[-1] = -1
+
+    # Sum of all z_i's is 1, and the sum of z_i for each color matches its ratio
+    A_eq = np.zeros((k + 1, n + 1))
+    A_eq[0, :n] = 1
+    for i, p in enumerate(points):
+        A_eq[p.color + 1, i] = 1
+    b_eq = np.array([1.0] + list(color_ratios))
+
+    bounds = [(0, 1) for _ in range(n)] + [(0, None)]
+
+    if sample_size is None:
+        sample_size = min(m, max(64, 2 * n))
+    active = np.zeros(m, dtype=bool)
+    active[random.sample(range(m), min(sample_size, m))] = True
+
+    for round in range(max_rounds):
+        # Constraints: -sum(z_i for p_i in r) + epsilon <= 0
+        A_active = hstack(
+            [-A[active], csr_matrix(np.ones((int(active.sum()), 1)))]
+        ).tocsr()
+        result = linprog(
+            c,
+            A_ub=A_active,
+            b_ub=np.zeros(A_active.shape[0]),
+            A_eq=A_eq,
+            b_eq=b_eq,
+            bounds=bounds,
+            method="highs",
+        )
+        if not result.success:
+            raise ValueError("Linear programming failed to find a solution.")
+        z_values = result.x[:-1]
+        epsilon = result.x[-1]
+
+        coverage = A @ z_values
+        violated = np.where(coverage < epsilon - tol)[0]
+        print(
+            f"[_get_fair_reweights_cutting_plane] round: {round + 1}, "
+            f"active: {int(active.sum())} / {m}, violated: {len(violated)}"
+        )
+        if len(violated) == 0:
+            return z_values, epsilon
+        violated = violated[np.argsort(coverage[violated])][:sample_size]
+        active[violated] = True
+
+    raise ValueError("Constraint generation did not converge.")
+
+
 def _reweight_points(points: List[Point], weights: List[float]) -> List[Point]:
     """
     Reweight points based on the given weights.
@@ -185,3 +480,30 @@ def _reweight_points(points: List[Point], weights: List[float]) -> List[Point]:
     """
     for i, weight in enumerate(weights):
         points[i].weight = weight
+
+
+def _get_fair_padding(color_counts: dict, color_ratios: List[float]) -> dict:
+    """
+    Smallest number of points to add per color so that the set matches color_ratios.
+
+    Parameters:
+        color_counts (dict): Number of points of each color already in the set.
+        color_ratios (List[float]): Target ratio of each color.
+
+    Returns:
+        dict: Number of points to add for each color.
+    """
+    total = max(
+        [sum(color_counts.values())]
+        + [
+            math.ceil(color_counts.get(color, 0) / ratio)
+            for color, ratio in enumerate(color_ratios)
+            if ratio > 0
+        ]
+    )
+    padding = {}
+    for color, ratio in enumerate(color_ratios):
+        to_add = round(ratio * total) - color_counts.get(color, 0)
+        if to_add > 0:
+            padding[color] = to_add
+    return padding
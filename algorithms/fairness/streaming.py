@@ -0,0 +1,145 @@
+import math
+
+from typing import Iterable, List
+from algorithms.epsnet import get_epsnet_size
+from core.fairness import FairConfig, FairnessMeasure
+from core.points import Point
+from core.sampling import WeightedReservoir
+from algorithms.fairness.fair_epsnet import _is_good_epsnet, _augment_epsnet
+
+
+class FairEpsNetSampler:
+    def __init__(
+        self,
+        vc,
+        epsilon,
+        fairconfig: FairConfig,
+        success_prob=0.9,
+        c1=1,
+        c2=1,
+        trials=4,
+        weighted=False,
+    ):
+        """
+        One-pass fair eps-net sampler.
+
+        Streaming version of build_fair_epsnet_sample: `trials` independent
+        weighted reservoirs of size m replace the resampling loop, and one
+        uniform reservoir of size v * m per color replaces the per-color
+        lists used by the augmentation. Color ratios are counted on the fly.
+        Memory is O((trials + k v) m), independent of the stream length.
+
+        Parameters:
+            vc: VC-dimension of the ranges.
+            epsilon (float): Epsilon parameter for the eps-net.
+            fairconfig (FairConfig): Fairness configuration.
+            success_prob (float): Success probability of each sample.
+            c1, c2: Same constants as build_fair_epsnet_sample.
+            trials (int): Number of independent samples kept for the _is_good_epsnet check.
+            weighted (bool): Sample (and compute color ratios) by Point.weight.
+        """
+        if fairconfig.fairness != FairnessMeasure.DP:
+            # Custom-ratio
+            raise NotImplementedError("Fairness measure not implemented.")
+        self.fairconfig = fairconfig
+        self.k = fairconfig.k
+        self.m = get_epsnet_size(epsilon, vc, success_prob, c2)
+        self.v = c1 * math.ceil(math.log(4 * self.k))
+        self.weighted = weighted
+
+        self.samples = [WeightedReservoir(self.m) for _ in range(trials)]
+        self.color_samples = [WeightedReservoir(self.v * self.m) for _ in range(self.k)]
+        self.color_weights = [0.0] * self.k
+        self.n = 0
+
+    def add(self, point: Point) -> bool:
+        """Offer a point; returns True if it entered one of the reservoirs."""
+        weight = point.weight if self.weighted else 1
+        self.n += 1
+        self.color_weights[point.color] += weight
+        changed = False
+        for sample in self.samples:
+            changed |= sample.add(point, weight)
+        changed |= self.color_samples[point.color].add(point)
+        return changed
+
+    def add_many(self, points: Iterable[Point]):
+        for p in points:
+            self.add(p)
+
+    @property
+    def color_ratios(self) -> List[float]:
+        total = sum(self.color_weights)
+        if total == 0:
+            # Nothing seen yet
+            return [1 / self.k] * self.k
+        return [w / total for w in self.color_weights]
+
+    def shrink(self, m: int):
+        """Reduce the eps-net size to m (the reservoirs keep their largest keys)."""
+        self.m = m
+        for sample in self.samples:
+            sample.shrink(m)
+        for sample in self.color_samples:
+            sample.shrink(self.v * m)
+
+    def _pick_sample(self, color_ratios: List[float]) -> List[Point]:
+        """
+        First trial sample that passes _is_good_epsnet.
+
+        build_fair_epsnet_sample resamples until the check passes, which a
+        single pass cannot do, so a RuntimeError is raised if all trials fail.
+        """
+        for sample in self.samples:
+            epsnet = sample.items()
+            if _is_good_epsnet(epsnet, self.k, self.v, color_ratios):
+                return epsnet
+            print("[FairEpsNetSampler] Bad epsnet, trying next sample...")
+        raise RuntimeError(
+            f"All {len(self.samples)} samples over-represent a color, use more trials."
+        )
+
+    def _augment(self, sample: List[Point], color_ratios: List[float]) -> List[Point]:
+        points_by_color = {
+            color: reservoir.items() for color, reservoir in enumerate(self.color_samples)
+        }
+        return _augment_epsnet(
+            list(sample), [], color_ratios, self.v, self.k, points_by_color=points_by_color
+        )
+
+    def epsnet(self) -> List[Point]:
+        """The fair eps-net of the points seen so far."""
+        if self.n == 0:
+            return []
+        color_ratios = self.color_ratios
+        print(f"[FairEpsNetSampler] n: {self.n}, epsnet size m: {min(self.m, self.n)}, v: {self.v}")
+        return self._augment(self._pick_sample(color_ratios), color_ratios)
+
+
+def build_fair_epsnet_stream(
+    stream: Iterable,
+    vc,
+    epsilon,
+    fairconfig: FairConfig,
+    success_prob=0.9,
+    c1=1,
+    c2=1,
+    trials=4,
+    weighted=False,
+) -> List[Point]:
+    """
+    Build a fair eps-net in one pass over a stream of points.
+
+    Parameters:
+        stream (Iterable): Points, or chunks (lists) of points.
+        (see FairEpsNetSampler for the other parameters)
+    """
+    sampler = FairEpsNetSampler(
+        vc, epsilon, fairconfig, success_prob, c1, c2, trials, weighted
+    )
+    for item in stream:
+        if isinstance(item, Point):
+            sampler.add(item)
+        else:
+            sampler.add_many(item)
+    return sampler.epsnet()
@@ -1,5 +1,7 @@
+import random
 import numpy as np
 
+from concurrent.futures import ProcessPoolExecutor
 from typing import List
 from scipy.optimize import linprog
 from enum import Enum
@@ -7,24 +9,58 @@ from enum import Enum
 from core.ranges import Range
 from algorithms.epsnet import build_epsnet_sample
 from core.points import Point
+from core.reduction import reduce_range_space, prune_candidates, expand_weights
+from core.incidence import incidence_matrix
+from core.budget import Budget, AnytimeResult, BudgetExhausted
+from core.verification import count_uncovered
+from core.profiling import phase
 
 
 class HittingSetStrategy(Enum):
     GREEDY = "greedy"
     GEOMETRIC = "geometric"
+    PARALLEL_GREEDY = "parallel_greedy"
+    QUOTA_GREEDY = "quota_greedy"  # plain greedy without fairness
+    AUTO = "auto"
 
 
 def find_hitting_set(strategy: HittingSetStrategy, **kwargs) -> List[Point]:
-    if strategy == HittingSetStrategy.GREEDY:
+    if strategy == HittingSetStrategy.AUTO:
+        # Cheapest strategy with the requested guarantee (see algorithms.planner)
+        from algorithms.planner import plan_hitting_set, get_builder_kwargs
+
+        plan = plan_hitting_set(
+            kwargs["points"],
+            kwargs["rangespace"],
+            kwargs.get("vc"),
+            kwargs.pop("guarantee", "deterministic"),
+        )
+        print(f"[find_hitting_set] {plan}")
+        finders = {
+            HittingSetStrategy.GREEDY: find_hitting_set_greedy,
+            HittingSetStrategy.GEOMETRIC: find_hitting_set_geometric,
+            HittingSetStrategy.PARALLEL_GREEDY: find_hitting_set_parallel_greedy,
+        }
+        finder = finders[plan.strategy]
+        return finder(**get_builder_kwargs(finder, kwargs, finders.values()))
+    elif strategy in (HittingSetStrategy.GREEDY, HittingSetStrategy.QUOTA_GREEDY):
+        # Without color quotas the quota greedy is the plain greedy
         return find_hitting_set_greedy(**kwargs)
     elif strategy == HittingSetStrategy.GEOMETRIC:
         return find_hitting_set_geometric(**kwargs)
+    elif strategy == HittingSetStrategy.PARALLEL_GREEDY:
+        return find_hitting_set_parallel_greedy(**kwargs)
     else:
         raise NotImplementedError("Strategy not implemented.")
 
 
 def find_hitting_set_greedy(
-    points: List[Point], rangespace: List[Range], limit=-1
+    points: List[Point],
+    rangespace: List[Range],
+    limit=-1,
+    reduce=False,
+    budget: Budget = None,
+    ranges: List[Range] = None,
 ) -> List[Point]:
     """
     Find a hitting set for the given ranges using a greedy algorithm.
@@ -33,13 +69,33 @@ def find_hitting_set_greedy(
         points (List[Point]): The points to consider.
         ranges (List[Range]): The ranges to cover.
         limit (int): The maximum size of the hitting set. Default is -1 (no limit).
+        reduce (bool): Deduplicate ranges, drop dominated ranges and collapse
+            coincident points first (see core.reduction).
+        budget (Budget): If given, selection stops when it runs out (one work
+            unit per selected point) and the partial hitting set is returned
+            as an AnytimeResult with the number of uncovered ranges.
+        ranges (List[Range]): The Range objects of the range space. If given,
+            only the geometric candidates are considered (see
+            core.reduction.prune_candidates).
     """
+    if ranges is not None:
+        points, rangespace = prune_candidates(points, rangespace, ranges)
+    if reduce:
+        # A representative hits the same ranges as its group, so the
+        # multiplicities do not change the greedy choices
+        points, rangespace, _ = reduce_range_space(
+            points, rangespace, prune_dominated=True, collapse=True
+        )
 
     hitting_set = []  # The resulting hitting set
     remaining_ranges = rangespace.copy()  # Copy of ranges to track uncovered ranges
     counter = limit
 
     while remaining_ranges and (limit == -1 or counter > 0):
+        if budget is not None:
+            if budget.exhausted():
+                break
+            budget.spend()
         # Count how many ranges each point hits
         point_hits = {point: 0 for point in points}
         for r in remaining_ranges:
@@ -58,14 +114,145 @@ def find_hitting_set_greedy(
 
         counter -= 1
     print(f"[find_hitting_set_greedy] hitting set size: {len(hitting_set)}")
+    if budget is not None:
+        # Empty ranges cannot be hit and are not counted (as in count_uncovered)
+        uncovered = sum(1 for r in remaining_ranges if r)
+        print(f"[find_hitting_set_greedy] uncovered ranges: {uncovered}")
+        return AnytimeResult(hitting_set, uncovered == 0, uncovered=uncovered)
+    return hitting_set
+
+
+def find_hitting_set_parallel_greedy(
+    points: List[Point], rangespace: List[Range], delta=0.1, workers=None
+) -> List[Point]:
+    """
+    Find a hitting set with bucketed (approximate) greedy.
+
+    Points are bucketed by degree in powers of (1 + delta). Each round takes
+    the top bucket in random order and keeps every point whose coverage,
+    after the points already kept in this round, is still in the top bucket.
+    Every kept point is within a (1 + delta) factor of the best greedy
+    choice, so the (1 + delta) H_m greedy ratio is kept, and the maximum
+    degree drops by (1 + delta) per round, i.e. O(log_{1+delta} m) rounds.
+
+    Parameters:
+        points (List[Point]): The points to consider.
+        rangespace (List[Set[Point]]): The ranges to cover.
+        delta (float): Bucket width.
+        workers (int): Processes used for the degree recomputation (default: in-process).
+    """
+    A = incidence_matrix(points, rangespace)
+    A_csc = A.tocsc()
+    m, n = A.shape
+    uncovered = np.diff(A.indptr) > 0  # Empty ranges cannot be hit
+
+    pool = None
+    if workers is not None and workers > 1:
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_degree_worker,
+            initargs=(A.indptr, A.indices, n),
+        )
+
+    hitting_set = []
+    rounds = 0
+    try:
+        while uncovered.any():
+            rounds += 1
+            degrees = _get_degrees(A, np.flatnonzero(uncovered), pool, workers)
+            threshold = degrees.max() / (1 + delta)
+            candidates = np.flatnonzero(degrees >= threshold).tolist()
+            random.shuffle(candidates)
+
+            # Maximal batch of points with nearly independent coverage
+            for i in candidates:
+                ranges_of_i = A_csc.indices[A_csc.indptr[i] : A_csc.indptr[i + 1]]
+                ranges_of_i = ranges_of_i[uncovered[ranges_of_i]]
+                if len(ranges_of_i) >= threshold:
+                    hitting_set.append(points[i])
+                    uncovered[ranges_of_i] = False
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    print(
+        f"[find_hitting_set_parallel_greedy] hitting set size: {len(hitting_set)}, rounds: {rounds}"
+    )
     return hitting_set
 
 
+_degree_worker = {}
+
+
+def _init_degree_worker(indptr, indices, n):
+    _degree_worker["indptr"] = indptr
+    _degree_worker["indices"] = indices
+    _degree_worker["n"] = n
+
+
+def _shard_degrees(rows: np.ndarray) -> np.ndarray:
+    """Number of the given ranges containing each point (runs in a worker)."""
+    indptr, indices = _degree_worker["indptr"], _degree_worker["indices"]
+    members = [indices[indptr[j] : indptr[j + 1]] for j in rows]
+    if not members:
+        return np.zeros(_degree_worker["n"], dtype=np.int64)
+    return np.bincount(np.concatenate(members), minlength=_degree_worker["n"])
+
+
+def _get_degrees(A, rows: np.ndarray, pool, workers) -> np.ndarray:
+    if pool is None:
+        return np.asarray(A[rows].sum(axis=0)).ravel()
+    shards = np.array_split(rows, workers)
+    return sum(pool.map(_shard_degrees, shards))
+
+
 def find_hitting_set_geometric(
-    points: List[Point], rangespace: List[Range], vc
+    points: List[Point],
+    rangespace: List[Range],
+    vc,
+    reduce=False,
+    constraint_generation=False,
+    budget: Budget = None,
+    ranges: List[Range] = None,
 ) -> List[Point]:
-    weights, epsilon = _get_reweights(points, rangespace)
+    """
+    Find a hitting set by sampling an eps-net with the LP weights.
+
+    If a budget with a time limit is given, it is passed to the LP solver.
+    When the LP does not finish in time, an unweighted eps-net for the
+    smallest range is sampled instead. The result is then an AnytimeResult
+    with the number of ranges it does not hit.
+
+    If ranges (the Range objects of the range space) is given, the LP only
+    has columns for the geometric candidates (see core.reduction.prune_candidates).
+
+    If reduce is set, the LP runs on the collapsed representatives and their
+    values are spread over the coincident points by multiplicity (see
+    core.reduction.expand_weights) before sampling.
+    """
+    if ranges is not None:
+        points, rangespace = prune_candidates(points, rangespace, ranges)
+    candidates, sample_rangespace = points, rangespace
+    if reduce:
+        points, rangespace, multiplicities = reduce_range_space(
+            points, rangespace, prune_dominated=True, collapse=True
+        )
+    try:
+        if constraint_generation:
+            weights, epsilon = _get_reweights_cutting_plane(points, rangespace, budget=budget)
+        else:
+            weights, epsilon = _get_reweights(points, rangespace, budget=budget)
+        solved = True
+    except BudgetExhausted:
+        print("[find_hitting_set_geometric] LP out of budget, sampling without weights...")
+        weights = None
+        epsilon = min((len(r) for r in sample_rangespace if r), default=len(candidates)) / len(candidates)
+        solved = False
     print(f"[find_hitting_set_geometric] epsilon: {epsilon}")
+    if reduce:
+        if weights is not None:
+            weights = expand_weights(candidates, points, weights, multiplicities)
+        points, rangespace = candidates, sample_rangespace
     epsnet = build_epsnet_sample(
         points=points,
         rangespace=rangespace,
@@ -75,16 +262,23 @@ def find_hitting_set_geometric(
         c1=4,
     )
     print(f"[find_hitting_set_geometric] epsnet size: {len(epsnet)}")
+    if budget is not None:
+        uncovered = count_uncovered(epsnet, rangespace)
+        return AnytimeResult(epsnet, solved and uncovered == 0, uncovered=uncovered)
     return epsnet
 
 
-def _get_reweights(points: List[Point], rangespace: List[Range]) -> List[float]:
+@phase("lp_reweights")
+def _get_reweights(
+    points: List[Point], rangespace: List[Range], budget: Budget = None
+) -> List[float]:
     """
     Solve the hitting set problem using linear programming.
 
     Parameters:
         points (List[Point]): List of points.
         ranges (List[Set[Point]]): List of ranges, where each range is a set of points.
+        budget (Budget): Its remaining time is the solver time limit.
 
     Returns:
         List[float]: Optimal values of z_i for each point.
@@ -107,7 +301,10 @@ def _get_reweights(points: List[Point], rangespace: List[Range]) -> List[float]:
     bounds = [(0, 1) for _ in range(n)]
 
     # Solve the linear program
-    result = linprog(c, A_ub=-A, b_ub=-b, bounds=bounds, method="highs")
+    result = linprog(
+        c, A_ub=-A, b_ub=-b, bounds=bounds, method="highs", options=_solver_options(budget)
+    )
+    _check_budget(result, budget)
 
     if result.success:
         # Normalize the result by dividing each value by the sum of all values
@@ -118,3 +315,95 @@ def _get_reweights(points: List[Point], rangespace: List[Range]) -> List[float]:
         return normalized_z_values, epsilon
     else:
         raise ValueError("Linear programming failed to find a solution.")
+
+
+@phase("lp_reweights_cutting_plane")
+def _get_reweights_cutting_plane(
+    points: List[Point],
+    rangespace: List[Range],
+    sample_size: int = None,
+    max_rounds: int = 100,
+    tol: float = 1e-9,
+    budget: Budget = None,
+) -> List[float]:
+    """
+    Same LP as _get_reweights, solved by constraint generation.
+
+    The LP is first solved on a random sample of the ranges. All ranges
+    violated by the current solution (found with one sparse product) are
+    added, and the LP is solved again until no range is violated. Only the
+    few tight ranges ever enter the LP, so the number of ranges can be much
+    larger than what a single linprog call handles.
+
+    scipy's HiGHS interface does not expose basis warm starts, so every round
+    solves from scratch; the active set carried over between rounds is what
+    keeps the later rounds small.
+
+    Parameters:
+        points (List[Point]): List of points.
+        rangespace (List[Set[Point]]): List of ranges.
+        sample_size (int): Number of ranges in the first round (default: min(m, 2n)).
+        max_rounds (int): Maximum number of re-solves.
+        tol (float): Feasibility tolerance.
+        budget (Budget): Its remaining time is the time limit of every solve.
+
+    Returns:
+        List[float]: Normalized values of z_i for each point, and epsilon.
+    """
+    n = len(points)  # Number of points
+    m = len(rangespace)  # Number of ranges
+    A = incidence_matrix(points, rangespace).astype(float)
+
+    if sample_size is None:
+        sample_size = min(m, max(64, 2 * n))
+    active = np.zeros(m, dtype=bool)
+    active[random.sample(range(m), min(sample_size, m))] = True
+
+    c = np.ones(n)
+    bounds = [(0, 1) for _ in range(n)]
+    for round in range(max_rounds):
+        A_active = A[active]
+        result = linprog(
+            c,
+            A_ub=-A_active,
+            b_ub=-np.ones(A_active.shape[0]),
+            bounds=bounds,
+            method="highs",
+            options=_solver_options(budget),
+        )
+        _check_budget(result, budget)
+        if not result.success:
+            raise ValueError("Linear programming failed to find a solution.")
+        z_values = result.x
+
+        # Sparse check of all ranges against the current solution
+        coverage = A @ z_values
+        violated = np.where(coverage < 1 - tol)[0]
+        print(
+            f"[_get_reweights_cutting_plane] round: {round + 1}, "
+            f"active: {int(active.sum())} / {m}, violated: {len(violated)}"
+        )
+        if len(violated) == 0:
+            break
+        # Add the most violated ranges first
+        violated = violated[np.argsort(coverage[violated])][:sample_size]
+        active[violated] = True
+    else:
+        raise ValueError("Constraint generation did not converge.")
+
+    z_sum = np.sum(z_values)
+    epsilon = 1 / z_sum if z_sum > 0 else 0
+    normalized_z_values = z_values / z_sum if z_sum > 0 else z_values
+    return normalized_z_values, epsilon
+
+
+def _check_budget(result, budget: Budget = None):
+    """Raise BudgetExhausted if the solver stopped at the time limit of the budget."""
+    if budget is not None and not result.success and (result.status == 1 or budget.exhausted()):
+        raise BudgetExhausted("LP solver stopped at the time limit.")
+
+
+def _solver_options(budget: Budget = None) -> dict:
+    if budget is None or budget.deadline is None:
+        return {}
+    return {"time_limit": budget.remaining_seconds()}
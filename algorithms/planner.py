@@ -0,0 +1,255 @@
+"""
+Cost model behind the AUTO strategies.
+
+Costs are rough counts of elementary operations in terms of
+    n: number of points, m: number of ranges, I: total incidence size (sum of |r|),
+    s: eps-net size, k: number of colors.
+They are only meant to rank the strategies, not to predict running times.
+"""
+
+import inspect
+import math
+
+from typing import Callable, Dict, List, Set
+
+from core.points import Point
+from core.ranges import Range, RangeSpace, RectangleRange, HyperRectangleRange
+from algorithms.epsnet import EpsNetStrategy, get_epsnet_size
+from algorithms.hittingset import HittingSetStrategy
+
+# Guarantee -> strategies that provide it. The discrepancy strategies halve
+# over random matchings and do not check their output, so they are only
+# probabilistic. KD_TREE is deterministic, but only for box ranges.
+EPSNET_GUARANTEES = {
+    "probabilistic": [
+        EpsNetStrategy.SAMPLE,
+        EpsNetStrategy.DISCREPANCY,
+        EpsNetStrategy.SKETCH_MERGE,
+        EpsNetStrategy.LAS_VEGAS,
+        EpsNetStrategy.KD_TREE,
+    ],
+    "verified": [EpsNetStrategy.LAS_VEGAS, EpsNetStrategy.KD_TREE],
+    "deterministic": [EpsNetStrategy.KD_TREE],
+}
+HITTING_SET_GUARANTEES = {
+    "probabilistic": [
+        HittingSetStrategy.GREEDY,
+        HittingSetStrategy.PARALLEL_GREEDY,
+        HittingSetStrategy.QUOTA_GREEDY,
+        HittingSetStrategy.GEOMETRIC,
+    ],
+    "deterministic": [
+        HittingSetStrategy.GREEDY,
+        HittingSetStrategy.PARALLEL_GREEDY,
+        HittingSetStrategy.QUOTA_GREEDY,
+    ],
+}
+# Rows read to estimate the incidence size of a lazy RangeSpace
+STATS_ROWS = 64
+
+
+class Plan:
+    def __init__(self, strategy, estimates: Dict, guarantee: str, stats: Dict):
+        """
+        Outcome of a strategy selection.
+
+        Parameters:
+            strategy: The chosen strategy.
+            estimates (Dict): Estimated cost of every strategy that was considered.
+            guarantee (str): The requested guarantee.
+            stats (Dict): The instance statistics the estimates are based on.
+        """
+        self.strategy = strategy
+        self.estimates = estimates
+        self.guarantee = guarantee
+        self.stats = stats
+
+    def __repr__(self):
+        estimates = ", ".join(
+            f"{s.value}: {cost:.3g}" for s, cost in sorted(self.estimates.items(), key=lambda x: x[1])
+        )
+        return f"Plan(strategy={self.strategy.value}, guarantee={self.guarantee}, estimates={{{estimates}}})"
+
+
+def _count_incidences(rangespace: List[Set[Point]]) -> int:
+    """
+    Total incidence size. A lazy RangeSpace would compute every row for the
+    exact sum, so it is estimated from STATS_ROWS evenly spaced rows instead.
+    """
+    if not isinstance(rangespace, RangeSpace) or len(rangespace) <= STATS_ROWS:
+        return sum(len(r) for r in rangespace)
+    m = len(rangespace)
+    rows = [rangespace[j * m // STATS_ROWS] for j in range(STATS_ROWS)]
+    return round(sum(len(r) for r in rows) * m / STATS_ROWS)
+
+
+def _get_stats(points: List[Point], rangespace: List[Set[Point]], vc, epsilon, success_prob, k) -> Dict:
+    n = len(points)
+    m = len(rangespace) if rangespace is not None else 0
+    incidences = _count_incidences(rangespace) if rangespace is not None else 0
+    s = min(get_epsnet_size(epsilon, vc, success_prob), n) if epsilon else n
+    return {"n": n, "m": m, "I": incidences, "s": s, "vc": vc, "epsilon": epsilon, "k": k}
+
+
+def _halving_pairs(size: int, target: int) -> int:
+    """Matched pairs used to halve a set of `size` points until at most 2 * target remain."""
+    pairs = 0
+    while size > 2 * target:
+        pairs += size // 2
+        size //= 2
+    return pairs
+
+
+def _box_dim(ranges: List[Range]) -> int:
+    """Dimension of the ranges if they are all axis-parallel boxes, else None."""
+    if not ranges:
+        return None
+    dims = set()
+    for r in ranges:
+        if isinstance(r, RectangleRange):
+            dims.add(2)
+        elif isinstance(r, HyperRectangleRange):
+            dims.add(len(r.mins))
+        else:
+            return None
+    return max(dims)
+
+
+def _epsnet_costs(stats: Dict, fair: bool) -> Dict:
+    n, I, s, k = stats["n"], stats["I"], stats["s"], stats["k"]
+    # Every matched pair evaluates all ranges twice
+    pair_cost = 2 * I
+    costs = {
+        # One weighted draw per point (cumulative weights) and s samples
+        EpsNetStrategy.SAMPLE: n + s,
+        # Heavy incidence matrix plus a handful of verified trials
+        EpsNetStrategy.LAS_VEGAS: n + I + 4 * (s + I),
+        EpsNetStrategy.DISCREPANCY: n + pair_cost * _halving_pairs(n, s),
+    }
+    p = 2 ** math.ceil(math.log2(max(s, 1)))  # partition size for c1 = 0
+    partitions = math.ceil(n / p)
+    pairs = 0
+    while partitions > 1:
+        pairs += (partitions // 2) * p  # each binary merge halves 2p points
+        partitions = math.ceil(partitions / 2)
+    costs[EpsNetStrategy.SKETCH_MERGE] = n + pair_cost * (pairs + _halving_pairs(p, s))
+    if stats.get("d") is not None:
+        # One sort per node of the d-level range tree (box ranges only)
+        costs[EpsNetStrategy.KD_TREE] = n * max(math.log2(max(n, 2)), 1) ** stats["d"]
+    if fair:
+        # Color ratios, per-color matching and augmentation scan all points per color
+        for strategy in costs:
+            costs[strategy] += n * k
+    return costs
+
+
+def _hitting_set_costs(stats: Dict, fair: bool) -> Dict:
+    n, m, I, k = stats["n"], stats["m"], stats["I"], stats["k"]
+    average = max(I / max(m, 1), 1)
+    # A point of average depth hits average/n of the ranges
+    rounds = min(m, math.ceil(n / average * math.log(max(m, 2))))
+    costs = {
+        HittingSetStrategy.GREEDY: rounds * (n + I),
+        HittingSetStrategy.PARALLEL_GREEDY: I * (1 + math.log(max(m, 2)) / math.log(1.1)),
+        # Dense LP matrix and an interior point / simplex solve
+        HittingSetStrategy.GEOMETRIC: n * m + (n + m) * math.sqrt(n * m) * math.log(max(n * m, 2)),
+    }
+    if fair:
+        costs[HittingSetStrategy.QUOTA_GREEDY] = I * math.log(max(n, 2)) + n * k
+        for strategy in (HittingSetStrategy.GREEDY, HittingSetStrategy.PARALLEL_GREEDY):
+            # Augmentation by v * ratio * W points per color
+            costs[strategy] += n * k
+    return costs
+
+
+def plan_epsnet(
+    points: List[Point],
+    rangespace: List[Set[Point]],
+    vc,
+    epsilon,
+    success_prob=0.9,
+    guarantee="probabilistic",
+    k=1,
+    fair=False,
+    ranges: List[Range] = None,
+) -> Plan:
+    """
+    Choose the cheapest eps-net strategy that provides the requested guarantee.
+
+    Parameters:
+        guarantee (str): "probabilistic" (correct with probability success_prob),
+            "verified" (output is checked or correct by construction) or
+            "deterministic" (no randomness, always an eps-net).
+        k (int): Number of colors (fair variants).
+        fair (bool): Plan for build_fair_epsnet.
+        ranges (List[Range]): The range definitions. KD_TREE is only considered
+            if they are all rectangles or hyperrectangles.
+    """
+    stats = _get_stats(points, rangespace, vc, epsilon, success_prob, k)
+    stats["d"] = _box_dim(ranges)
+    costs = _epsnet_costs(stats, fair)
+    estimates = {s: costs[s] for s in EPSNET_GUARANTEES[guarantee] if s in costs}
+    if not estimates:
+        raise ValueError(
+            f"No eps-net strategy provides the {guarantee} guarantee for these ranges "
+            "(the deterministic one needs rectangle or hyperrectangle ranges)."
+        )
+    strategy = min(estimates, key=estimates.get)
+    return Plan(strategy, estimates, guarantee, stats)
+
+
+def plan_hitting_set(
+    points: List[Point],
+    rangespace: List[Set[Point]],
+    vc=None,
+    guarantee="deterministic",
+    k=1,
+    fair=False,
+) -> Plan:
+    """
+    Choose the cheapest hitting set strategy that provides the requested guarantee.
+
+    Parameters:
+        guarantee (str): "deterministic" (always a hitting set) or
+            "probabilistic" (also allows the LP + sampling strategy).
+        vc: VC-dimension of the ranges, GEOMETRIC is only considered if given.
+        k (int): Number of colors (fair variants).
+        fair (bool): Plan for find_fair_hitting_set.
+    """
+    stats = _get_stats(points, rangespace, vc, None, None, k)
+    costs = _hitting_set_costs(stats, fair)
+    if vc is None:
+        del costs[HittingSetStrategy.GEOMETRIC]
+    estimates = {s: costs[s] for s in HITTING_SET_GUARANTEES[guarantee] if s in costs}
+    strategy = min(estimates, key=estimates.get)
+    return Plan(strategy, estimates, guarantee, stats)
+
+
+def get_builder_kwargs(builder: Callable, kwargs: Dict, candidates: List[Callable]) -> Dict:
+    """
+    Arguments for the builder chosen by a plan.
+
+    Keyword arguments the builder does not accept are dropped if another
+    candidate builder accepts them, since the caller of AUTO cannot know in
+    advance which builder will run. Names no candidate accepts raise a
+    TypeError, as a direct call would. Required arguments that only some
+    builders take get their usual defaults.
+    """
+    kwargs = dict(kwargs)
+    accepted = set()
+    for candidate in candidates:
+        accepted.update(inspect.signature(candidate).parameters)
+    unknown = [name for name in kwargs if name not in accepted]
+    if unknown:
+        raise TypeError(f"Unexpected keyword arguments: {', '.join(unknown)}")
+    parameters = inspect.signature(builder).parameters
+    if "c1" in parameters and parameters["c1"].default is inspect.Parameter.empty:
+        # Partition size constant of the sketch-and-merge builders
+        kwargs.setdefault("c1", 0)
+    if "color_ratios" in parameters and kwargs.get("color_ratios") is None:
+        points, k = kwargs["points"], kwargs["fairconfig"].k
+        counts = [0] * k
+        for p in points:
+            counts[p.color] += 1
+        kwargs["color_ratios"] = [c / len(points) for c in counts]
+    return {name: value for name, value in kwargs.items() if name in parameters}
@@ -0,0 +1,277 @@
+import math
+import struct
+import numpy as np
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+
+from core.points import Point
+from core.ranges import Range, get_range_space
+from core.fairness import FairConfig
+from algorithms.epsnet import get_epsnet_size, _random_halving
+from algorithms.fairness.fair_epsnet import _fair_havling
+
+_MAGIC = b"FNS1"
+_HEADER = struct.Struct("<4sIQI")  # magic, level, n, dim
+
+
+class EpsNetSummary:
+    def __init__(self, points: List[Point], level: int = 0, weights: List[float] = None):
+        """
+        Mergeable sketch of a shard: the surviving points after `level` halvings.
+
+        Every point stands for 2^level input points, which is its weight.
+        Summaries built with weighted=True carry the weights of the weighted
+        halvings instead (the total weight is the weight of the shard).
+
+        Parameters:
+            points (List[Point]): Sketch points.
+            level (int): Number of halvings applied so far.
+            weights (List[float]): Point weights (default: 2^level each).
+        """
+        self.points = points
+        self.level = level
+        self.weights = (
+            weights if weights is not None else [2.0**level] * len(points)
+        )
+
+    def __len__(self):
+        return len(self.points)
+
+    def to_bytes(self) -> bytes:
+        """Compact binary encoding: header, then coordinates, colors and weights."""
+        n = len(self.points)
+        dim = len(self.points[0].point) if n > 0 else 0
+        coords = np.asarray([p.point for p in self.points], dtype="<f8").reshape(n, dim)
+        colors = np.asarray([p.color for p in self.points], dtype="<i8")
+        weights = np.asarray(self.weights, dtype="<f8")
+        return (
+            _HEADER.pack(_MAGIC, self.level, n, dim)
+            + coords.tobytes()
+            + colors.tobytes()
+            + weights.tobytes()
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "EpsNetSummary":
+        magic, level, n, dim = _HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            raise ValueError("Not an eps-net summary.")
+        offset = _HEADER.size
+        coords = np.frombuffer(data, dtype="<f8", count=n * dim, offset=offset)
+        offset += 8 * n * dim
+        colors = np.frombuffer(data, dtype="<i8", count=n, offset=offset)
+        offset += 8 * n
+        weights = np.frombuffer(data, dtype="<f8", count=n, offset=offset)
+        coords = coords.reshape(n, dim)
+        points = [Point(tuple(c), int(color)) for c, color in zip(coords.tolist(), colors)]
+        return cls(points, level, weights.tolist())
+
+    def save(self, path: str):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> "EpsNetSummary":
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+def _halve(
+    summary: EpsNetSummary, ranges: List[Range], fairconfig: FairConfig = None, weighted=False
+) -> EpsNetSummary:
+    rangespace = get_range_space(summary.points, ranges)
+    weights = dict(zip(summary.points, summary.weights)) if weighted else None
+    if fairconfig is not None:
+        _, half = _fair_havling(summary.points, rangespace, fairconfig, weights)
+    else:
+        _, half = _random_halving(summary.points, rangespace, weights=weights)
+    if weighted:
+        return EpsNetSummary(half, summary.level + 1, [weights[p] for p in half])
+    return EpsNetSummary(half, summary.level + 1)
+
+
+def build_summary(
+    points: List[Point], ranges: List[Range], size: int, fairconfig: FairConfig = None, weighted=False
+) -> EpsNetSummary:
+    """
+    Sketch of one shard: halve it until at most `size` points remain.
+
+    If weighted is set, the halvings are weighted and start from Point.weight.
+    """
+    weights = [p.weight for p in points] if weighted else None
+    summary = EpsNetSummary(list(points), weights=weights)
+    while len(summary) > size:
+        summary = _halve(summary, ranges, fairconfig, weighted)
+    return summary
+
+
+def merge(
+    a: EpsNetSummary,
+    b: EpsNetSummary,
+    ranges: List[Range],
+    fairconfig: FairConfig = None,
+    weighted=False,
+) -> EpsNetSummary:
+    """
+    Merge two summaries: the merge+halving step of _sketch_merge.
+
+    The lower-level summary is halved first until both have the same level,
+    so every point of the result has the same weight. Weighted summaries
+    are merged directly, whatever their sizes and levels.
+    """
+    if weighted:
+        merged = EpsNetSummary(a.points + b.points, max(a.level, b.level), a.weights + b.weights)
+        return _halve(merged, ranges, fairconfig, weighted)
+    while a.level < b.level:
+        a = _halve(a, ranges, fairconfig)
+    while b.level < a.level:
+        b = _halve(b, ranges, fairconfig)
+    merged = EpsNetSummary(a.points + b.points, a.level)
+    return _halve(merged, ranges, fairconfig)
+
+
+def merge_many(
+    summaries: List[EpsNetSummary],
+    ranges: List[Range],
+    fairconfig: FairConfig = None,
+    weighted=False,
+) -> EpsNetSummary:
+    """
+    Merge a group of summaries at once (the k-way step of _sketch_merge).
+
+    Unweighted summaries are first brought to the same level, as in merge.
+    The union is then halved until it is no larger than the largest input,
+    so k summaries of the same size shrink by about k with one copy of the
+    points. A single summary is returned as is.
+    """
+    if len(summaries) == 1:
+        return summaries[0]
+    summaries = list(summaries)
+    if not weighted:
+        level = max(s.level for s in summaries)
+        for j, summary in enumerate(summaries):
+            while summary.level < level:
+                summary = _halve(summary, ranges, fairconfig)
+            summaries[j] = summary
+    target = max(len(s) for s in summaries)
+    merged = EpsNetSummary(
+        [p for s in summaries for p in s.points],
+        max(s.level for s in summaries),
+        [w for s in summaries for w in s.weights],
+    )
+    while len(merged) > target and len(merged) > 1:
+        merged = _halve(merged, ranges, fairconfig, weighted)
+    return merged
+
+
+def reduce_summaries(
+    summaries: List[EpsNetSummary],
+    ranges: List[Range],
+    vc,
+    epsilon,
+    c2=1,
+    fairconfig: FairConfig = None,
+    weighted=False,
+    fan_in=2,
+) -> List[Point]:
+    """
+    Merge shard summaries pairwise (fan_in at a time, see merge_many) and
+    halve the root down to the eps-net size.
+    """
+    return reduce_summaries_to_root(
+        summaries, ranges, vc, epsilon, c2, fairconfig, weighted, fan_in
+    ).points
+
+
+def reduce_summaries_to_root(
+    summaries: List[EpsNetSummary],
+    ranges: List[Range],
+    vc,
+    epsilon,
+    c2=1,
+    fairconfig: FairConfig = None,
+    weighted=False,
+    fan_in=2,
+) -> EpsNetSummary:
+    """
+    Same as reduce_summaries, but returns the root summary with its weights,
+    e.g. as input for build_epsnet_sample(points=root.points, weights=root.weights).
+    """
+    if fan_in < 2:
+        raise ValueError("fan_in must be at least 2.")
+    if weighted:
+        n = sum(sum(s.weights) for s in summaries)
+    else:
+        n = sum(len(s) * 2**s.level for s in summaries)
+    m = get_epsnet_size(epsilon, vc, 0.9, c2)  # size of final epsnet
+    m = min(m, n)
+    print(f"[reduce_summaries] epsnet size m: {int(m)}, summaries: {len(summaries)}")
+    summaries = list(summaries)
+    while len(summaries) > 1:
+        if fan_in == 2:
+            merged = [
+                merge(summaries[i], summaries[i + 1], ranges, fairconfig, weighted)
+                for i in range(0, len(summaries) - 1, 2)
+            ]
+            if len(summaries) % 2 == 1:
+                merged.append(summaries[-1])
+        else:
+            merged = [
+                merge_many(summaries[i : i + fan_in], ranges, fairconfig, weighted)
+                for i in range(0, len(summaries), fan_in)
+            ]
+        summaries = merged
+    root = summaries[0]
+    while len(root) > 2 * m:
+        root = _halve(root, ranges, fairconfig, weighted)
+    return root
+
+
+def _build_summary_bytes(args) -> bytes:
+    points, ranges, size, fairconfig, weighted = args
+    return build_summary(points, ranges, size, fairconfig, weighted).to_bytes()
+
+
+def build_epsnet_sharded(
+    shards: List[List[Point]],
+    ranges: List[Range],
+    vc,
+    epsilon,
+    c1=0,
+    c2=1,
+    fairconfig: FairConfig = None,
+    workers: int = None,
+    weighted=False,
+    fan_in=2,
+) -> List[Point]:
+    """
+    Sketch-and-merge eps-net over independently built shard summaries.
+
+    Every shard is reduced to a partition-sized summary (in a process pool if
+    workers is given), and the summaries are combined with reduce_summaries.
+    The returned points are decoded copies of the input points.
+
+    Parameters:
+        shards (List[List[Point]]): The point set, split into shards.
+        ranges (List[Range]): The ranges.
+        c1 (float): Constant for partition size (as in build_epsnet_sketch_merge).
+        fairconfig (FairConfig): If given, the fair halving is used.
+        workers (int): Number of processes (default: in-process).
+        weighted (bool): Weighted halvings, starting from Point.weight.
+        fan_in (int): Number of summaries merged at a time.
+    """
+    n = sum(len(shard) for shard in shards)
+    m = min(get_epsnet_size(epsilon, vc, 0.9, c2), n)
+    p = m * 2**c1  # size of each partition
+    p = 2 ** math.ceil(math.log2(p))  # round to nearest power of 2
+    print(f"[build_epsnet_sharded] partition size p: {p}, shards: {len(shards)}")
+
+    tasks = [(shard, ranges, p, fairconfig, weighted) for shard in shards]
+    if workers is not None and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            encoded = list(pool.map(_build_summary_bytes, tasks))
+    else:
+        encoded = [_build_summary_bytes(task) for task in tasks]
+    summaries = [EpsNetSummary.from_bytes(data) for data in encoded]
+    return reduce_summaries(summaries, ranges, vc, epsilon, c2, fairconfig, weighted, fan_in)
@@ -0,0 +1,58 @@
+import time
+
+from typing import Iterable
+
+
+class Budget:
+    def __init__(self, seconds: float = None, work: int = None):
+        """
+        Time and/or work budget for the anytime mode of the builders.
+
+        Work units are set by each algorithm: one matched pair for the
+        discrepancy halvings, one selected point for the greedy hitting set.
+
+        Parameters:
+            seconds (float): Wall-clock limit, measured from construction.
+            work (int): Maximum number of work units.
+        """
+        self.seconds = seconds
+        self.work = work
+        self.spent = 0
+        self.deadline = time.monotonic() + seconds if seconds is not None else None
+
+    def spend(self, units: int = 1):
+        self.spent += units
+
+    def remaining_seconds(self) -> float:
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def exhausted(self) -> bool:
+        if self.work is not None and self.spent >= self.work:
+            return True
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+
+class BudgetExhausted(Exception):
+    """Raised by a stage that cannot return a partial result when the budget runs out."""
+
+
+class AnytimeResult(list):
+    def __init__(self, items: Iterable, complete: bool, epsilon: float = None, uncovered: int = None):
+        """
+        Result of a builder that ran with a budget.
+
+        It is the list of selected points, so it can be used wherever the
+        plain result is expected.
+
+        Parameters:
+            items (Iterable): The selected points.
+            complete (bool): False if the budget ran out before the algorithm finished.
+            epsilon (float): Achieved epsilon of an eps-net.
+            uncovered (int): Number of ranges the hitting set does not hit.
+        """
+        super().__init__(items)
+        self.complete = complete
+        self.epsilon = epsilon
+        self.uncovered = uncovered
@@ -0,0 +1,138 @@
+import os
+import random
+import time
+import hashlib
+import numpy as np
+
+from typing import Dict, List, Set
+
+from core.points import Point
+
+
+def input_fingerprint(points: List[Point], rangespace: List[Set[Point]], **params) -> str:
+    """
+    Hash of the inputs of a checkpointed run: the point coordinates, the
+    range-space shape (number of ranges and incidences) and the given
+    parameters (e.g. strategy, epsilon, c1).
+    """
+    h = hashlib.sha256()
+    h.update(np.asarray([p.point for p in points], dtype=float).tobytes())
+    h.update(repr((len(rangespace), sum(len(r) for r in rangespace))).encode())
+    h.update(repr(sorted(params.items())).encode())
+    return h.hexdigest()
+
+
+class Checkpoint:
+    def __init__(self, path: str, every: int = 1, seconds: float = None):
+        """
+        On-disk checkpoint of a halving run (compressed .npz).
+
+        A checkpoint holds the point groups of the run as index arrays into
+        the input points, the state of the `random` module, and the position
+        of the run (stage, level, step). Resuming from it with the same
+        input points gives exactly the same result as the uninterrupted run.
+
+        The builders remove the file when they finish (clear), and load
+        ignores a file written for other inputs (see input_fingerprint), so
+        such a run starts fresh and overwrites it.
+
+        Parameters:
+            path (str): Checkpoint file.
+            every (int): Save every `every` steps (merges or halvings).
+            seconds (float): If given, save when this much time passed since
+                the last save instead.
+        """
+        self.path = path
+        self.every = every
+        self.seconds = seconds
+        self.fingerprint = ""
+        self._steps = 0
+        self._last_save = time.monotonic()
+
+    def due(self) -> bool:
+        """Count a step and tell whether it should be saved."""
+        self._steps += 1
+        if self.seconds is not None:
+            return time.monotonic() - self._last_save >= self.seconds
+        return self._steps % self.every == 0
+
+    def save(self, n: int, stage: str, level: int, step: int, groups: List[List[int]]):
+        """
+        Parameters:
+            n (int): Number of input points (checked on load).
+            stage (str): Name of the loop that is checkpointed.
+            level (int): Loop level (number of nodes for merges, halvings done otherwise).
+            step (int): Next step within the level.
+            groups (List[List[int]]): Point groups as indices into the input points.
+
+        The fingerprint passed to the last load is stored with the groups.
+        """
+        version, state, gauss = random.getstate()
+        sizes = np.asarray([len(g) for g in groups], dtype=np.int64)
+        indices = np.fromiter(
+            (i for g in groups for i in g), dtype=np.int64, count=int(sizes.sum())
+        )
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            np.savez_compressed(
+                f,
+                n=n,
+                fingerprint=self.fingerprint,
+                stage=stage,
+                level=level,
+                step=step,
+                indices=indices,
+                offsets=np.concatenate(([0], np.cumsum(sizes))),
+                rng_version=version,
+                rng_state=np.asarray(state, dtype=np.uint32),
+                rng_gauss=np.nan if gauss is None else gauss,
+            )
+        os.replace(tmp, self.path)  # never leave a half-written checkpoint
+        self._last_save = time.monotonic()
+        print(f"[Checkpoint] saved {stage} level: {level}, step: {step}")
+
+    def load(self, n: int, fingerprint: str = "") -> Dict:
+        """
+        Read the checkpoint and restore the random state.
+
+        Parameters:
+            n (int): Number of input points.
+            fingerprint (str): input_fingerprint of the run, saved with every
+                checkpoint and compared on load.
+
+        Returns None if there is no checkpoint file, or if it was written for
+        other points or parameters (the run starts fresh).
+        """
+        self.fingerprint = fingerprint
+        if not os.path.exists(self.path):
+            return None
+        with np.load(self.path) as data:
+            if (
+                int(data["n"]) != n
+                or "fingerprint" not in data
+                or str(data["fingerprint"]) != fingerprint
+            ):
+                print("[Checkpoint] written for other inputs or parameters, starting fresh")
+                return None
+            indices, offsets = data["indices"], data["offsets"]
+            groups = [indices[offsets[j] : offsets[j + 1]] for j in range(len(offsets) - 1)]
+            gauss = float(data["rng_gauss"])
+            random.setstate(
+                (
+                    int(data["rng_version"]),
+                    tuple(int(x) for x in data["rng_state"]),
+                    None if np.isnan(gauss) else gauss,
+                )
+            )
+            state = {
+                "stage": str(data["stage"]),
+                "level": int(data["level"]),
+                "step": int(data["step"]),
+                "groups": groups,
+            }
+        print(f"[Checkpoint] resuming {state['stage']} level: {state['level']}, step: {state['step']}")
+        return state
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
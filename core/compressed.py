@@ -0,0 +1,323 @@
+"""
+Compressed range-space storage in the style of roaring bitmaps.
+
+A row (the point indices of one range) is split into chunks of 2^16
+indices. Every chunk is stored in the smallest of three containers:
+    array:  sorted uint16 offsets (2 bytes per member)
+    bitmap: 2^16 bits (8 KiB, for dense chunks)
+    run:    (start, end) uint16 pairs (4 bytes per run of consecutive members)
+Small ranges stay as short arrays and ranges covering most points become
+bitmaps or a few runs.
+"""
+
+import struct
+import numpy as np
+
+from collections.abc import Sequence
+from typing import Dict, Iterator, List, Set
+
+from core.points import Point
+
+CHUNK_BITS = 16
+CHUNK_SIZE = 1 << CHUNK_BITS
+BITMAP_WORDS = CHUNK_SIZE // 64
+BITMAP_BYTES = CHUNK_SIZE // 8
+
+_MAGIC = b"FRS1"
+_HEADER = struct.Struct("<4sQQ")  # magic, n, m
+_ROW = struct.Struct("<I")  # number of containers
+_CONTAINER = struct.Struct("<IBII")  # key, kind, cardinality, payload bytes
+
+
+def _popcount(words: np.ndarray) -> int:
+    return int(np.unpackbits(words.view(np.uint8)).sum())
+
+
+class ArrayContainer:
+    kind = 0
+
+    def __init__(self, values: np.ndarray):
+        self.values = values  # sorted uint16
+        self.cardinality = len(values)
+
+    @property
+    def nbytes(self) -> int:
+        return self.values.nbytes
+
+    def contains(self, low: int) -> bool:
+        i = np.searchsorted(self.values, low)
+        return i < self.cardinality and self.values[i] == low
+
+    def to_array(self) -> np.ndarray:
+        return self.values
+
+    def to_bitmap(self) -> np.ndarray:
+        bits = np.zeros(CHUNK_SIZE, dtype=bool)
+        bits[self.values] = True
+        return np.packbits(bits, bitorder="little").view(np.uint64)
+
+    def payload(self) -> bytes:
+        return self.values.astype("<u2").tobytes()
+
+    @classmethod
+    def from_payload(cls, data: bytes, cardinality: int) -> "ArrayContainer":
+        return cls(np.frombuffer(data, dtype="<u2").astype(np.uint16))
+
+
+class BitmapContainer:
+    kind = 1
+
+    def __init__(self, words: np.ndarray, cardinality: int = None):
+        self.words = words  # BITMAP_WORDS uint64
+        self.cardinality = cardinality if cardinality is not None else _popcount(words)
+
+    @property
+    def nbytes(self) -> int:
+        return self.words.nbytes
+
+    def contains(self, low: int) -> bool:
+        return bool((int(self.words[low >> 6]) >> (low & 63)) & 1)
+
+    def to_array(self) -> np.ndarray:
+        bits = np.unpackbits(self.words.view(np.uint8), bitorder="little")
+        return np.flatnonzero(bits).astype(np.uint16)
+
+    def to_bitmap(self) -> np.ndarray:
+        return self.words
+
+    def payload(self) -> bytes:
+        return self.words.astype("<u8").tobytes()
+
+    @classmethod
+    def from_payload(cls, data: bytes, cardinality: int) -> "BitmapContainer":
+        return cls(np.frombuffer(data, dtype="<u8").astype(np.uint64), cardinality)
+
+
+class RunContainer:
+    kind = 2
+
+    def __init__(self, starts: np.ndarray, ends: np.ndarray):
+        self.starts = starts  # uint16, inclusive run bounds
+        self.ends = ends
+        self.cardinality = int((ends.astype(np.int64) - starts + 1).sum())
+
+    @property
+    def nbytes(self) -> int:
+        return self.starts.nbytes + self.ends.nbytes
+
+    def contains(self, low: int) -> bool:
+        i = np.searchsorted(self.starts, low, side="right") - 1
+        return i >= 0 and low <= self.ends[i]
+
+    def to_array(self) -> np.ndarray:
+        if not len(self.starts):
+            return np.empty(0, dtype=np.uint16)
+        return np.concatenate(
+            [np.arange(int(s), int(e) + 1) for s, e in zip(self.starts, self.ends)]
+        ).astype(np.uint16)
+
+    def to_bitmap(self) -> np.ndarray:
+        return ArrayContainer(self.to_array()).to_bitmap()
+
+    def payload(self) -> bytes:
+        return np.stack([self.starts, self.ends]).astype("<u2").tobytes()
+
+    @classmethod
+    def from_payload(cls, data: bytes, cardinality: int) -> "RunContainer":
+        bounds = np.frombuffer(data, dtype="<u2").astype(np.uint16).reshape(2, -1)
+        return cls(bounds[0], bounds[1])
+
+
+_KINDS = {c.kind: c for c in (ArrayContainer, BitmapContainer, RunContainer)}
+
+
+def _make_container(lows: np.ndarray):
+    """Smallest container for the sorted, distinct offsets of one chunk."""
+    breaks = np.flatnonzero(np.diff(lows.astype(np.int32)) != 1)
+    runs = len(breaks) + 1
+    sizes = {"array": 2 * len(lows), "bitmap": BITMAP_BYTES, "run": 4 * runs}
+    best = min(sizes, key=sizes.get)
+    if best == "array":
+        return ArrayContainer(lows.astype(np.uint16))
+    elif best == "run":
+        starts = np.concatenate(([lows[0]], lows[breaks + 1])).astype(np.uint16)
+        ends = np.concatenate((lows[breaks], [lows[-1]])).astype(np.uint16)
+        return RunContainer(starts, ends)
+    return BitmapContainer(ArrayContainer(lows).to_bitmap(), len(lows))
+
+
+def _intersection_count(a, b) -> int:
+    if isinstance(a, BitmapContainer) or isinstance(b, BitmapContainer):
+        if isinstance(a, ArrayContainer):
+            a, b = b, a
+        if isinstance(b, ArrayContainer):
+            # Test the few array members against the bitmap
+            lows = b.values.astype(np.int64)
+            words = a.to_bitmap()[lows >> 6]
+            return int(((words >> (lows & 63).astype(np.uint64)) & np.uint64(1)).sum())
+        return _popcount(a.to_bitmap() & b.to_bitmap())
+    return len(np.intersect1d(a.to_array(), b.to_array(), assume_unique=True))
+
+
+class CompressedRow:
+    def __init__(self, keys: List[int], containers: List):
+        """One range as chunk keys (index >> 16) and their containers."""
+        self.keys = keys
+        self.containers = containers
+        self._by_key = dict(zip(keys, containers))
+        self.cardinality = sum(c.cardinality for c in containers)
+
+    @classmethod
+    def from_indices(cls, indices) -> "CompressedRow":
+        indices = np.unique(np.asarray(indices, dtype=np.int64))
+        high = indices >> CHUNK_BITS
+        keys, starts = np.unique(high, return_index=True)
+        bounds = list(starts) + [len(indices)]
+        containers = [
+            _make_container((indices[bounds[j] : bounds[j + 1]] & (CHUNK_SIZE - 1)).astype(np.uint16))
+            for j in range(len(keys))
+        ]
+        return cls([int(k) for k in keys], containers)
+
+    def __len__(self):
+        return self.cardinality
+
+    def __contains__(self, index: int) -> bool:
+        container = self._by_key.get(index >> CHUNK_BITS)
+        return container is not None and container.contains(index & (CHUNK_SIZE - 1))
+
+    def to_array(self) -> np.ndarray:
+        if not self.keys:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate(
+            [(k << CHUNK_BITS) + c.to_array().astype(np.int64) for k, c in zip(self.keys, self.containers)]
+        )
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.to_array().tolist())
+
+    def intersection_count(self, other: "CompressedRow") -> int:
+        return sum(
+            _intersection_count(c, other._by_key[k])
+            for k, c in zip(self.keys, self.containers)
+            if k in other._by_key
+        )
+
+    def intersects(self, other: "CompressedRow") -> bool:
+        return any(
+            _intersection_count(c, other._by_key[k]) > 0
+            for k, c in zip(self.keys, self.containers)
+            if k in other._by_key
+        )
+
+    @property
+    def nbytes(self) -> int:
+        return sum(c.nbytes for c in self.containers)
+
+
+class CompressedRange:
+    def __init__(self, row: CompressedRow, points: List[Point], position: Dict[Point, int]):
+        """Read-only set-like view of a compressed row in terms of the points."""
+        self.row = row
+        self.points = points
+        self.position = position
+
+    def __len__(self):
+        return len(self.row)
+
+    def __contains__(self, point: Point) -> bool:
+        i = self.position.get(point)
+        return i is not None and i in self.row
+
+    def __iter__(self) -> Iterator[Point]:
+        points = self.points
+        return (points[i] for i in self.row)
+
+    def isdisjoint(self, other) -> bool:
+        if isinstance(other, CompressedRange):
+            return not self.row.intersects(other.row)
+        return not any(p in self for p in other)
+
+    def __eq__(self, other):
+        if isinstance(other, CompressedRange):
+            return np.array_equal(self.row.to_array(), other.row.to_array())
+        return set(self) == other
+
+    def __hash__(self):
+        return hash(tuple(self.row.to_array().tolist()))
+
+
+class CompressedRangeSpace(Sequence):
+    def __init__(self, points: List[Point], rows: List[CompressedRow]):
+        """
+        Range space over points with compressed rows. Rows are exposed as
+        CompressedRange views, so it can be passed wherever a
+        List[Set[Point]] is expected (verifiers, greedy hitting set, halvings).
+        """
+        self.points = points
+        self.rows = rows
+        self.position = {p: i for i, p in enumerate(points)}
+
+    @classmethod
+    def from_rangespace(cls, points: List[Point], rangespace: List[Set[Point]]) -> "CompressedRangeSpace":
+        position = {p: i for i, p in enumerate(points)}
+        rows = [CompressedRow.from_indices([position[p] for p in r if p in position]) for r in rangespace]
+        return cls(points, rows)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, j):
+        if isinstance(j, slice):
+            return [self[i] for i in range(*j.indices(len(self)))]
+        return CompressedRange(self.rows[j], self.points, self.position)
+
+    def copy(self) -> List[CompressedRange]:
+        return list(self)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the containers."""
+        return sum(row.nbytes for row in self.rows)
+
+    def to_bytes(self) -> bytes:
+        """Binary encoding of the rows (the points are not included)."""
+        parts = [_HEADER.pack(_MAGIC, len(self.points), len(self.rows))]
+        for row in self.rows:
+            parts.append(_ROW.pack(len(row.containers)))
+            for key, c in zip(row.keys, row.containers):
+                payload = c.payload()
+                parts.append(_CONTAINER.pack(key, c.kind, c.cardinality, len(payload)))
+                parts.append(payload)
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, points: List[Point]) -> "CompressedRangeSpace":
+        magic, n, m = _HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            raise ValueError("Not a compressed range space.")
+        if n != len(points):
+            raise ValueError("Range space was written for a different point set.")
+        offset = _HEADER.size
+        rows = []
+        for _ in range(m):
+            (count,) = _ROW.unpack_from(data, offset)
+            offset += _ROW.size
+            keys, containers = [], []
+            for _ in range(count):
+                key, kind, cardinality, size = _CONTAINER.unpack_from(data, offset)
+                offset += _CONTAINER.size
+                keys.append(key)
+                containers.append(_KINDS[kind].from_payload(data[offset : offset + size], cardinality))
+                offset += size
+            rows.append(CompressedRow(keys, containers))
+        return cls(points, rows)
+
+    def save(self, path: str):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str, points: List[Point]) -> "CompressedRangeSpace":
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read(), points)
@@ -0,0 +1,116 @@
+import numpy as np
+
+from typing import List
+from core.points import Point
+from core.ranges import Range, RectangleRange, HyperRectangleRange
+
+
+class RangeCountingIndex:
+    def __init__(self, points: List[Point], leaf_size: int = 32):
+        """
+        Counts |r ∩ P| for axis-aligned boxes without materializing r ∩ P.
+
+        A layered range tree: one balanced tree per axis, where every node
+        keeps an associated tree over the remaining axes and the last axis is
+        a sorted array. Space is O(n log^{d-1} n) and a box query takes
+        O(log^d n) time.
+
+        Parameters:
+            points (List[Point]): The point set P.
+            leaf_size (int): Nodes with at most this many points are counted by brute force.
+        """
+        self.points = points
+        self.n = len(points)
+        self.coords = np.asarray([p.point for p in points], dtype=float)
+        self.dim = self.coords.shape[1] if self.n > 0 else 0
+        self.leaf_size = leaf_size
+        self._root = (
+            _RangeTree(self.coords, np.arange(self.n), 0, leaf_size)
+            if self.n > 0
+            else None
+        )
+
+    def count_box(self, mins: List[float], maxs: List[float]) -> int:
+        """Number of points p with mins <= p <= maxs (closed box)."""
+        if self._root is None:
+            return 0
+        mins = np.asarray(mins, dtype=float)
+        maxs = np.asarray(maxs, dtype=float)
+        if np.any(mins > maxs):
+            return 0
+        return self._root.count(mins, maxs)
+
+    def count(self, r: Range) -> int:
+        """
+        Number of points of P inside the range r.
+
+        Rectangles and hyperrectangles are answered by the tree; any other
+        range falls back to a linear scan over P.
+        """
+        if isinstance(r, RectangleRange):
+            return self.count_box((r.xmin, r.ymin), (r.xmax, r.ymax))
+        elif isinstance(r, HyperRectangleRange):
+            return self.count_box(r.mins, r.maxs)
+        else:
+            return sum(1 for p in self.points if r.contains(p))
+
+    def count_many(self, ranges: List[Range]) -> List[int]:
+        """Batch counting."""
+        return [self.count(r) for r in ranges]
+
+
+class _RangeTree:
+    def __init__(self, coords: np.ndarray, idx: np.ndarray, axis: int, leaf_size: int):
+        self.axis = axis
+        self.last = axis == coords.shape[1] - 1
+        order = idx[np.argsort(coords[idx, axis], kind="stable")]
+        self.keys = coords[order, axis]
+        if self.last:
+            return
+        # Balanced binary tree over positions of the sorted order. Each node
+        # stores its span [lo, hi) and either an associated tree over the
+        # next axis or, for small spans, the raw coordinates.
+        self.coords = coords
+        self.order = order
+        self.leaf_size = leaf_size
+        self._nodes = {}
+        self._build(0, len(order))
+
+    def _build(self, lo: int, hi: int):
+        if hi - lo <= self.leaf_size:
+            self._nodes[(lo, hi)] = self.coords[self.order[lo:hi]]
+            return
+        self._nodes[(lo, hi)] = _RangeTree(
+            self.coords, self.order[lo:hi], self.axis + 1, self.leaf_size
+        )
+        mid = (lo + hi) // 2
+        self._build(lo, mid)
+        self._build(mid, hi)
+
+    def count(self, mins: np.ndarray, maxs: np.ndarray) -> int:
+        a = int(np.searchsorted(self.keys, mins[self.axis], side="left"))
+        b = int(np.searchsorted(self.keys, maxs[self.axis], side="right"))
+        if a >= b:
+            return 0
+        if self.last:
+            return b - a
+        return self._count(0, len(self.keys), a, b, mins, maxs)
+
+    def _count(self, lo, hi, a, b, mins, maxs) -> int:
+        if b <= lo or hi <= a:
+            return 0
+        node = self._nodes[(lo, hi)]
+        if isinstance(node, np.ndarray):
+            # Leaf: brute force over the positions that fall in [a, b)
+            sub = node[max(a, lo) - lo : min(b, hi) - lo, self.axis + 1 :]
+            inside = np.all(
+                (sub >= mins[self.axis + 1 :]) & (sub <= maxs[self.axis + 1 :]), axis=1
+            )
+            return int(np.count_nonzero(inside))
+        if a <= lo and hi <= b:
+            # Canonical node: the whole span lies inside the axis interval
+            return node.count(mins, maxs)
+        mid = (lo + hi) // 2
+        return self._count(lo, mid, a, b, mins, maxs) + self._count(
+            mid, hi, a, b, mins, maxs
+        )
@@ -0,0 +1,50 @@
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from typing import List, Set
+from core.points import Point
+from core.profiling import phase
+
+
+@phase("incidence_matrix")
+def incidence_matrix(points: List[Point], rangespace: List[Set[Point]]) -> csr_matrix:
+    """
+    Sparse 0/1 matrix A with A[j, i] = 1 iff points[i] is in rangespace[j].
+
+    Members of a range that are not in points are ignored.
+
+    Parameters:
+        points (List[Point]): The points (columns).
+        rangespace (List[Set[Point]]): The ranges (rows).
+
+    Returns:
+        csr_matrix: The m x n incidence matrix.
+    """
+    position = {p: i for i, p in enumerate(points)}
+    indptr = [0]
+    indices = []
+    for r in rangespace:
+        row = [position[p] for p in r if p in position]
+        row.sort()
+        indices.extend(row)
+        indptr.append(len(indices))
+    data = np.ones(len(indices), dtype=np.int8)
+    return csr_matrix(
+        (data, np.asarray(indices, dtype=np.int64), np.asarray(indptr, dtype=np.int64)),
+        shape=(len(rangespace), len(points)),
+    )
+
+
+def heavy_incidence_matrix(
+    points: List[Point], rangespace: List[Set[Point]], epsilon: float
+) -> csr_matrix:
+    """Incidence matrix restricted to the heavy ranges (|r| >= epsilon * |P|)."""
+    heavy = [r for r in rangespace if len(r) >= epsilon * len(points)]
+    return incidence_matrix(points, heavy)
+
+
+def hits_all_rows(A: csr_matrix, indices) -> bool:
+    """True if every row of A has a non-zero in one of the given columns."""
+    selected = np.zeros(A.shape[1], dtype=np.int64)
+    selected[np.asarray(indices, dtype=np.int64)] = 1
+    return bool(np.all(A @ selected > 0))
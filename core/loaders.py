@@ -0,0 +1,193 @@
+"""
+Bulk loaders for points and ranges.
+
+Files are read straight into numpy arrays (memory mapped for .npy, chunked
+for CSV and Parquet); Point and Range objects are only created on demand.
+
+Range files hold one range per row:
+    rectangle / hyperrectangle: mins (d columns), then maxs (d columns)
+    ball: center (d columns), then radius
+    halfspace: normal (d columns), then offset (dot(normal, x) <= offset)
+"""
+
+import os
+import numpy as np
+import pandas as pd
+
+from typing import List, Sequence, Set, Union
+
+from core.points import Point
+from core.ranges import Range, RangeSpace, RectangleRange, HyperRectangleRange, BallRange, HalfspaceRange
+
+RANGE_KINDS = ("rectangle", "hyperrectangle", "ball", "halfspace")
+
+
+class PointArray:
+    def __init__(self, coords: np.ndarray, colors: np.ndarray = None, weights: np.ndarray = None):
+        """
+        Array-backed point set.
+
+        Parameters:
+            coords (np.ndarray): (n, d) coordinates (may be a memory map).
+            colors (np.ndarray): n integer colors (default: all 0).
+            weights (np.ndarray): n point weights (default: all 1).
+        """
+        self.coords = coords
+        self.colors = colors if colors is not None else np.zeros(len(coords), dtype=np.int64)
+        self.weights = weights
+        self._points = None
+
+    def __len__(self):
+        return len(self.coords)
+
+    @property
+    def dim(self) -> int:
+        return self.coords.shape[1]
+
+    def to_points(self) -> List[Point]:
+        """Point objects for the algorithms (built once, index i is row i)."""
+        if self._points is None:
+            weights = self.weights if self.weights is not None else np.ones(len(self))
+            self._points = [
+                Point(tuple(c), int(color), float(w))
+                for c, color, w in zip(self.coords.tolist(), self.colors.tolist(), weights.tolist())
+            ]
+        return self._points
+
+    def get_range_space(
+        self, ranges: Sequence[Range], lazy: bool = False, max_cached: int = 4096
+    ) -> Union[List[Set[Point]], RangeSpace]:
+        """
+        Same as core.ranges.get_range_space, with one vectorized test per range.
+
+        If lazy is set, a RangeSpace over the array coordinates is returned
+        and rows are only computed when an algorithm reads them.
+        """
+        points = self.to_points()
+        coords = np.asarray(self.coords, dtype=float)
+        if lazy:
+            return RangeSpace(points, ranges, max_cached, coords=coords)
+        return [{points[i] for i in np.flatnonzero(r.contains_array(coords))} for r in ranges]
+
+
+class RangeArray:
+    def __init__(self, kind: str, params: np.ndarray):
+        """
+        Array-backed ranges of one kind (see the module docstring for the layout).
+
+        Parameters:
+            kind (str): One of RANGE_KINDS.
+            params (np.ndarray): (m, k) range parameters.
+        """
+        if kind not in RANGE_KINDS:
+            raise ValueError(f"Unknown range kind: {kind}")
+        self.kind = kind
+        self.params = params
+
+    def __len__(self):
+        return len(self.params)
+
+    @property
+    def dim(self) -> int:
+        k = self.params.shape[1]
+        return k // 2 if self.kind in ("rectangle", "hyperrectangle") else k - 1
+
+    def to_ranges(self) -> List[Range]:
+        d = self.dim
+        params = np.asarray(self.params, dtype=float).tolist()
+        if self.kind == "rectangle":
+            return [RectangleRange(r[0], r[2], r[1], r[3]) for r in params]
+        elif self.kind == "hyperrectangle":
+            return [HyperRectangleRange(r[:d], r[d:]) for r in params]
+        elif self.kind == "ball":
+            return [BallRange(Point(tuple(r[:d]), None), r[d]) for r in params]
+        else:
+            return [HalfspaceRange(r[:d], r[d]) for r in params]
+
+
+def _read_npy(path: str, mmap: bool = True) -> np.ndarray:
+    return np.load(path, mmap_mode="r" if mmap else None)
+
+
+def _read_csv(path: str, columns: List[str] = None, chunksize: int = 1_000_000) -> np.ndarray:
+    chunks = [
+        (chunk[columns] if columns is not None else chunk).to_numpy()
+        for chunk in pd.read_csv(path, usecols=columns, chunksize=chunksize)
+    ]
+    return np.concatenate(chunks) if chunks else np.empty((0, len(columns or [])))
+
+
+def _read_parquet(path: str, columns: List[str] = None) -> np.ndarray:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Reading Parquet files requires pyarrow (pip install pyarrow).")
+    parquet = pq.ParquetFile(path)
+    chunks = [
+        np.column_stack([batch.column(j).to_numpy() for j in range(batch.num_columns)])
+        for batch in parquet.iter_batches(columns=columns)
+    ]
+    return np.concatenate(chunks) if chunks else np.empty((0, len(columns or [])))
+
+
+def read_table(path: str, columns: List[str] = None, chunksize: int = 1_000_000, mmap: bool = True) -> np.ndarray:
+    """
+    Read a numeric table from .npy, .csv or .parquet into an array.
+
+    Parameters:
+        path (str): The file.
+        columns (List[str]): Columns to read, in this order (CSV / Parquet only).
+        chunksize (int): Rows per CSV chunk.
+        mmap (bool): Memory map .npy files.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".npy":
+        return _read_npy(path, mmap)
+    elif extension == ".csv":
+        return _read_csv(path, columns, chunksize)
+    elif extension in (".parquet", ".pq"):
+        return _read_parquet(path, columns)
+    else:
+        raise ValueError(f"Unsupported file type: {extension}")
+
+
+def load_points(
+    path: str,
+    coord_columns: List[str] = None,
+    color_column: str = None,
+    weight_column: str = None,
+    colors_path: str = None,
+    weights_path: str = None,
+    chunksize: int = 1_000_000,
+    mmap: bool = True,
+) -> PointArray:
+    """
+    Load points from .npy, .csv or .parquet.
+
+    For .npy the file is the (n, d) coordinate array; colors and weights come
+    from separate .npy files. For CSV / Parquet they are columns of the same
+    table; without coord_columns every column is a coordinate.
+    """
+    if os.path.splitext(path)[1].lower() == ".npy":
+        coords = _read_npy(path, mmap)
+        colors = np.asarray(_read_npy(colors_path, mmap), dtype=np.int64) if colors_path else None
+        weights = _read_npy(weights_path, mmap) if weights_path else None
+        return PointArray(coords, colors, weights)
+
+    extras = [c for c in (color_column, weight_column) if c is not None]
+    if coord_columns is None:
+        if extras:
+            raise ValueError("coord_columns is required with a color or weight column.")
+        return PointArray(read_table(path, None, chunksize, mmap).astype(float))
+    table = read_table(path, list(coord_columns) + extras, chunksize, mmap)
+    d = len(coord_columns)
+    colors = table[:, d].astype(np.int64) if color_column is not None else None
+    weights = table[:, -1].astype(float) if weight_column is not None else None
+    return PointArray(table[:, :d].astype(float), colors, weights)
+
+
+def load_ranges(
+    path: str, kind: str, columns: List[str] = None, chunksize: int = 1_000_000, mmap: bool = True
+) -> RangeArray:
+    """Load ranges of one kind from .npy, .csv or .parquet (one range per row)."""
+    return RangeArray(kind, read_table(path, columns, chunksize, mmap))
@@ -0,0 +1,187 @@
+import os
+import threading
+import tracemalloc
+
+from contextlib import ContextDecorator
+from typing import Callable, Dict, List, Tuple
+
+_active = None  # MemoryReport being recorded, if any
+
+
+def _rss() -> int:
+    """Resident set size of this process in bytes (None if unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class PhaseMemory:
+    def __init__(self, name: str):
+        """
+        Memory accounting of one phase, over all of its calls.
+
+        Attributes:
+            calls (int): Number of times the phase ran.
+            peak (int): Largest traced allocation above the phase start (bytes).
+            retained (int): Traced memory still allocated at the phase ends (bytes, summed).
+            rss_peak (int): Largest sampled resident set size while in the phase (bytes).
+        """
+        self.name = name
+        self.calls = 0
+        self.peak = 0
+        self.retained = 0
+        self.rss_peak = None
+
+    def __repr__(self):
+        return (
+            f"PhaseMemory({self.name}, calls={self.calls}, peak={self.peak}, "
+            f"retained={self.retained}, rss_peak={self.rss_peak})"
+        )
+
+
+class _Frame:
+    def __init__(self, name: str, start: int):
+        self.name = name
+        self.start = start
+        self.peak = start
+        self.rss_peak = _rss()
+
+
+class MemoryReport:
+    def __init__(self, rss_interval: float = 0.01):
+        """
+        Per-phase memory high-water marks, recorded while the report is active.
+
+        Traced (tracemalloc) peaks are exact for nested phases; the resident
+        set size is sampled every rss_interval seconds by a background thread.
+
+        Parameters:
+            rss_interval (float): RSS sampling period in seconds (None disables sampling).
+        """
+        self.phases: Dict[str, PhaseMemory] = {}
+        self.rss_interval = rss_interval
+        self._stack: List[_Frame] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler = None
+
+    def __getitem__(self, name: str) -> PhaseMemory:
+        return self.phases[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.phases
+
+    def _enter(self, name: str):
+        current, peak = tracemalloc.get_traced_memory()
+        with self._lock:
+            # Open phases keep the peak reached so far, then the counter restarts
+            for frame in self._stack:
+                frame.peak = max(frame.peak, peak)
+            tracemalloc.reset_peak()
+            self._stack.append(_Frame(name, current))
+
+    def _exit(self, name: str):
+        current, peak = tracemalloc.get_traced_memory()
+        with self._lock:
+            frame = self._stack.pop()
+            frame.peak = max(frame.peak, peak)
+            if self._stack:
+                parent = self._stack[-1]
+                parent.peak = max(parent.peak, frame.peak)
+                parent.rss_peak = _max(parent.rss_peak, frame.rss_peak)
+            stats = self.phases.setdefault(name, PhaseMemory(name))
+            stats.calls += 1
+            stats.peak = max(stats.peak, frame.peak - frame.start)
+            stats.retained += current - frame.start
+            stats.rss_peak = _max(stats.rss_peak, _max(frame.rss_peak, _rss()))
+
+    def _sample(self):
+        while not self._stop.wait(self.rss_interval):
+            rss = _rss()
+            with self._lock:
+                for frame in self._stack:
+                    frame.rss_peak = _max(frame.rss_peak, rss)
+
+    def start(self):
+        global _active
+        if _active is not None:
+            raise RuntimeError("Another memory report is already active.")
+        _active = self
+        if self.rss_interval is not None and _rss() is not None:
+            self._stop.clear()
+            self._sampler = threading.Thread(target=self._sample, daemon=True)
+            self._sampler.start()
+
+    def stop(self):
+        global _active
+        _active = None
+        if self._sampler is not None:
+            self._stop.set()
+            self._sampler.join()
+            self._sampler = None
+
+    def summary(self) -> str:
+        lines = [f"{'phase':<32} {'calls':>6} {'peak MiB':>10} {'retained MiB':>13} {'rss MiB':>9}"]
+        for stats in sorted(self.phases.values(), key=lambda s: -s.peak):
+            rss = f"{stats.rss_peak / 2**20:9.1f}" if stats.rss_peak is not None else f"{'-':>9}"
+            lines.append(
+                f"{stats.name:<32} {stats.calls:>6} {stats.peak / 2**20:10.2f} "
+                f"{stats.retained / 2**20:13.2f} {rss}"
+            )
+        return "\n".join(lines)
+
+
+def _max(a, b):
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return max(a, b)
+
+
+class phase(ContextDecorator):
+    def __init__(self, name: str):
+        """
+        Mark an algorithm phase for memory accounting (context manager or decorator).
+
+        Does nothing unless a MemoryReport is active (see profile_memory).
+        """
+        self.name = name
+
+    def __enter__(self):
+        if _active is not None:
+            _active._enter(self.name)
+        return self
+
+    def __exit__(self, *exc):
+        if _active is not None:
+            _active._exit(self.name)
+        return False
+
+
+def profile_memory(fn: Callable, *args, rss_interval: float = 0.01, **kwargs) -> Tuple[object, MemoryReport]:
+    """
+    Run fn(*args, **kwargs) with memory accounting.
+
+    The whole call is recorded as the phase fn.__name__, and every phase
+    marked inside it under its own name.
+
+    Returns:
+        (result, MemoryReport)
+    """
+    report = MemoryReport(rss_interval)
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    report.start()
+    try:
+        with phase(fn.__name__):
+            result = fn(*args, **kwargs)
+    finally:
+        report.stop()
+        if not tracing:
+            tracemalloc.stop()
+    print(f"[profile_memory] {fn.__name__}\n{report.summary()}")
+    return result, report
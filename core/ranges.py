@@ -1,6 +1,11 @@
+import numpy as np
+
 from abc import ABC, abstractmethod
-from typing import List, Set
+from collections import OrderedDict
+from collections.abc import Sequence
+from typing import List, Set, Union
 from core.points import Point
+from core.profiling import phase
 
 
 class Range(ABC):
@@ -17,6 +22,10 @@ class Range(ABC):
         """Batch containment check."""
         return [self.contains(p) for p in points]
 
+    def contains_array(self, coords: np.ndarray) -> np.ndarray:
+        """Vectorized containment check over an (n, d) coordinate array."""
+        return np.array([self.contains(Point(tuple(c), None)) for c in coords], dtype=bool)
+
     @classmethod
     def get_vc_dim(cls) -> int:
         if cls.vc_dim is None:
@@ -40,6 +49,10 @@ class RectangleRange(Range):
         x, y = point.point
         return self.xmin <= x <= self.xmax and self.ymin <= y <= self.ymax
 
+    def contains_array(self, coords: np.ndarray) -> np.ndarray:
+        x, y = coords[:, 0], coords[:, 1]
+        return (self.xmin <= x) & (x <= self.xmax) & (self.ymin <= y) & (y <= self.ymax)
+
 class HyperRectangleRange(Range):
     vc_dim = None
 
@@ -57,6 +70,9 @@ class HyperRectangleRange(Range):
         point = point.point
         return all(m <= p <= M for m, p, M in zip(self.mins, point, self.maxs))
 
+    def contains_array(self, coords: np.ndarray) -> np.ndarray:
+        return np.all((coords >= self.mins) & (coords <= self.maxs), axis=1)
+
 
 class BallRange(Range):
     vc_dim = None
@@ -80,6 +96,9 @@ class BallRange(Range):
         point = point.point
         return sum((p - c) ** 2 for p, c in zip(point, self.center)) <= self.radius**2
 
+    def contains_array(self, coords: np.ndarray) -> np.ndarray:
+        return np.sum((coords - self.center) ** 2, axis=1) <= self.radius**2
+
 
 class HalfspaceRange(Range):
     vc_dim = None
@@ -97,11 +116,80 @@ class HalfspaceRange(Range):
         point = point.point
         return sum(a * x for a, x in zip(self.normal, point)) <= self.offset
 
+    def contains_array(self, coords: np.ndarray) -> np.ndarray:
+        return coords @ np.asarray(self.normal, dtype=float) <= self.offset
+
 
-def get_range_space(points: List[Point], ranges: List[Range]) -> List[Set[Point]]:
+class RangeSpace(Sequence):
+    def __init__(
+        self,
+        points: List[Point],
+        ranges: List[Range],
+        max_cached: int = 4096,
+        coords: np.ndarray = None,
+    ):
+        """
+        Lazy range space: row j is the set of points in ranges[j], computed on
+        first access (one vectorized containment test) and kept in a bounded
+        LRU cache. It can be passed wherever a List[Set[Point]] is expected;
+        algorithms that never read the range space (sampling) cost nothing.
+
+        Parameters:
+            points (List[Point]): The points.
+            ranges (List[Range]): The range definitions.
+            max_cached (int): Maximum number of cached rows (None for no limit).
+            coords (np.ndarray): (n, d) coordinates of the points, if already
+                at hand (default: taken from the points on first access).
+        """
+        self.points = points
+        self.ranges = ranges
+        self.max_cached = max_cached
+        self.computed = 0  # rows materialized so far, including recomputations
+        self._coords = coords
+        self._cache = OrderedDict()  # row index -> set of points
+
+    def __len__(self):
+        return len(self.ranges)
+
+    def __getitem__(self, j):
+        if isinstance(j, slice):
+            return [self[i] for i in range(*j.indices(len(self)))]
+        if j < 0:
+            j += len(self)
+        r = self.ranges[j]  # IndexError ends iteration
+        row = self._cache.get(j)
+        if row is not None:
+            self._cache.move_to_end(j)
+            return row
+        if self._coords is None:
+            self._coords = np.asarray([p.point for p in self.points], dtype=float)
+        row = {self.points[i] for i in np.flatnonzero(r.contains_array(self._coords))}
+        self.computed += 1
+        self._cache[j] = row
+        if self.max_cached is not None and len(self._cache) > self.max_cached:
+            self._cache.popitem(last=False)
+        return row
+
+    def copy(self) -> List[Set[Point]]:
+        """Materialized list of all rows."""
+        return list(self)
+
+    def cache_info(self) -> dict:
+        return {"rows": len(self._cache), "computed": self.computed, "max_cached": self.max_cached}
+
+
+@phase("get_range_space")
+def get_range_space(
+    points: List[Point], ranges: List[Range], lazy: bool = False, max_cached: int = 4096
+) -> Union[List[Set[Point]], RangeSpace]:
     """
     Keeps track of points contained in each range.
+
+    If lazy is set, a RangeSpace is returned and rows are only computed
+    when an algorithm reads them (at most max_cached rows are kept).
     """
+    if lazy:
+        return RangeSpace(points, ranges, max_cached)
     rangespace = []
     for r in ranges:
         subset = [p for p in points if r.contains(p)]
@@ -0,0 +1,271 @@
+import numpy as np
+
+from scipy.spatial import ConvexHull, QhullError
+from typing import Dict, List, Set, Tuple
+from core.points import Point
+from core.ranges import Range, RectangleRange, HyperRectangleRange, HalfspaceRange
+
+
+def dedupe_ranges(rangespace: List[Set[Point]]) -> Tuple[List[Set[Point]], List[int]]:
+    """
+    Remove ranges with identical point sets.
+
+    Returns:
+        Tuple[List[Set[Point]], List[int]]: The distinct ranges, and for every
+        input range the position of its representative in that list.
+    """
+    seen: Dict[frozenset, int] = {}
+    unique = []
+    mapping = []
+    for r in rangespace:
+        key = frozenset(r)
+        if key not in seen:
+            seen[key] = len(unique)
+            unique.append(r)
+        mapping.append(seen[key])
+    print(f"[dedupe_ranges] ranges: {len(rangespace)} -> {len(unique)}")
+    return unique, mapping
+
+
+def prune_dominated_ranges(rangespace: List[Set[Point]]) -> List[Set[Point]]:
+    """
+    Remove every range that contains another range (for hitting sets only).
+
+    A point hitting the smaller range also hits the larger one, so the
+    hitting sets of the pruned family are exactly those of the original.
+    Empty ranges cannot be hit and are dropped as well. Ranges are expected
+    to be distinct (see dedupe_ranges).
+    """
+    kept = []
+    point_to_kept: Dict[Point, List[int]] = {}  # inverted index over kept ranges
+    for r in sorted((r for r in rangespace if r), key=len):
+        # S ⊆ r iff all of S's points are seen while scanning r
+        counts: Dict[int, int] = {}
+        dominated = False
+        for p in r:
+            for j in point_to_kept.get(p, ()):
+                counts[j] = counts.get(j, 0) + 1
+                if counts[j] == len(kept[j]):
+                    dominated = True
+                    break
+            if dominated:
+                break
+        if dominated:
+            continue
+        for p in r:
+            point_to_kept.setdefault(p, []).append(len(kept))
+        kept.append(r)
+    print(f"[prune_dominated_ranges] ranges: {len(rangespace)} -> {len(kept)}")
+    return kept
+
+
+def collapse_points(
+    points: List[Point], rangespace: List[Set[Point]]
+) -> Tuple[List[Point], List[Set[Point]], List[float]]:
+    """
+    Replace coincident points (same coordinates and color) by one representative.
+
+    The representative is the first such point, its weight is the sum of the
+    weights of its group. Points are not modified.
+
+    Returns:
+        Tuple[List[Point], List[Set[Point]], List[float]]: Representatives, the
+        range space over the representatives and the representative weights.
+    """
+    groups: Dict[tuple, int] = {}
+    representatives = []
+    weights = []
+    rep_of: Dict[Point, Point] = {}
+    for p in points:
+        key = (tuple(p.point), p.color)
+        if key not in groups:
+            groups[key] = len(representatives)
+            representatives.append(p)
+            weights.append(0)
+        i = groups[key]
+        weights[i] += p.weight
+        rep_of[p] = representatives[i]
+
+    if len(representatives) == len(points):
+        return points, rangespace, weights
+    collapsed = [set(rep_of.get(p, p) for p in r) for r in rangespace]
+    print(f"[collapse_points] points: {len(points)} -> {len(representatives)}")
+    return representatives, collapsed, weights
+
+
+def expand_weights(
+    points: List[Point],
+    representatives: List[Point],
+    rep_weights: List[float],
+    multiplicities: List[float],
+) -> List[float]:
+    """
+    Spread per-representative weights (e.g. LP values) over the collapsed points.
+
+    Every point gets the share p.weight / multiplicity of the weight of its
+    representative (see collapse_points), so the total per group is
+    unchanged: sampling with the result picks groups as before, but any
+    member of a group can be drawn.
+
+    Parameters:
+        points (List[Point]): The points that were collapsed.
+        representatives (List[Point]): The representatives returned by collapse_points.
+        rep_weights (List[float]): One weight per representative.
+        multiplicities (List[float]): The representative weights returned by collapse_points.
+    """
+    index = {(tuple(r.point), r.color): i for i, r in enumerate(representatives)}
+    expanded = []
+    for p in points:
+        i = index[(tuple(p.point), p.color)]
+        expanded.append(rep_weights[i] * p.weight / multiplicities[i] if multiplicities[i] else 0.0)
+    return expanded
+
+
+def reduce_range_space(
+    points: List[Point],
+    rangespace: List[Set[Point]],
+    prune_dominated: bool = False,
+    collapse: bool = False,
+) -> Tuple[List[Point], List[Set[Point]], List[float]]:
+    """
+    Shrink a range space before the expensive stages.
+
+    Parameters:
+        points (List[Point]): The points.
+        rangespace (List[Set[Point]]): The ranges.
+        prune_dominated (bool): Also remove ranges containing another range
+            (only valid for hitting sets).
+        collapse (bool): Collapse coincident points into weighted representatives.
+
+    Returns:
+        Tuple[List[Point], List[Set[Point]], List[float]]: The reduced points,
+        the reduced range space and the point weights (the multiplicities of
+        the representatives, for expand_weights).
+    """
+    weights = [p.weight for p in points]
+    if collapse:
+        points, rangespace, weights = collapse_points(points, rangespace)
+    rangespace, _ = dedupe_ranges(rangespace)
+    if prune_dominated:
+        rangespace = prune_dominated_ranges(rangespace)
+    return points, rangespace, weights
+
+
+def _hull_vertices(coords: np.ndarray) -> np.ndarray:
+    """Indices of the convex hull vertices (all points if the hull is degenerate)."""
+    n, d = coords.shape
+    if d == 1:
+        return np.unique([np.argmin(coords[:, 0]), np.argmax(coords[:, 0])])
+    if n <= d + 1:
+        return np.arange(n)
+    try:
+        return np.sort(ConvexHull(coords).vertices)
+    except QhullError:
+        # Points in a lower dimensional flat
+        return np.arange(n)
+
+
+def _box_bounds(r: Range):
+    if isinstance(r, RectangleRange):
+        return (r.xmin, r.ymin), (r.xmax, r.ymax)
+    return r.mins, r.maxs
+
+
+def _staircase(coords: np.ndarray, boxes: List[Range]) -> np.ndarray:
+    """
+    Indices of the extremal points for boxes anchored at the bounding box.
+
+    On every axis either all boxes reach the lower side of the bounding box
+    of the points, or all reach the upper side (or both). Then q is in every
+    box containing p if q is between p and the anchor on every axis, so only
+    the points not dominated that way (a staircase) are needed. Returns None
+    if the boxes are not anchored like this.
+    """
+    lower, upper = coords.min(axis=0), coords.max(axis=0)
+    mins = np.asarray([_box_bounds(r)[0] for r in boxes], dtype=float)
+    maxs = np.asarray([_box_bounds(r)[1] for r in boxes], dtype=float)
+    low = np.all(mins <= lower, axis=0)
+    high = np.all(maxs >= upper, axis=0)
+    if not np.all(low | high):
+        return None
+    # Smaller key = closer to the anchor; axes anchored on both sides do not matter
+    axes = [a for a in range(coords.shape[1]) if not (low[a] and high[a])]
+    if not axes:
+        return np.array([0])
+    keys = np.column_stack([coords[:, a] if low[a] else -coords[:, a] for a in axes])
+    order = np.lexsort(keys.T[::-1])
+    kept = []
+    kept_keys = np.empty_like(keys)
+    for i in order:
+        # Only points earlier in lexicographic order can dominate
+        if not np.any(np.all(kept_keys[: len(kept)] <= keys[i], axis=1)):
+            kept_keys[len(kept)] = keys[i]
+            kept.append(i)
+    return np.sort(np.asarray(kept))
+
+
+def prune_candidates(
+    points: List[Point],
+    rangespace: List[Set[Point]],
+    ranges: List[Range],
+    colors: List[int] = None,
+) -> Tuple[List[Point], List[Set[Point]]]:
+    """
+    Keep only the points a hitting set ever needs (for hitting sets only).
+
+    A non-empty halfspace contains a vertex of the convex hull of the points,
+    and a box anchored at the bounding box contains a point of the staircase
+    (see _staircase). With only such ranges, every non-empty range still
+    contains a candidate, so the candidates are enough to hit all ranges
+    and the greedy and the LP only see them. Other range types (balls,
+    free rectangles) keep all points.
+
+    Parameters:
+        points (List[Point]): The points.
+        rangespace (List[Set[Point]]): The ranges as point sets.
+        ranges (List[Range]): The Range objects rangespace was built from.
+        colors (List[int]): Keep at least one point of each of these colors
+            (the one in the most ranges), so that color constraints on the
+            candidates stay feasible.
+
+    Returns:
+        Tuple[List[Point], List[Set[Point]]]: The candidates and the range
+        space restricted to them.
+    """
+    if not points:
+        return points, rangespace
+    coords = np.asarray([p.point for p in points], dtype=float)
+    halfspaces = [r for r in ranges if isinstance(r, HalfspaceRange)]
+    boxes = [r for r in ranges if isinstance(r, (RectangleRange, HyperRectangleRange))]
+    if len(halfspaces) + len(boxes) < len(ranges):
+        return points, rangespace
+
+    keep = np.zeros(len(points), dtype=bool)
+    if halfspaces:
+        keep[_hull_vertices(coords)] = True
+    if boxes:
+        staircase = _staircase(coords, boxes)
+        if staircase is None:
+            return points, rangespace
+        keep[staircase] = True
+
+    selected = {p for p, k in zip(points, keep) if k}
+    for r in rangespace:
+        if r and selected.isdisjoint(r):
+            # Numerical corner case of the hull, keep the range hittable
+            selected.add(next(iter(r)))
+    missing = set(colors or []) - {p.color for p in selected}
+    if missing:
+        depth = {}
+        for r in rangespace:
+            for p in r:
+                if p.color in missing:
+                    depth[p] = depth.get(p, 0) + 1
+        for color in missing:
+            of_color = [p for p in points if p.color == color]
+            if of_color:
+                selected.add(max(of_color, key=lambda p: depth.get(p, 0)))
+    candidates = [p for p in points if p in selected]
+    restricted = [{p for p in r if p in selected} for r in rangespace]
+    print(f"[prune_candidates] points: {len(points)} -> {len(candidates)}")
+    return candidates, restricted
@@ -0,0 +1,137 @@
+import heapq
+import math
+import random
+
+from typing import List, Sequence
+
+
+class AliasTable:
+    def __init__(self, items: Sequence, weights: List[float] = None):
+        """
+        Walker's alias table for O(1) weighted sampling with replacement.
+
+        Building the table is O(n); afterwards every draw costs O(1), instead of
+        the O(log n) search (plus O(n) cumulative weights per call) of random.choices.
+
+        Parameters:
+            items (Sequence): The items to sample from.
+            weights (List[float]): Non-negative weights (default is uniform).
+        """
+        self.items = items
+        n = len(items)
+        self.n = n
+        if weights is None:
+            self._prob = None
+            self._alias = None
+            return
+
+        total = float(sum(weights))
+        if total <= 0:
+            raise ValueError("Weights must have a positive sum.")
+        scaled = [w * n / total for w in weights]
+        prob = [0.0] * n
+        alias = list(range(n))
+        small = [i for i, w in enumerate(scaled) if w < 1]
+        large = [i for i, w in enumerate(scaled) if w >= 1]
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            prob[s] = scaled[s]
+            alias[s] = l
+            scaled[l] = scaled[l] + scaled[s] - 1
+            if scaled[l] < 1:
+                small.append(l)
+            else:
+                large.append(l)
+        for i in large + small:
+            # Leftovers are 1 up to floating point error
+            prob[i] = 1.0
+        self._prob = prob
+        self._alias = alias
+
+    def sample_index(self) -> int:
+        i = int(random.random() * self.n)
+        if self._prob is None or random.random() < self._prob[i]:
+            return i
+        return self._alias[i]
+
+    def sample(self, k: int) -> List:
+        """Draw k items with replacement."""
+        return [self.items[self.sample_index()] for _ in range(k)]
+
+
+class WeightedReservoir:
+    def __init__(self, capacity: int):
+        """
+        Weighted reservoir sample without replacement (Efraimidis-Spirakis A-ExpJ).
+
+        Every item gets the key u^(1/w) and the `capacity` largest keys are
+        kept. Instead of drawing a key per item, the reservoir draws how much
+        weight to skip until the next replacement, so most items cost O(1).
+        Keys are kept as log(u)/w to avoid underflow for large weights.
+
+        Parameters:
+            capacity (int): Sample size.
+        """
+        self.capacity = capacity
+        self.seen = 0
+        self.total_weight = 0.0
+        self._heap = []  # (log key, counter, item), smallest key on top
+        self._skip = 0.0
+        self._counter = 0
+
+    def __len__(self):
+        return len(self._heap)
+
+    def add(self, item, weight: float = 1.0) -> bool:
+        """Offer an item; returns True if it entered the sample."""
+        if weight <= 0 or self.capacity <= 0:
+            return False
+        self.seen += 1
+        self.total_weight += weight
+        if len(self._heap) < self.capacity:
+            key = math.log(1 - random.random()) / weight
+            self._push(key, item)
+            if len(self._heap) == self.capacity:
+                self._set_jump()
+            return True
+
+        self._skip -= weight
+        if self._skip > 0:
+            return False
+        # Replace the smallest key with a key conditioned to beat it
+        t_w = math.exp(self._heap[0][0] * weight)
+        r = random.uniform(t_w, 1)
+        key = math.log(r) / weight if r > 0 else self._heap[0][0]
+        heapq.heapreplace(self._heap, (key, self._counter, item))
+        self._counter += 1
+        self._set_jump()
+        return True
+
+    def items(self) -> List:
+        return [item for _, _, item in self._heap]
+
+    def shrink(self, capacity: int):
+        """
+        Reduce the sample size. The largest keys are kept, so the result is
+        a sample of the smaller size over the same items.
+        """
+        if capacity >= self.capacity:
+            raise ValueError("A reservoir can only shrink.")
+        self.capacity = capacity
+        self._heap = heapq.nlargest(capacity, self._heap) if capacity > 0 else []
+        heapq.heapify(self._heap)
+        if len(self._heap) == capacity and capacity > 0:
+            self._set_jump()
+
+    def _push(self, key: float, item):
+        heapq.heappush(self._heap, (key, self._counter, item))
+        self._counter += 1
+
+    def _set_jump(self):
+        # Weight to skip: X_w = log(r) / log(T_w)
+        threshold = self._heap[0][0]
+        if threshold == 0:
+            self._skip = math.inf
+        else:
+            self._skip = math.log(1 - random.random()) / threshold
@@ -0,0 +1,132 @@
+import math
+import numpy as np
+
+from typing import List, Set
+
+from core.points import Point
+from core.ranges import Range, RectangleRange, HyperRectangleRange, BallRange
+
+
+def _bounding_box(r: Range):
+    """(mins, maxs) of the range, or None if it is unbounded."""
+    if isinstance(r, RectangleRange):
+        return (r.xmin, r.ymin), (r.xmax, r.ymax)
+    elif isinstance(r, HyperRectangleRange):
+        return tuple(r.mins), tuple(r.maxs)
+    elif isinstance(r, BallRange):
+        return (
+            tuple(c - r.radius for c in r.center),
+            tuple(c + r.radius for c in r.center),
+        )
+    return None
+
+
+def _str_order(ids: np.ndarray, centers: np.ndarray, dim: int, node_size: int) -> np.ndarray:
+    """Sort-Tile-Recursive order: slabs along dim, then recursively along the next dims."""
+    d = centers.shape[1]
+    ids = ids[np.argsort(centers[ids, dim], kind="stable")]
+    if dim == d - 1:
+        return ids
+    leaves = math.ceil(len(ids) / node_size)
+    slabs = math.ceil(leaves ** (1 / (d - dim)))
+    slab = math.ceil(leaves / slabs) * node_size
+    return np.concatenate(
+        [_str_order(ids[i : i + slab], centers, dim + 1, node_size) for i in range(0, len(ids), slab)]
+    )
+
+
+class RangeStabbingIndex:
+    def __init__(self, ranges: List[Range], node_size: int = 16):
+        """
+        Reverse index over the range definitions: which ranges contain a point.
+
+        The bounding boxes of rectangles, hyperrectangles and balls are packed
+        into an R-tree (Sort-Tile-Recursive bulk loading). Every node of a
+        level covers node_size consecutive entries of the level below, so the
+        tree is a list of (mins, maxs) arrays. A query descends into the
+        nodes whose box contains the point and checks the candidate ranges
+        exactly. Ranges without a bounding box (e.g. halfspaces) are always
+        checked.
+
+        Parameters:
+            ranges (List[Range]): The ranges (ids are their positions).
+            node_size (int): Fan-out of the tree.
+        """
+        self.ranges = ranges
+        self.node_size = node_size
+        boxes = [_bounding_box(r) for r in ranges]
+        self.unbounded = [j for j, box in enumerate(boxes) if box is None]
+        bounded = np.asarray([j for j, box in enumerate(boxes) if box is not None], dtype=np.int64)
+
+        self.levels = []  # leaf level first
+        if len(bounded) == 0:
+            self.ids = bounded
+            return
+        mins = np.asarray([boxes[j][0] for j in bounded], dtype=float)
+        maxs = np.asarray([boxes[j][1] for j in bounded], dtype=float)
+        order = _str_order(np.arange(len(bounded)), (mins + maxs) / 2, 0, node_size)
+        self.ids = bounded[order]
+        mins, maxs = mins[order], maxs[order]
+        self.levels.append((mins, maxs))
+        while len(mins) > 1:
+            starts = np.arange(0, len(mins), node_size)
+            mins = np.minimum.reduceat(mins, starts, axis=0)
+            maxs = np.maximum.reduceat(maxs, starts, axis=0)
+            self.levels.append((mins, maxs))
+        print(
+            f"[RangeStabbingIndex] ranges: {len(ranges)}, unbounded: {len(self.unbounded)}, "
+            f"levels: {len(self.levels)}"
+        )
+
+    def stab(self, point: Point) -> List[int]:
+        """Ids of the ranges that contain the point."""
+        result = [j for j in self.unbounded if self.ranges[j].contains(point)]
+        if not self.levels:
+            return result
+        x = np.asarray(point.point, dtype=float)
+        B = self.node_size
+        nodes = [0]
+        for level in range(len(self.levels) - 1, 0, -1):
+            mins, maxs = self.levels[level - 1]
+            children = []
+            for node in nodes:
+                lo, hi = node * B, min((node + 1) * B, len(mins))
+                inside = np.all((mins[lo:hi] <= x) & (x <= maxs[lo:hi]), axis=1)
+                children.extend((lo + np.flatnonzero(inside)).tolist())
+            nodes = children
+            if not nodes:
+                return result
+        if len(self.levels) == 1:
+            # A single leaf entry is the root
+            mins, maxs = self.levels[0]
+            nodes = [i for i in nodes if np.all((mins[i] <= x) & (x <= maxs[i]))]
+        for i in nodes:
+            j = int(self.ids[i])
+            if self.ranges[j].contains(point):
+                result.append(j)
+        return sorted(result)
+
+    def stab_many(self, points: List[Point]) -> List[List[int]]:
+        return [self.stab(p) for p in points]
+
+
+def extend_range_space(
+    rangespace: List[Set[Point]], index: RangeStabbingIndex, new_points: List[Point]
+) -> List[List[int]]:
+    """
+    Add new points to an existing range space in place.
+
+    Only the ranges that contain a new point are touched, so the cost is the
+    index queries plus the number of new incidences (instead of a full
+    get_range_space over all points).
+
+    Returns:
+        List[List[int]]: For every new point, the ids of the ranges it was added to
+        (e.g. for DynamicHittingSet.insert_point).
+    """
+    hits = index.stab_many(new_points)
+    for p, ids in zip(new_points, hits):
+        for j in ids:
+            rangespace[j].add(p)
+    print(f"[extend_range_space] points: {len(new_points)}, incidences: {sum(len(h) for h in hits)}")
+    return hits
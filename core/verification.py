@@ -1,6 +1,9 @@
+from collections import Counter
 from typing import List, Set
 from core.ranges import Point, Range
 from core.ranges import get_range_space
+from core.counting import RangeCountingIndex
+from core.incidence import heavy_incidence_matrix, hits_all_rows
 
 
 def is_epsnet(
@@ -130,4 +133,129 @@ def is_fair_hittingset(
             print("Not a fair hitting set!")
             return False
 
-    return True
\ No newline at end of file
+    return True
+
+def is_epsnet_counting(
+    epsnet: List[Point],
+    points: List[Point],
+    ranges: List[Range],
+    epsilon: float,
+    index: RangeCountingIndex = None,
+) -> bool:
+    """
+    Verify an eps-net without building the range space.
+
+    Heavy ranges (|r ∩ P| >= epsilon * |P|) are detected with a range-counting
+    index, so only those are checked against the eps-net.
+
+    Parameters:
+        epsnet (List[Point]): The points to verify.
+        points (List[Point]): The point set P.
+        ranges (List[Range]): The ranges to verify against.
+        epsilon (float): The epsilon parameter for the eps-net.
+        index (RangeCountingIndex): A prebuilt index over points (optional).
+
+    Returns:
+        bool: True if the points form an eps-net, False otherwise.
+    """
+    if index is None:
+        index = RangeCountingIndex(points)
+    n = len(points)
+    for r in ranges:
+        if index.count(r) >= epsilon * n:
+            if not any(r.contains(p) for p in epsnet):
+                return False
+
+    return True
+
+
+def is_fair_epsnet_counting(
+    epsnet: List[Point],
+    points: List[Point],
+    ranges: List[Range],
+    epsilon: float,
+    index: RangeCountingIndex = None,
+) -> bool:
+    """
+    Verify a fair eps-net without building the range space.
+
+    Same as is_epsnet_counting, plus the color ratio check of is_fair_epsnet.
+
+    Returns:
+        bool: True if the points form a fair eps-net, False otherwise.
+    """
+    if not is_epsnet_counting(epsnet, points, ranges, epsilon, index):
+        print("Not an eps-net!")
+        return False
+
+    # Check color ratios
+    point_counts = Counter(p.color for p in points)
+    epsnet_counts = Counter(p.color for p in epsnet)
+    for color, count in point_counts.items():
+        color_ratio = count / len(points)
+        if abs(epsnet_counts[color] / len(epsnet) - color_ratio) > 0.01:
+            print("Not a fair eps-net!")
+            return False
+
+    return True
+
+
+def is_epsapprox(
+    sample: List[Point],
+    rangespace: List[Set[Point]],
+    epsilon: float,
+    points: List[Point],
+) -> bool:
+    """
+    Verify if the given points form an eps-approximation for the specified ranges.
+
+    Parameters:
+        sample (List[Point]): The points to verify (repetitions allowed).
+        rangespace (List[Set[Point]]): The ranges to verify against.
+        epsilon (float): The epsilon parameter for the eps-approximation.
+        points (List[Point]): The point set.
+
+    Returns:
+        bool: True if | |r ∩ S|/|S| - |r|/|P| | <= epsilon for every range r.
+    """
+    for r in rangespace:
+        in_sample = sum(1 for p in sample if p in r)
+        if abs(in_sample / len(sample) - len(r) / len(points)) > epsilon:
+            return False
+
+    return True
+
+
+def is_epsnet_fast(
+    epsnet: List[Point],
+    points: List[Point],
+    rangespace: List[Set[Point]],
+    epsilon: float,
+) -> bool:
+    """
+    Verify an eps-net with one sparse product over the heavy ranges.
+
+    Heavy ranges are those with |r| >= epsilon * |P|.
+
+    Returns:
+        bool: True if the points form an eps-net, False otherwise.
+    """
+    A = heavy_incidence_matrix(points, rangespace, epsilon)
+    position = {p: i for i, p in enumerate(points)}
+    return hits_all_rows(A, [position[p] for p in epsnet if p in position])
+
+
+def get_achieved_epsilon(epsnet: List[Point], rangespace: List[Set[Point]], n: int) -> float:
+    """
+    Smallest epsilon for which epsnet is an eps-net of the n points, i.e. the
+    relative size of the largest range it misses (0 if it hits every range).
+    """
+    selected = set(epsnet)
+    missed = [len(r) for r in rangespace if selected.isdisjoint(r)]
+    return max(missed) / n if missed else 0.0
+
+
+def count_uncovered(hitting_set: List[Point], rangespace: List[Set[Point]]) -> int:
+    """Number of non-empty ranges not hit by the given points (empty ones cannot be hit)."""
+    selected = set(hitting_set)
+    return sum(1 for r in rangespace if r and selected.isdisjoint(r))
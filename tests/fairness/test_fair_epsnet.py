@@ -2,6 +2,7 @@ import unittest
 import random
 
 from algorithms.fairness.fair_epsnet import *
+from algorithms.fairness.streaming import build_fair_epsnet_stream, FairEpsNetSampler
 from core.verification import is_fair_epsnet
 from core.ranges import RectangleRange, get_range_space
 from core.points import Point
@@ -141,3 +142,55 @@ class TestFairEpsNet(unittest.TestCase):
         self.assertTrue(
             is_fair_epsnet(epsnet, self.rangespace_28, self.epsilon, self.points_28)
         )
+
+    def test_fair_epsnet_las_vegas(self):
+        fairconfig = FairConfig(k=2, fairness=FairnessMeasure.DP)
+        epsnet = build_fair_epsnet(
+            strategy=EpsNetStrategy.LAS_VEGAS,
+            points=self.points_28,
+            rangespace=self.rangespace_28,
+            epsilon=self.epsilon,
+            vc=self.ranges[0].vc_dim,
+            fairconfig=fairconfig,
+            color_ratios=[0.25, 0.75],
+            workers=2,
+        )
+        self.assertTrue(
+            is_fair_epsnet(epsnet, self.rangespace_28, self.epsilon, self.points_28)
+        )
+
+    def test_fair_epsnet_kdtree(self):
+        fairconfig = FairConfig(k=2, fairness=FairnessMeasure.DP)
+        epsnet = build_fair_epsnet(
+            strategy=EpsNetStrategy.KD_TREE,
+            fairconfig=fairconfig,
+            points=self.points_28,
+            rangespace=self.rangespace_28,
+            epsilon=self.epsilon,
+        )
+        self.assertTrue(
+            is_fair_epsnet(epsnet, self.rangespace_28, self.epsilon, self.points_28)
+        )
+
+    def test_fair_epsnet_stream(self):
+        fairconfig = FairConfig(k=2, fairness=FairnessMeasure.DP)
+        chunks = [self.points_28[i : i + 100] for i in range(0, self.n, 100)]
+        epsnet = build_fair_epsnet_stream(
+            stream=iter(chunks),
+            epsilon=self.epsilon,
+            vc=self.ranges[0].vc_dim,
+            fairconfig=fairconfig,
+            success_prob=0.9,
+        )
+        self.assertTrue(
+            is_fair_epsnet(epsnet, self.rangespace_28, self.epsilon, self.points_28)
+        )
+
+    def test_fair_epsnet_stream_failed_trials(self):
+        fairconfig = FairConfig(k=2, fairness=FairnessMeasure.DP)
+        # v < 1: no sample can stay below v times the ratio of every color
+        sampler = FairEpsNetSampler(self.ranges[0].vc_dim, self.epsilon, fairconfig, c1=0.1)
+        self.assertEqual(sampler.epsnet(), [])
+        sampler.add_many(self.points_28)
+        with self.assertRaises(RuntimeError):
+            sampler.epsnet()
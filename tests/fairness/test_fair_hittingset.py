@@ -1,9 +1,11 @@
 import unittest
 import random
+import math
 
 from algorithms.fairness.fair_hittingset import *
 from core.verification import is_fair_hittingset
-from core.ranges import RectangleRange, get_range_space
+from core.ranges import RectangleRange, HalfspaceRange, get_range_space
+from core.reduction import prune_candidates
 from core.points import Point
 from core.fairness import FairConfig, FairnessMeasure
 
@@ -94,6 +96,42 @@ class TestFairHittingSet(unittest.TestCase):
             )
         )
 
+    def test_fair_hittingset_parallel_greedy(self):
+        fairconfig = FairConfig(fairness=FairnessMeasure.DP, k=2)
+        hitting_set = find_fair_hitting_set(
+            strategy=HittingSetStrategy.PARALLEL_GREEDY,
+            points=self.points_55,
+            rangespace=self.rangespace_55,
+            fairconfig=fairconfig,
+        )
+        self.assertTrue(
+            is_fair_hittingset(
+                hitting_set=hitting_set,
+                rangespace=self.rangespace_55,
+                points=self.points_55,
+            )
+        )
+
+    def test_fair_hittingset_quota_greedy(self):
+        fairconfig = FairConfig(fairness=FairnessMeasure.DP, k=2)
+        for points, rangespace in [
+            (self.points_55, self.rangespace_55),
+            (self.points_28, self.rangespace_28),
+        ]:
+            hitting_set = find_fair_hitting_set(
+                strategy=HittingSetStrategy.QUOTA_GREEDY,
+                points=points,
+                rangespace=rangespace,
+                fairconfig=fairconfig,
+            )
+            self.assertTrue(
+                is_fair_hittingset(
+                    hitting_set=hitting_set,
+                    rangespace=rangespace,
+                    points=points,
+                )
+            )
+
     def test_fair_hittingset_geometric55(self):
         fairconfig = FairConfig(fairness=FairnessMeasure.DP, k=2)
         hitting_set = find_fair_hitting_set(
@@ -111,6 +149,60 @@ class TestFairHittingSet(unittest.TestCase):
             )
         )
 
+    def test_fair_hittingset_geometric_reduced(self):
+        fairconfig = FairConfig(fairness=FairnessMeasure.DP, k=2)
+        # Every location is used by two points
+        points = self.points_55 + [Point(p.point, p.color) for p in self.points_55]
+        rangespace = get_range_space(points, self.ranges)
+        hitting_set = find_fair_hitting_set(
+            strategy=HittingSetStrategy.GEOMETRIC,
+            points=points,
+            rangespace=rangespace,
+            fairconfig=fairconfig,
+            vc=self.ranges[0].vc_dim,
+            reduce=True,
+        )
+        self.assertTrue(
+            is_fair_hittingset(hitting_set=hitting_set, rangespace=rangespace, points=points)
+        )
+
+    def test_fair_hittingset_pruned_candidates(self):
+        fairconfig = FairConfig(fairness=FairnessMeasure.DP, k=2)
+        # Color 1 lies inside the hull of color 0, so no hull vertex has color 1
+        points = [
+            Point((random.uniform(-1, 1), random.uniform(-1, 1)), 0) for _ in range(self.n // 2)
+        ] + [
+            Point((random.uniform(-0.2, 0.2), random.uniform(-0.2, 0.2)), 1)
+            for _ in range(self.n // 2)
+        ]
+        ranges = []
+        for _ in range(2**6):
+            angle = random.uniform(0, 2 * math.pi)
+            ranges.append(
+                HalfspaceRange([math.cos(angle), math.sin(angle)], random.uniform(-0.5, 0.5))
+            )
+        rangespace = get_range_space(points, ranges)
+        candidates, _ = prune_candidates(points, rangespace, ranges)
+        self.assertEqual({p.color for p in candidates}, {0})
+        candidates, _ = prune_candidates(points, rangespace, ranges, colors=[0, 1])
+        self.assertEqual({p.color for p in candidates}, {0, 1})
+
+        for strategy, kwargs in [
+            (HittingSetStrategy.GREEDY, {}),
+            (HittingSetStrategy.GEOMETRIC, {"vc": 3}),
+        ]:
+            hitting_set = find_fair_hitting_set(
+                strategy=strategy,
+                points=points,
+                rangespace=rangespace,
+                fairconfig=fairconfig,
+                ranges=ranges,
+                **kwargs,
+            )
+            self.assertTrue(
+                is_fair_hittingset(hitting_set=hitting_set, rangespace=rangespace, points=points)
+            )
+
     def test_fair_hittingset_geometric28(self):
         fairconfig = FairConfig(fairness=FairnessMeasure.DP, k=2)
         hitting_set = find_fair_hitting_set(
@@ -127,3 +219,21 @@ class TestFairHittingSet(unittest.TestCase):
                 points=self.points_28,
             )
         )
+
+    def test_fair_hittingset_geometric_constraint_generation(self):
+        fairconfig = FairConfig(fairness=FairnessMeasure.DP, k=2)
+        hitting_set = find_fair_hitting_set(
+            strategy=HittingSetStrategy.GEOMETRIC,
+            points=self.points_55,
+            rangespace=self.rangespace_55,
+            fairconfig=fairconfig,
+            vc=self.ranges[0].vc_dim,
+            constraint_generation=True,
+        )
+        self.assertTrue(
+            is_fair_hittingset(
+                hitting_set=hitting_set,
+                rangespace=self.rangespace_55,
+                points=self.points_55,
+            )
+        )
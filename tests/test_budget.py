@@ -0,0 +1,125 @@
+import unittest
+import random
+
+from algorithms.epsnet import build_epsnet, EpsNetStrategy
+from algorithms.hittingset import find_hitting_set, HittingSetStrategy
+from core.budget import Budget, AnytimeResult
+from core.verification import is_hitting_set, count_uncovered
+from core.ranges import RectangleRange, get_range_space
+from core.points import Point
+
+
+class TestBudget(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(42)  # For reproducibility
+
+        self.n = 2**10
+        self.m = 2**6
+        self.vc = 4
+        self.epsilon = 0.7
+        self.points = [
+            Point((random.uniform(0, 1), random.uniform(0, 1)), 0) for _ in range(self.n)
+        ]
+        self.ranges = [
+            RectangleRange(
+                random.uniform(0, 0.5),  # x_min
+                random.uniform(0.5, 1),  # x_max
+                random.uniform(0, 0.5),  # y_min
+                random.uniform(0.5, 1),  # y_max
+            )
+            for _ in range(self.m)
+        ]
+        self.rangespace = get_range_space(self.points, self.ranges)
+
+    def assertAchievedEpsilon(self, result):
+        for r in self.rangespace:
+            if len(r) > result.epsilon * self.n:
+                self.assertTrue(any(p in r for p in result))
+
+    def test_discrepancy_anytime(self):
+        result = build_epsnet(
+            strategy=EpsNetStrategy.DISCREPANCY,
+            points=self.points,
+            rangespace=self.rangespace,
+            vc=self.vc,
+            epsilon=self.epsilon,
+            budget=Budget(work=100),
+        )
+        self.assertIsInstance(result, AnytimeResult)
+        self.assertFalse(result.complete)
+        # 100 pairs halved, the other points are kept
+        self.assertEqual(len(result), self.n - 100)
+        self.assertAchievedEpsilon(result)
+
+        result = build_epsnet(
+            strategy=EpsNetStrategy.DISCREPANCY,
+            points=self.points,
+            rangespace=self.rangespace,
+            vc=self.vc,
+            epsilon=self.epsilon,
+            budget=Budget(seconds=60),
+        )
+        self.assertTrue(result.complete)
+        self.assertAchievedEpsilon(result)
+
+    def test_sketch_merge_anytime(self):
+        result = build_epsnet(
+            strategy=EpsNetStrategy.SKETCH_MERGE,
+            points=self.points,
+            rangespace=self.rangespace,
+            vc=self.vc,
+            epsilon=self.epsilon,
+            c1=0,
+            budget=Budget(work=0),
+        )
+        self.assertFalse(result.complete)
+        self.assertEqual(len(result), self.n)
+        self.assertEqual(result.epsilon, 0)
+
+    def test_hitting_set_anytime(self):
+        result = find_hitting_set(
+            strategy=HittingSetStrategy.GREEDY,
+            points=self.points,
+            rangespace=self.rangespace,
+            budget=Budget(work=1),
+        )
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result.uncovered, count_uncovered(result, self.rangespace))
+        self.assertEqual(result.complete, result.uncovered == 0)
+
+        result = find_hitting_set(
+            strategy=HittingSetStrategy.GEOMETRIC,
+            points=self.points,
+            rangespace=self.rangespace,
+            vc=self.vc,
+            budget=Budget(seconds=0),
+        )
+        self.assertEqual(result.uncovered, count_uncovered(result, self.rangespace))
+        self.assertFalse(result.complete)
+
+        result = find_hitting_set(
+            strategy=HittingSetStrategy.GREEDY,
+            points=self.points,
+            rangespace=self.rangespace,
+            budget=Budget(seconds=60),
+        )
+        self.assertTrue(result.complete)
+        self.assertTrue(is_hitting_set(result, self.rangespace))
+
+    def test_lp_failure_not_budget(self):
+        # An empty range makes the LP infeasible, which is an error even with a budget left
+        rangespace = self.rangespace + [set()]
+        self.assertEqual(count_uncovered(self.points, rangespace), 0)
+        with self.assertRaises(ValueError):
+            find_hitting_set(
+                strategy=HittingSetStrategy.GEOMETRIC,
+                points=self.points,
+                rangespace=rangespace,
+                vc=self.vc,
+                budget=Budget(seconds=60),
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
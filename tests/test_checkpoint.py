@@ -0,0 +1,122 @@
+import os
+import random
+import tempfile
+import unittest
+
+from algorithms.epsnet import build_epsnet, EpsNetStrategy
+from core.budget import Budget
+from core.checkpoint import Checkpoint
+from core.ranges import RectangleRange, get_range_space
+from core.points import Point
+
+
+class TestCheckpoint(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(42)  # For reproducibility
+
+        self.n = 2**10
+        self.m = 2**5
+        self.vc = 4
+        self.epsilon = 0.7
+        self.points = [
+            Point((random.uniform(0, 1), random.uniform(0, 1)), 0) for _ in range(self.n)
+        ]
+        self.ranges = [
+            RectangleRange(
+                random.uniform(0, 0.5),  # x_min
+                random.uniform(0.5, 1),  # x_max
+                random.uniform(0, 0.5),  # y_min
+                random.uniform(0.5, 1),  # y_max
+            )
+            for _ in range(self.m)
+        ]
+        self.rangespace = get_range_space(self.points, self.ranges)
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "run.npz")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def _build(self, strategy, **kwargs):
+        return build_epsnet(
+            strategy=strategy,
+            points=self.points,
+            rangespace=self.rangespace,
+            vc=self.vc,
+            epsilon=self.epsilon,
+            **kwargs,
+        )
+
+    def _resume_matches(self, strategy, work, **kwargs):
+        random.seed(1)
+        uninterrupted = self._build(strategy, **kwargs)
+
+        # Interrupted run: the budget plays the preemption
+        random.seed(1)
+        self._build(strategy, budget=Budget(work=work), checkpoint=Checkpoint(self.path), **kwargs)
+        self.assertTrue(os.path.exists(self.path))
+
+        random.seed(2)  # the checkpoint restores the random state
+        resumed = self._build(strategy, checkpoint=Checkpoint(self.path), **kwargs)
+        self.assertEqual(resumed, uninterrupted)
+        self.assertFalse(os.path.exists(self.path))  # cleared after the finished run
+
+    def test_sketch_merge_resume(self):
+        # 4 partitions of 256 points, preempted during the second merge
+        self._resume_matches(EpsNetStrategy.SKETCH_MERGE, work=300, c1=0)
+
+    def test_discrepancy_resume(self):
+        # Preempted during the second halving
+        self._resume_matches(EpsNetStrategy.DISCREPANCY, work=600)
+
+    def _starts_fresh(self, strategy, change, work, **kwargs):
+        # Interrupted run, then a resume with changed inputs gives the fresh result
+        random.seed(1)
+        self._build(strategy, budget=Budget(work=work), checkpoint=Checkpoint(self.path), **kwargs)
+        self.assertTrue(os.path.exists(self.path))
+        change()
+        random.seed(2)
+        fresh = self._build(strategy, **kwargs)
+        random.seed(2)
+        resumed = self._build(strategy, checkpoint=Checkpoint(self.path), **kwargs)
+        self.assertEqual(resumed, fresh)
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_other_point_set(self):
+        def change():
+            self.points = self.points[:-1]
+            self.rangespace = get_range_space(self.points, self.ranges)
+
+        self._starts_fresh(EpsNetStrategy.DISCREPANCY, change, work=600)
+
+    def test_same_path_other_points(self):
+        # A finished run leaves no checkpoint behind
+        self._build(EpsNetStrategy.DISCREPANCY, checkpoint=Checkpoint(self.path))
+        self.assertFalse(os.path.exists(self.path))
+
+        # An interrupted run on other points with the same n is not resumed
+        def change():
+            self.points = [
+                Point((random.uniform(0, 1), random.uniform(0, 1)), 0) for _ in range(self.n)
+            ]
+            self.rangespace = get_range_space(self.points, self.ranges)
+
+        self._starts_fresh(EpsNetStrategy.DISCREPANCY, change, work=600)
+
+    def test_other_parameters(self):
+        def change():
+            self.vc = 2
+
+        # vc sets where the halving stops and the partition size of the sketches
+        self._starts_fresh(EpsNetStrategy.DISCREPANCY, change, work=600)
+        self.vc = 4
+        self._starts_fresh(EpsNetStrategy.SKETCH_MERGE, change, work=300, c1=0)
+
+    def test_weighted_rejected(self):
+        with self.assertRaises(ValueError):
+            self._build(EpsNetStrategy.DISCREPANCY, checkpoint=Checkpoint(self.path), weighted=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
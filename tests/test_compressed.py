@@ -0,0 +1,105 @@
+import os
+import random
+import tempfile
+import unittest
+
+from algorithms.epsnet import build_epsnet, EpsNetStrategy
+from algorithms.hittingset import find_hitting_set, HittingSetStrategy
+from core.compressed import (
+    ArrayContainer,
+    BitmapContainer,
+    RunContainer,
+    CompressedRangeSpace,
+    CompressedRow,
+)
+from core.ranges import RectangleRange, get_range_space
+from core.verification import is_epsnet, is_hitting_set
+from core.points import Point
+
+
+class TestCompressed(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(42)  # For reproducibility
+
+        # Three chunks of 2^16 indices
+        self.n = 3 * 2**16
+        self.points = [Point((i, 0), 0) for i in range(self.n)]
+        self.rows = [
+            set(random.sample(range(self.n), 100)),  # small: arrays
+            set(range(self.n)) - set(random.sample(range(self.n), 50)),  # large: runs
+            set(random.sample(range(2**16), 2**15)),  # dense chunk: bitmap
+            set(range(1000, 5000)) | set(range(70000, 70100)),  # intervals: runs
+            set(),
+        ]
+        self.rangespace = [{self.points[i] for i in row} for row in self.rows]
+        self.compressed = CompressedRangeSpace.from_rangespace(self.points, self.rangespace)
+
+    def test_containers(self):
+        kinds = [{type(c) for c in row.containers} for row in self.compressed.rows]
+        self.assertEqual(kinds[0], {ArrayContainer})
+        self.assertEqual(kinds[1], {RunContainer})
+        self.assertEqual(kinds[2], {BitmapContainer})
+        self.assertEqual(kinds[3], {RunContainer})
+        # Far below 8 bytes per incidence of an index list
+        incidences = sum(len(row) for row in self.rows)
+        self.assertLess(self.compressed.nbytes * 20, 8 * incidences)
+
+    def test_set_operations(self):
+        probes = random.sample(range(self.n), 1000) + [1000, 4999, 5000, 70099]
+        for row, r, view in zip(self.rows, self.rangespace, self.compressed):
+            self.assertEqual(len(view), len(row))
+            self.assertEqual(set(view), r)
+            for i in probes:
+                self.assertEqual(self.points[i] in view, i in row)
+        for a, ra in zip(self.compressed.rows, self.rows):
+            for b, rb in zip(self.compressed.rows, self.rows):
+                self.assertEqual(a.intersection_count(b), len(ra & rb))
+                self.assertEqual(a.intersects(b), bool(ra & rb))
+
+    def test_serialization(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "rangespace.bin")
+            self.compressed.save(path)
+            loaded = CompressedRangeSpace.load(path, self.points)
+        self.assertEqual(list(loaded), list(self.compressed))
+        with self.assertRaises(ValueError):
+            CompressedRangeSpace.from_bytes(self.compressed.to_bytes(), self.points[:-1])
+
+    def test_algorithms(self):
+        points = [
+            Point((random.uniform(0, 1), random.uniform(0, 1)), 0) for _ in range(2**9)
+        ]
+        ranges = [
+            RectangleRange(
+                random.uniform(0, 0.5),  # x_min
+                random.uniform(0.5, 1),  # x_max
+                random.uniform(0, 0.5),  # y_min
+                random.uniform(0.5, 1),  # y_max
+            )
+            for _ in range(2**5)
+        ]
+        rangespace = get_range_space(points, ranges)
+        compressed = CompressedRangeSpace.from_rangespace(points, rangespace)
+
+        hitting_sets = [
+            find_hitting_set(strategy=HittingSetStrategy.GREEDY, points=points, rangespace=rs)
+            for rs in (rangespace, compressed)
+        ]
+        self.assertEqual(hitting_sets[0], hitting_sets[1])
+        self.assertTrue(is_hitting_set(hitting_sets[1], compressed))
+
+        epsnets = []
+        for rs in (rangespace, compressed):
+            random.seed(1)
+            epsnets.append(
+                build_epsnet(
+                    strategy=EpsNetStrategy.DISCREPANCY, points=points, rangespace=rs, vc=4, epsilon=0.9
+                )
+            )
+        self.assertEqual(epsnets[0], epsnets[1])
+        self.assertTrue(is_epsnet(epsnets[1], compressed, 0.9))
+
+
+if __name__ == "__main__":
+    unittest.main()
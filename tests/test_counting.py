@@ -0,0 +1,71 @@
+import unittest
+import random
+
+from algorithms.epsnet import build_epsnet, EpsNetStrategy
+from core.counting import RangeCountingIndex
+from core.verification import is_epsnet_counting
+from core.ranges import RectangleRange, HyperRectangleRange, get_range_space
+from core.points import Point
+
+
+class TestRangeCounting(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(42)  # For reproducibility
+
+        self.n = 2**10
+        self.m = 2**7
+        self.points = [
+            Point((random.uniform(0, 1), random.uniform(0, 1)), random.randint(0, 10))
+            for _ in range(self.n)
+        ]
+        self.epsilon = 0.1
+
+        self.ranges = [
+            RectangleRange(
+                random.uniform(0, 0.5),  # x_min
+                random.uniform(0.5, 1),  # x_max
+                random.uniform(0, 0.5),  # y_min
+                random.uniform(0.5, 1),  # y_max
+            )
+            for _ in range(self.m)
+        ]
+
+    def test_count_rectangles(self):
+        index = RangeCountingIndex(self.points)
+        rangespace = get_range_space(self.points, self.ranges)
+        self.assertEqual(index.count_many(self.ranges), [len(r) for r in rangespace])
+
+    def test_count_hyperrectangles(self):
+        points = [
+            Point(tuple(random.uniform(0, 1) for _ in range(3)), 0)
+            for _ in range(self.n)
+        ]
+        ranges = []
+        for _ in range(self.m):
+            bounds = [sorted([random.uniform(0, 1), random.uniform(0, 1)]) for _ in range(3)]
+            ranges.append(HyperRectangleRange([b[0] for b in bounds], [b[1] for b in bounds]))
+        index = RangeCountingIndex(points, leaf_size=8)
+        rangespace = get_range_space(points, ranges)
+        self.assertEqual(index.count_many(ranges), [len(r) for r in rangespace])
+
+    def test_epsnet_counting(self):
+        epsnet = build_epsnet(
+            strategy=EpsNetStrategy.SAMPLE,
+            points=self.points,
+            rangespace=None,
+            epsilon=self.epsilon,
+            vc=self.ranges[0].vc_dim,
+            success_prob=0.9,
+        )
+        self.assertTrue(
+            is_epsnet_counting(epsnet, self.points, self.ranges, self.epsilon)
+        )
+        # A single point cannot hit every heavy rectangle
+        self.assertFalse(
+            is_epsnet_counting([Point((2, 2), 0)], self.points, self.ranges, self.epsilon)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+import random
+
+from algorithms.dynamic_epsnet import DynamicEpsNet
+from core.verification import is_epsnet, is_fair_epsnet
+from core.ranges import RectangleRange, get_range_space
+from core.points import Point
+from core.fairness import FairConfig, FairnessMeasure
+
+
+class TestDynamicEpsNet(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(42)  # For reproducibility
+
+        self.n = 2**11
+        self.m = 2**7
+        self.epsilon = 0.2
+        self.points = [
+            Point((random.uniform(0, 1), random.uniform(0, 1)), int(i % 4 == 0))
+            for i in range(self.n)
+        ]
+        self.ranges = [self._random_range() for _ in range(self.m)]
+
+    def _random_range(self):
+        x1, x2 = sorted([random.uniform(0, 1), random.uniform(0, 1)])
+        y1, y2 = sorted([random.uniform(0, 1), random.uniform(0, 1)])
+        return RectangleRange(x1, x2, y1, y2)
+
+    def test_insertions(self):
+        dynamic = DynamicEpsNet(self.ranges[0].vc_dim, self.epsilon)
+        for step in range(4):
+            batch = self.points[step * self.n // 4 : (step + 1) * self.n // 4]
+            dynamic.insert_many(batch)
+            seen = self.points[: (step + 1) * self.n // 4]
+            epsnet = dynamic.epsnet
+            self.assertEqual(len(epsnet), min(dynamic.m, len(seen)))
+            self.assertEqual(len(set(epsnet)), len(epsnet))
+            self.assertTrue(set(epsnet) <= set(seen))
+            rangespace = get_range_space(seen, self.ranges)
+            self.assertTrue(is_epsnet(epsnet, rangespace, self.epsilon))
+
+    def test_resize(self):
+        dynamic = DynamicEpsNet(self.ranges[0].vc_dim, self.epsilon, points=self.points)
+        m = dynamic.m
+        dynamic.resize(epsilon=2 * self.epsilon)
+        self.assertLess(dynamic.m, m)
+        self.assertEqual(len(dynamic.epsnet), dynamic.m)
+        dynamic.insert_many(self.points[:10])
+        self.assertEqual(len(dynamic.epsnet), dynamic.m)
+        with self.assertRaises(ValueError):
+            dynamic.resize(epsilon=self.epsilon / 2)
+
+    def test_fair_insertions(self):
+        fairconfig = FairConfig(k=2, fairness=FairnessMeasure.DP)
+        dynamic = DynamicEpsNet(self.ranges[0].vc_dim, self.epsilon, fairconfig=fairconfig)
+        dynamic.insert_many(self.points[: self.n // 2])
+        first = dynamic.epsnet
+        # No reservoir or quota change, the cached net is returned without
+        # picking the trial sample again
+        picked = dynamic._picked
+        self.assertEqual(dynamic.epsnet, first)
+        self.assertIs(dynamic._picked, picked)
+
+        dynamic.insert_many(self.points[self.n // 2 :])
+        self.assertAlmostEqual(dynamic.color_ratios[1], 0.25)
+        epsnet = dynamic.epsnet
+        self.assertEqual(len(dynamic.quotas()), 2)
+        rangespace = get_range_space(self.points, self.ranges)
+        self.assertTrue(is_fair_epsnet(epsnet, rangespace, self.epsilon, self.points))
+
+    def test_fair_empty(self):
+        fairconfig = FairConfig(k=2, fairness=FairnessMeasure.DP)
+        dynamic = DynamicEpsNet(self.ranges[0].vc_dim, self.epsilon, fairconfig=fairconfig)
+        self.assertEqual(dynamic.epsnet, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
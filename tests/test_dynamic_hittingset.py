@@ -0,0 +1,94 @@
+import unittest
+import random
+
+from algorithms.dynamic_hittingset import DynamicHittingSet
+from core.verification import is_hitting_set, is_fair_hittingset
+from core.ranges import RectangleRange, get_range_space
+from core.points import Point
+from core.fairness import FairConfig, FairnessMeasure
+
+
+class TestDynamicHittingSet(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(42)  # For reproducibility
+
+        self.n = 2**8
+        self.m = 2**6
+        self.points = [
+            Point((random.uniform(0, 1), random.uniform(0, 1)), i % 2)
+            for i in range(self.n)
+        ]
+        self.ranges = [self._random_range() for _ in range(2 * self.m)]
+
+    def _random_range(self):
+        x1, x2 = sorted([random.uniform(0, 1), random.uniform(0, 1)])
+        y1, y2 = sorted([random.uniform(0, 1), random.uniform(0, 1)])
+        return RectangleRange(x1, x2, y1, y2)
+
+    def _live_rangespace(self, dynamic):
+        return [r for r in dynamic.ranges.values() if r]
+
+    def test_range_updates(self):
+        rangespace = get_range_space(self.points, self.ranges)
+        dynamic = DynamicHittingSet(self.points, rangespace[: self.m])
+        self.assertTrue(is_hitting_set(dynamic.hitting_set, self._live_rangespace(dynamic)))
+
+        ids = list(dynamic.ranges)
+        for r in rangespace[self.m :]:
+            ids.append(dynamic.insert_range(r))
+            self.assertEqual(dynamic.uncovered(), 0)
+        for rid in random.sample(ids, self.m):
+            dynamic.delete_range(rid)
+            self.assertEqual(dynamic.uncovered(), 0)
+        self.assertTrue(is_hitting_set(dynamic.hitting_set, self._live_rangespace(dynamic)))
+
+    def test_point_updates(self):
+        rangespace = get_range_space(self.points, self.ranges[: self.m])
+        dynamic = DynamicHittingSet(self.points, rangespace)
+        for p in random.sample(self.points, self.n // 2):
+            dynamic.delete_point(p)
+            self.assertEqual(dynamic.uncovered(), 0)
+
+        new_point = Point((0.5, 0.5), 0)
+        range_ids = [rid for rid, r in dynamic.ranges.items() if not r][:1]
+        dynamic.insert_point(new_point, range_ids)
+        self.assertEqual(dynamic.uncovered(), 0)
+        self.assertTrue(is_hitting_set(dynamic.hitting_set, self._live_rangespace(dynamic)))
+
+    def test_fair_updates(self):
+        fairconfig = FairConfig(k=2, fairness=FairnessMeasure.DP)
+        rangespace = get_range_space(self.points, self.ranges)
+        dynamic = DynamicHittingSet(self.points, rangespace[: self.m], fairconfig=fairconfig)
+        for r in rangespace[self.m :]:
+            dynamic.insert_range(r)
+        for rid in list(dynamic.ranges)[: self.m // 2]:
+            dynamic.delete_range(rid)
+        self.assertTrue(
+            is_fair_hittingset(
+                hitting_set=dynamic.hitting_set,
+                rangespace=self._live_rangespace(dynamic),
+                points=self.points,
+            )
+        )
+
+    def test_fair_without_initial_points(self):
+        fairconfig = FairConfig(k=2, fairness=FairnessMeasure.DP)
+        dynamic = DynamicHittingSet(fairconfig=fairconfig)
+        self.assertEqual(dynamic.color_ratios, [0.5, 0.5])
+        for p in self.points:
+            dynamic.insert_point(p)
+        rangespace = get_range_space(self.points, self.ranges[: self.m])
+        for r in rangespace:
+            dynamic.insert_range(r)
+        self.assertTrue(
+            is_fair_hittingset(
+                hitting_set=dynamic.hitting_set,
+                rangespace=self._live_rangespace(dynamic),
+                points=self.points,
+            )
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
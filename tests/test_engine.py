@@ -0,0 +1,107 @@
+import asyncio
+import os
+import tempfile
+import unittest
+import random
+
+from algorithms.engine import FairNetEngine
+from algorithms.engine_server import serve, request
+from algorithms.hittingset import HittingSetStrategy
+from core.verification import is_hitting_set
+from core.ranges import RectangleRange, get_range_space
+from core.points import Point
+from core.fairness import FairConfig, FairnessMeasure
+
+
+class TestFairNetEngine(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(42)  # For reproducibility
+
+        self.n = 2**9
+        self.m = 2**6
+        self.points = [
+            Point((random.uniform(0, 1), random.uniform(0, 1)), i % 2)
+            for i in range(self.n)
+        ]
+        self.epsilon = 0.5
+
+        self.ranges = [
+            RectangleRange(
+                random.uniform(0, 0.5),  # x_min
+                random.uniform(0.5, 1),  # x_max
+                random.uniform(0, 0.5),  # y_min
+                random.uniform(0.5, 1),  # y_max
+            )
+            for _ in range(self.m)
+        ]
+        self.engine = FairNetEngine(
+            self.points, fairconfig=FairConfig(k=2, fairness=FairnessMeasure.DP)
+        )
+
+    def test_range_space_cache(self):
+        rangespace = self.engine.get_range_space(self.ranges)
+        self.assertEqual(rangespace, get_range_space(self.points, self.ranges))
+        # Second call is served from the cache
+        self.assertIs(self.engine.get_range_space(self.ranges)[0], rangespace[0])
+
+        engine = FairNetEngine(self.points, max_cached_ranges=8)
+        engine.get_range_space(self.ranges)
+        self.assertEqual(engine.cache_info()["ranges"], 8)
+
+    def test_epsnet_and_hitting_set(self):
+        epsnet = self.engine.build_epsnet(
+            self.ranges, vc=self.ranges[0].vc_dim, epsilon=self.epsilon
+        )
+        self.assertTrue(self.engine.is_epsnet(epsnet, self.ranges, self.epsilon))
+
+        fair_epsnet = self.engine.build_fair_epsnet(
+            self.ranges, vc=self.ranges[0].vc_dim, epsilon=self.epsilon
+        )
+        self.assertTrue(
+            self.engine.is_fair_epsnet(fair_epsnet, self.ranges, self.epsilon)
+        )
+
+        hitting_set = self.engine.find_hitting_set(
+            self.ranges, strategy=HittingSetStrategy.GREEDY
+        )
+        self.assertTrue(
+            is_hitting_set(hitting_set, get_range_space(self.points, self.ranges))
+        )
+
+    def test_server(self):
+        message = {
+            "method": "find_hitting_set",
+            "strategy": "greedy",
+            "ranges": [
+                {"type": "rectangle", "xmin": r.xmin, "xmax": r.xmax, "ymin": r.ymin, "ymax": r.ymax}
+                for r in self.ranges
+            ],
+        }
+        path = os.path.join(tempfile.mkdtemp(), "engine.sock")
+
+        async def roundtrip():
+            server = asyncio.ensure_future(serve(self.engine, path=path, workers=2))
+            deadline = asyncio.get_running_loop().time() + 10
+            while not os.path.exists(path):
+                if server.done():
+                    server.result()  # Re-raise the server's error
+                if asyncio.get_running_loop().time() > deadline:
+                    server.cancel()
+                    self.fail("server did not start listening")
+                await asyncio.sleep(0.01)
+            reply = await request(message, path=path)
+            verify = {
+                "method": "is_hitting_set",
+                "ranges": message["ranges"],
+                "indices": reply["result"],
+            }
+            verified = await request(verify, path=path)
+            server.cancel()
+            return verified
+
+        self.assertTrue(asyncio.run(roundtrip())["result"])
+
+
+if __name__ == "__main__":
+    unittest.main()
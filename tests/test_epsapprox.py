@@ -0,0 +1,79 @@
+import unittest
+import random
+
+from algorithms.epsapprox import build_epsapprox, EpsApproximation
+from algorithms.epsnet import EpsNetStrategy
+from core.verification import is_epsapprox
+from core.ranges import RectangleRange, get_range_space
+from core.points import Point
+
+
+class TestEpsApprox(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(42)  # For reproducibility
+
+        self.n = 2**9
+        self.m = 2**5
+        self.points = [
+            Point((random.uniform(0, 1), random.uniform(0, 1)), random.randint(0, 1))
+            for _ in range(self.n)
+        ]
+        self.epsilon = 0.2
+
+        self.ranges = [
+            RectangleRange(
+                random.uniform(0, 0.5),  # x_min
+                random.uniform(0.5, 1),  # x_max
+                random.uniform(0, 0.5),  # y_min
+                random.uniform(0.5, 1),  # y_max
+            )
+            for _ in range(self.m)
+        ]
+
+        self.rangespace = get_range_space(self.points, self.ranges)
+
+    def test_epsapprox_sampling(self):
+        sample = build_epsapprox(
+            strategy=EpsNetStrategy.SAMPLE,
+            points=self.points,
+            rangespace=self.rangespace,
+            epsilon=self.epsilon,
+            vc=self.ranges[0].vc_dim,
+            success_prob=0.9,
+        )
+        self.assertTrue(
+            is_epsapprox(sample, self.rangespace, self.epsilon, self.points)
+        )
+
+    def test_epsapprox_discrepancy(self):
+        sample = build_epsapprox(
+            strategy=EpsNetStrategy.DISCREPANCY,
+            points=self.points,
+            rangespace=self.rangespace,
+            epsilon=self.epsilon,
+            vc=self.ranges[0].vc_dim,
+        )
+        self.assertTrue(
+            is_epsapprox(sample, self.rangespace, self.epsilon, self.points)
+        )
+
+    def test_epsapprox_queries(self):
+        sample = build_epsapprox(
+            strategy=EpsNetStrategy.SKETCH_MERGE,
+            points=self.points,
+            rangespace=self.rangespace,
+            epsilon=self.epsilon,
+            vc=self.ranges[0].vc_dim,
+        )
+        approx = EpsApproximation(sample)
+        for r, subset in zip(self.ranges, self.rangespace):
+            self.assertLessEqual(
+                abs(approx.estimate(r) - len(subset) / self.n), self.epsilon
+            )
+            by_color = approx.estimate_by_color(r)
+            self.assertEqual(set(by_color), {0, 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,10 @@
 import unittest
 import random
 
-from algorithms.epsnet import build_epsnet, EpsNetStrategy
-from core.verification import is_epsnet
-from core.ranges import RectangleRange, get_range_space
+from algorithms.epsnet import build_epsnet, EpsNetStrategy, HalvingStrategy, _random_halving
+from algorithms.epsnet import _best_of_k_halving
+from core.verification import is_epsnet, is_epsnet_fast, get_achieved_epsilon
+from core.ranges import RectangleRange, HyperRectangleRange, get_range_space
 from core.points import Point
 
 
@@ -73,6 +74,137 @@ class TestEpsNet(unittest.TestCase):
         )
         self.assertTrue(is_epsnet(epsnet, self.rangespace, self.epsilon))
 
+    def test_epsnet_sketch_merge_fan_in(self):
+        # 3 * 2^8 points: the number of partitions is not a power of fan_in
+        points = self.points[: 3 * 2**8]
+        rangespace = get_range_space(points, self.ranges)
+        for fan_in in (2, 4):
+            epsnet = build_epsnet(
+                strategy=EpsNetStrategy.SKETCH_MERGE,
+                points=points,
+                rangespace=rangespace,
+                epsilon=self.epsilon,
+                vc=self.ranges[0].vc_dim,
+                c1=0,
+                fan_in=fan_in,
+            )
+            self.assertTrue(is_epsnet(epsnet, rangespace, self.epsilon))
+
+    def test_best_of_k_halving(self):
+        weights = {p: 1 for p in self.points[:-1]}
+        _, half = _best_of_k_halving(self.points[:-1], self.rangespace, weights=weights, trials=8)
+        # The odd point out is kept and the weights are preserved
+        self.assertEqual(len(half), self.n // 2)
+        self.assertEqual(sum(weights[p] for p in half), self.n - 1)
+
+    def test_epsnet_best_of_k(self):
+        for strategy, c1 in ((EpsNetStrategy.DISCREPANCY, 1), (EpsNetStrategy.SKETCH_MERGE, 0)):
+            epsnet = build_epsnet(
+                strategy=strategy,
+                points=self.points,
+                rangespace=self.rangespace,
+                epsilon=self.epsilon,
+                vc=self.ranges[0].vc_dim,
+                c1=c1,
+                halving=HalvingStrategy.BEST_OF_K,
+            )
+            self.assertTrue(is_epsnet(epsnet, self.rangespace, self.epsilon))
+
+    def test_epsnet_las_vegas(self):
+        for workers, pick in [(None, "first"), (2, "smallest")]:
+            epsnet = build_epsnet(
+                strategy=EpsNetStrategy.LAS_VEGAS,
+                points=self.points,
+                rangespace=self.rangespace,
+                epsilon=self.epsilon,
+                vc=self.ranges[0].vc_dim,
+                success_prob=0.5,
+                trials=4,
+                workers=workers,
+                pick=pick,
+            )
+            self.assertTrue(
+                is_epsnet_fast(epsnet, self.points, self.rangespace, self.epsilon)
+            )
+            self.assertTrue(is_epsnet(epsnet, self.rangespace, self.epsilon))
+
+    def test_weighted_halving(self):
+        points = self.points[:101]
+        weights = {p: random.choice([1, 2, 5]) for p in points}
+        total = sum(weights.values())
+        _, half = _random_halving(points, self.rangespace, weights=weights)
+        # The odd point out is kept and the survivors carry their pair's weight
+        self.assertEqual(len(half), 51)
+        self.assertEqual(sum(weights[p] for p in half), total)
+
+    def test_epsnet_weighted_discrepancy(self):
+        epsnet = build_epsnet(
+            strategy=EpsNetStrategy.DISCREPANCY,
+            points=self.points,
+            rangespace=self.rangespace,
+            epsilon=self.epsilon,
+            vc=self.ranges[0].vc_dim,
+            weighted=True,
+        )
+        epsnet, weights = epsnet
+        self.assertTrue(is_epsnet(epsnet, self.rangespace, self.epsilon))
+        # The kept points carry the weight of all points
+        self.assertEqual(sum(weights), sum(p.weight for p in self.points))
+
+    def test_epsnet_weighted_sketch_merge(self):
+        epsnet, weights = build_epsnet(
+            strategy=EpsNetStrategy.SKETCH_MERGE,
+            points=self.points,
+            rangespace=self.rangespace,
+            epsilon=self.epsilon,
+            vc=self.ranges[0].vc_dim,
+            c1=0,
+            weighted=True,
+        )
+        self.assertEqual(len(weights), len(epsnet))
+        self.assertEqual(sum(weights), sum(p.weight for p in self.points))
+
+    def test_epsnet_kdtree(self):
+        epsilon = 0.2
+        # Arbitrary (also thin) rectangles and points on a grid, to get ties
+        points = [
+            Point((random.randint(0, 20) / 20, random.uniform(0, 1)), 0)
+            for _ in range(4 * self.n)
+        ]
+        ranges = []
+        for _ in range(self.m):
+            x1, x2 = sorted([random.uniform(0, 1), random.uniform(0, 1)])
+            y1, y2 = sorted([random.uniform(0, 1), random.uniform(0, 1)])
+            ranges.append(RectangleRange(x1, x2, y1, y2))
+        rangespace = get_range_space(points, ranges)
+        epsnet = build_epsnet(
+            strategy=EpsNetStrategy.KD_TREE,
+            points=points,
+            rangespace=rangespace,
+            epsilon=epsilon,
+        )
+        # The size only depends on epsilon
+        self.assertLess(len(epsnet), len(points) / 4)
+        self.assertLess(get_achieved_epsilon(epsnet, rangespace, len(points)), epsilon)
+
+    def test_epsnet_kdtree_hyperrectangles(self):
+        epsilon = 0.2
+        points = [
+            Point(tuple(random.uniform(0, 1) for _ in range(3)), 0) for _ in range(self.n)
+        ]
+        ranges = []
+        for _ in range(self.m):
+            bounds = [sorted([random.uniform(0, 1), random.uniform(0, 1)]) for _ in range(3)]
+            ranges.append(HyperRectangleRange([b[0] for b in bounds], [b[1] for b in bounds]))
+        rangespace = get_range_space(points, ranges)
+        epsnet = build_epsnet(
+            strategy=EpsNetStrategy.KD_TREE,
+            points=points,
+            rangespace=rangespace,
+            epsilon=epsilon,
+        )
+        self.assertLess(get_achieved_epsilon(epsnet, rangespace, len(points)), epsilon)
+
 
 if __name__ == "__main__":
     unittest.main()
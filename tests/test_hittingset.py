@@ -2,6 +2,7 @@ import unittest
 import random
 
 from algorithms.hittingset import find_hitting_set, HittingSetStrategy
+from algorithms.hittingset import _get_reweights, _get_reweights_cutting_plane
 from core.verification import is_hitting_set
 from core.ranges import RectangleRange, get_range_space
 from core.points import Point
@@ -42,6 +43,15 @@ class TestHittingSet(unittest.TestCase):
         )
         self.assertTrue(is_hitting_set(hitting_set, self.rangespace))
 
+    def test_hitting_set_quota_greedy(self):
+        # Without fairness the quota greedy runs the plain greedy
+        hitting_set = find_hitting_set(
+            strategy=HittingSetStrategy.QUOTA_GREEDY,
+            points=self.points,
+            rangespace=self.rangespace,
+        )
+        self.assertTrue(is_hitting_set(hitting_set, self.rangespace))
+
     def test_hitting_set_geometric(self):
         hitting_set = find_hitting_set(
             strategy=HittingSetStrategy.GEOMETRIC,
@@ -51,6 +61,32 @@ class TestHittingSet(unittest.TestCase):
         )
         self.assertTrue(is_hitting_set(hitting_set, self.rangespace))
 
+    def test_hitting_set_parallel_greedy(self):
+        hitting_set = find_hitting_set(
+            strategy=HittingSetStrategy.PARALLEL_GREEDY,
+            points=self.points,
+            rangespace=self.rangespace,
+            workers=2,
+        )
+        self.assertTrue(is_hitting_set(hitting_set, self.rangespace))
+
+    def test_hitting_set_geometric_constraint_generation(self):
+        hitting_set = find_hitting_set(
+            strategy=HittingSetStrategy.GEOMETRIC,
+            points=self.points,
+            rangespace=self.rangespace,
+            vc=self.ranges[0].vc_dim,
+            constraint_generation=True,
+        )
+        self.assertTrue(is_hitting_set(hitting_set, self.rangespace))
+
+        # Same optimum as the full LP
+        _, epsilon = _get_reweights(self.points, self.rangespace)
+        _, epsilon_cg = _get_reweights_cutting_plane(
+            self.points, self.rangespace, sample_size=16
+        )
+        self.assertAlmostEqual(epsilon, epsilon_cg, places=6)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,94 @@
+import importlib.util
+import os
+import random
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from algorithms.cli import main
+from core.loaders import PointArray, load_points, load_ranges
+from core.ranges import get_range_space
+from core.verification import is_epsnet, is_hitting_set
+
+
+class TestLoaders(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(42)  # For reproducibility
+        rng = np.random.default_rng(42)
+
+        self.n = 2**9
+        self.m = 2**5
+        self.coords = rng.uniform(0, 1, size=(self.n, 2))
+        self.colors = rng.integers(0, 2, size=self.n)
+        lows = rng.uniform(0, 0.5, size=(self.m, 2))
+        highs = rng.uniform(0.5, 1, size=(self.m, 2))
+        self.rectangles = np.hstack([lows, highs])  # mins, then maxs
+
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = lambda name: os.path.join(self.dir.name, name)
+        np.save(self.path("points.npy"), self.coords)
+        np.save(self.path("colors.npy"), self.colors)
+        np.save(self.path("ranges.npy"), self.rectangles)
+        pd.DataFrame(
+            {"color": self.colors, "y": self.coords[:, 1], "x": self.coords[:, 0]}
+        ).to_csv(self.path("points.csv"), index=False)
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_npy_and_csv(self):
+        from_npy = load_points(self.path("points.npy"), colors_path=self.path("colors.npy"))
+        self.assertIsInstance(from_npy.coords, np.memmap)
+        from_csv = load_points(
+            self.path("points.csv"), coord_columns=["x", "y"], color_column="color", chunksize=100
+        )
+        for points in (from_npy, from_csv):
+            self.assertEqual(len(points), self.n)
+            np.testing.assert_allclose(points.coords, self.coords)
+            np.testing.assert_array_equal(points.colors, self.colors)
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow is not installed")
+    def test_parquet(self):
+        pd.DataFrame({"x": self.coords[:, 0], "y": self.coords[:, 1]}).to_parquet(
+            self.path("points.parquet")
+        )
+        points = load_points(self.path("points.parquet"), coord_columns=["x", "y"])
+        np.testing.assert_allclose(points.coords, self.coords)
+
+    def test_range_space(self):
+        point_array = PointArray(self.coords, self.colors)
+        ranges = load_ranges(self.path("ranges.npy"), "rectangle").to_ranges()
+        points = point_array.to_points()
+        self.assertEqual(point_array.get_range_space(ranges), get_range_space(points, ranges))
+        lazy = point_array.get_range_space(ranges, lazy=True)
+        self.assertEqual(lazy.computed, 0)
+        self.assertEqual(list(lazy), get_range_space(points, ranges))
+
+    def test_cli(self):
+        rows = PointArray(self.coords, self.colors).to_points()
+        ranges = load_ranges(self.path("ranges.npy"), "rectangle").to_ranges()
+        rangespace = get_range_space(rows, ranges)
+        common = [
+            "--points", self.path("points.npy"),
+            "--colors", self.path("colors.npy"),
+            "--ranges", self.path("ranges.npy"),
+            "--range-kind", "rectangle",
+        ]
+
+        main(["epsnet", *common, "--vc", "4", "--epsilon", "0.5", "--output", self.path("net.npy")])
+        indices = np.load(self.path("net.npy"))
+        self.assertTrue(is_epsnet([rows[i] for i in indices], rangespace, 0.5))
+
+        main(["epsnet", *common, "--strategy", "sample", "--vc", "4", "--epsilon", "0.5", "--output", self.path("net.npy")])
+        self.assertGreater(len(np.load(self.path("net.npy"))), 0)
+
+        main(["hitting-set", *common, "--strategy", "greedy", "--fair", "2", "--output", self.path("hs.txt")])
+        indices = np.loadtxt(self.path("hs.txt"), dtype=np.int64, ndmin=1)
+        self.assertTrue(is_hitting_set([rows[i] for i in indices], rangespace))
+
+
+if __name__ == "__main__":
+    unittest.main()
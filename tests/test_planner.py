@@ -0,0 +1,133 @@
+import unittest
+import random
+
+from algorithms.epsnet import build_epsnet, EpsNetStrategy
+from algorithms.hittingset import find_hitting_set, HittingSetStrategy
+from algorithms.planner import plan_epsnet, plan_hitting_set, STATS_ROWS
+from algorithms.fairness.fair_epsnet import build_fair_epsnet
+from algorithms.fairness.fair_hittingset import find_fair_hitting_set
+from core.fairness import FairConfig, FairnessMeasure
+from core.verification import is_epsnet, is_hitting_set
+from core.ranges import RectangleRange, get_range_space
+from core.points import Point
+
+
+class TestPlanner(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(42)  # For reproducibility
+
+        self.n = 2**9
+        self.m = 2**6
+        self.vc = 4
+        self.epsilon = 0.5
+        self.points = [
+            Point((random.uniform(0, 1), random.uniform(0, 1)), random.randint(0, 1))
+            for _ in range(self.n)
+        ]
+        self.ranges = [
+            RectangleRange(
+                random.uniform(0, 0.5),  # x_min
+                random.uniform(0.5, 1),  # x_max
+                random.uniform(0, 0.5),  # y_min
+                random.uniform(0.5, 1),  # y_max
+            )
+            for _ in range(self.m)
+        ]
+        self.rangespace = get_range_space(self.points, self.ranges)
+        self.fairconfig = FairConfig(2, FairnessMeasure.DP)
+
+    def test_plan_respects_guarantee(self):
+        plan = plan_epsnet(self.points, self.rangespace, self.vc, self.epsilon)
+        self.assertEqual(min(plan.estimates.values()), plan.estimates[plan.strategy])
+
+        # Only sizes are used by the cost model
+        large_points = list(range(2**16))
+        large_rangespace = [set(range(2**12))] * 2**8
+        plan = plan_epsnet(large_points, large_rangespace, self.vc, self.epsilon)
+        self.assertEqual(plan.strategy, EpsNetStrategy.SAMPLE)
+        plan = plan_epsnet(
+            large_points, large_rangespace, self.vc, self.epsilon, guarantee="verified"
+        )
+        self.assertEqual(plan.strategy, EpsNetStrategy.LAS_VEGAS)
+
+        plan = plan_epsnet(
+            self.points, self.rangespace, self.vc, self.epsilon, guarantee="deterministic",
+            ranges=self.ranges,
+        )
+        self.assertEqual(plan.strategy, EpsNetStrategy.KD_TREE)
+        self.assertNotIn(EpsNetStrategy.SAMPLE, plan.estimates)
+        self.assertNotIn(EpsNetStrategy.DISCREPANCY, plan.estimates)
+        # The k-d tree net needs box ranges
+        with self.assertRaises(ValueError):
+            plan_epsnet(self.points, self.rangespace, self.vc, self.epsilon, guarantee="deterministic")
+
+        plan = plan_hitting_set(self.points, self.rangespace)
+        self.assertNotIn(HittingSetStrategy.GEOMETRIC, plan.estimates)
+        self.assertEqual(plan.stats["I"], sum(len(r) for r in self.rangespace))
+
+    def test_lazy_rangespace_stats(self):
+        # The incidence size of a lazy range space is estimated from STATS_ROWS rows
+        ranges = self.ranges * 4
+        rangespace = get_range_space(self.points, ranges, lazy=True)
+        plan = plan_epsnet(self.points, rangespace, self.vc, self.epsilon)
+        self.assertEqual(rangespace.computed, STATS_ROWS)
+        exact = 4 * sum(len(r) for r in self.rangespace)
+        self.assertAlmostEqual(plan.stats["I"] / exact, 1, delta=0.1)
+
+    def test_epsnet_auto(self):
+        for guarantee in ("probabilistic", "verified", "deterministic"):
+            epsnet = build_epsnet(
+                strategy=EpsNetStrategy.AUTO,
+                points=self.points,
+                rangespace=self.rangespace,
+                vc=self.vc,
+                epsilon=self.epsilon,
+                guarantee=guarantee,
+                ranges=self.ranges,
+            )
+            self.assertTrue(is_epsnet(epsnet, self.rangespace, self.epsilon))
+
+    def test_auto_rejects_unknown_kwargs(self):
+        # Dropped only if another candidate builder accepts them
+        with self.assertRaises(TypeError):
+            build_epsnet(
+                strategy=EpsNetStrategy.AUTO,
+                points=self.points,
+                rangespace=self.rangespace,
+                vc=self.vc,
+                epsilon=self.epsilon,
+                epsilonn=0.1,
+            )
+
+    def test_hitting_set_auto(self):
+        hitting_set = find_hitting_set(
+            strategy=HittingSetStrategy.AUTO,
+            points=self.points,
+            rangespace=self.rangespace,
+        )
+        self.assertTrue(is_hitting_set(hitting_set, self.rangespace))
+
+    def test_fair_auto(self):
+        epsnet = build_fair_epsnet(
+            strategy=EpsNetStrategy.AUTO,
+            fairconfig=self.fairconfig,
+            points=self.points,
+            rangespace=self.rangespace,
+            vc=self.vc,
+            epsilon=self.epsilon,
+        )
+        self.assertTrue(is_epsnet(epsnet, self.rangespace, self.epsilon))
+
+        hitting_set = find_fair_hitting_set(
+            strategy=HittingSetStrategy.AUTO,
+            fairconfig=self.fairconfig,
+            points=self.points,
+            rangespace=self.rangespace,
+            vc=self.vc,
+        )
+        self.assertTrue(is_hitting_set(hitting_set, self.rangespace))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+import random
+
+from algorithms.hittingset import find_hitting_set, HittingSetStrategy
+from core import profiling
+from core.profiling import phase, profile_memory
+from core.ranges import RectangleRange, get_range_space
+from core.points import Point
+
+
+class TestProfiling(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(42)  # For reproducibility
+
+        self.n = 2**9
+        self.m = 2**7
+        self.points = [
+            Point((random.uniform(0, 1), random.uniform(0, 1)), 0) for _ in range(self.n)
+        ]
+        self.ranges = [
+            RectangleRange(
+                random.uniform(0, 0.5),  # x_min
+                random.uniform(0.5, 1),  # x_max
+                random.uniform(0, 0.5),  # y_min
+                random.uniform(0.5, 1),  # y_max
+            )
+            for _ in range(self.m)
+        ]
+
+    def test_inactive_phase(self):
+        with phase("nothing"):
+            pass
+        self.assertIsNone(profiling._active)
+
+    def test_phases(self):
+        def run():
+            rangespace = get_range_space(self.points, self.ranges)
+            return find_hitting_set(
+                strategy=HittingSetStrategy.GEOMETRIC,
+                points=self.points,
+                rangespace=rangespace,
+                vc=4,
+            )
+
+        hitting_set, report = profile_memory(run)
+        self.assertGreater(len(hitting_set), 0)
+        self.assertIsNone(profiling._active)
+        for name in ("run", "get_range_space", "lp_reweights"):
+            self.assertIn(name, report)
+            self.assertEqual(report[name].calls, 1)
+        # The dense LP matrix alone is m x n float64
+        self.assertGreaterEqual(report["lp_reweights"].peak, self.m * self.n * 8)
+        self.assertGreaterEqual(report["run"].peak, report["lp_reweights"].peak)
+        # The range space is kept, the LP matrix is not
+        self.assertGreater(report["get_range_space"].retained, 0)
+        self.assertLess(report["lp_reweights"].retained, self.m * self.n * 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+import random
+
+from algorithms.epsnet import build_epsnet, EpsNetStrategy, _random_halving
+from algorithms.hittingset import find_hitting_set, HittingSetStrategy
+from algorithms.fairness.fair_epsnet import build_fair_epsnet
+from core.fairness import FairConfig
+from core.ranges import RangeSpace, RectangleRange, get_range_space
+from core.verification import is_epsnet, is_hitting_set
+from core.points import Point
+
+
+class TestRangeSpace(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(42)  # For reproducibility
+
+        self.n = 2**9
+        self.m = 2**6
+        self.vc = 4
+        self.epsilon = 0.7
+        self.points = [
+            Point((random.uniform(0, 1), random.uniform(0, 1)), random.randint(0, 1))
+            for _ in range(self.n)
+        ]
+        self.ranges = [
+            RectangleRange(
+                random.uniform(0, 0.5),  # x_min
+                random.uniform(0.5, 1),  # x_max
+                random.uniform(0, 0.5),  # y_min
+                random.uniform(0.5, 1),  # y_max
+            )
+            for _ in range(self.m)
+        ]
+        self.rangespace = get_range_space(self.points, self.ranges)
+
+    def test_rows(self):
+        lazy = get_range_space(self.points, self.ranges, lazy=True, max_cached=8)
+        self.assertIsInstance(lazy, RangeSpace)
+        self.assertEqual(len(lazy), self.m)
+        self.assertEqual(lazy.computed, 0)
+        self.assertEqual(lazy[3], self.rangespace[3])
+        self.assertEqual(lazy[-1], self.rangespace[-1])
+        self.assertEqual(lazy[3:5], self.rangespace[3:5])
+        self.assertEqual(list(lazy), self.rangespace)
+        self.assertEqual(lazy.cache_info()["rows"], 8)
+
+    def test_sampling_skips_construction(self):
+        lazy = get_range_space(self.points, self.ranges, lazy=True)
+        epsnet = build_epsnet(
+            strategy=EpsNetStrategy.SAMPLE,
+            points=self.points,
+            rangespace=lazy,
+            vc=self.vc,
+            epsilon=self.epsilon,
+        )
+        build_fair_epsnet(
+            strategy=EpsNetStrategy.SAMPLE,
+            fairconfig=FairConfig(2),
+            points=self.points,
+            rangespace=lazy,
+            vc=self.vc,
+            epsilon=self.epsilon,
+            color_ratios=[0.5, 0.5],
+        )
+        self.assertEqual(lazy.computed, 0)
+        self.assertTrue(is_epsnet(epsnet, lazy, self.epsilon))
+
+    def test_same_results(self):
+        for strategy in (EpsNetStrategy.DISCREPANCY, EpsNetStrategy.LAS_VEGAS):
+            results = []
+            for rangespace in (self.rangespace, RangeSpace(self.points, self.ranges)):
+                random.seed(1)
+                results.append(
+                    build_epsnet(
+                        strategy=strategy,
+                        points=self.points,
+                        rangespace=rangespace,
+                        vc=self.vc,
+                        epsilon=self.epsilon,
+                    )
+                )
+            self.assertEqual(results[0], results[1])
+
+        hitting_set = find_hitting_set(
+            strategy=HittingSetStrategy.GREEDY,
+            points=self.points,
+            rangespace=RangeSpace(self.points, self.ranges),
+        )
+        self.assertTrue(is_hitting_set(hitting_set, self.rangespace))
+
+    def test_halving_reads_rows_once(self):
+        # Far fewer cached rows than ranges: every row is computed once per halving
+        lazy = get_range_space(self.points, self.ranges, lazy=True, max_cached=4)
+        random.seed(1)
+        _, half = _random_halving(self.points, lazy)
+        self.assertEqual(len(half), self.n // 2)
+        self.assertEqual(lazy.computed, self.m)
+
+
+if __name__ == "__main__":
+    unittest.main()
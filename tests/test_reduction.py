@@ -0,0 +1,138 @@
+import unittest
+import random
+
+from algorithms.hittingset import find_hitting_set, HittingSetStrategy
+from core.reduction import dedupe_ranges, prune_dominated_ranges, collapse_points, prune_candidates
+from core.reduction import expand_weights
+from core.verification import is_hitting_set
+from core.ranges import RectangleRange, HalfspaceRange, BallRange, get_range_space
+from core.points import Point
+
+
+class TestReduction(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(42)  # For reproducibility
+
+        self.n = 2**8
+        self.m = 2**6
+        # Every location is used by two points
+        locations = [(random.uniform(0, 1), random.uniform(0, 1)) for _ in range(self.n // 2)]
+        self.points = [Point(xy, 0) for xy in locations] + [Point(xy, 0) for xy in locations]
+
+        self.ranges = [
+            RectangleRange(
+                random.uniform(0, 0.5),  # x_min
+                random.uniform(0.5, 1),  # x_max
+                random.uniform(0, 0.5),  # y_min
+                random.uniform(0.5, 1),  # y_max
+            )
+            for _ in range(self.m)
+        ]
+        self.ranges += self.ranges[: self.m // 2]  # duplicated ranges
+
+        self.rangespace = get_range_space(self.points, self.ranges)
+
+    def test_dedupe_and_prune(self):
+        unique, mapping = dedupe_ranges(self.rangespace)
+        self.assertLessEqual(len(unique), self.m)
+        for r, i in zip(self.rangespace, mapping):
+            self.assertEqual(r, unique[i])
+
+        kept = prune_dominated_ranges(unique)
+        for r in kept:
+            self.assertFalse(any(s < r for s in kept))
+        # Every original range contains a kept one
+        for r in self.rangespace:
+            self.assertTrue(any(s <= r for s in kept))
+
+    def test_collapse_points(self):
+        representatives, rangespace, weights = collapse_points(self.points, self.rangespace)
+        self.assertEqual(len(representatives), self.n // 2)
+        self.assertEqual(weights, [2] * (self.n // 2))
+        for r, collapsed in zip(self.rangespace, rangespace):
+            self.assertEqual(len(collapsed), len(r) // 2)
+
+    def test_expand_weights(self):
+        representatives, _, multiplicities = collapse_points(self.points, self.rangespace)
+        rep_weights = [random.uniform(0, 1) for _ in representatives]
+        expanded = expand_weights(self.points, representatives, rep_weights, multiplicities)
+        # Both copies of a location share the weight of their representative
+        half = self.n // 2
+        for i in range(half):
+            self.assertAlmostEqual(expanded[i], rep_weights[i] / 2)
+            self.assertAlmostEqual(expanded[half + i], rep_weights[i] / 2)
+
+    def test_hitting_set_greedy_reduced(self):
+        hitting_set = find_hitting_set(
+            strategy=HittingSetStrategy.GREEDY,
+            points=self.points,
+            rangespace=self.rangespace,
+            reduce=True,
+        )
+        self.assertTrue(is_hitting_set(hitting_set, self.rangespace))
+
+    def test_hitting_set_geometric_reduced(self):
+        hitting_set = find_hitting_set(
+            strategy=HittingSetStrategy.GEOMETRIC,
+            points=self.points,
+            rangespace=self.rangespace,
+            vc=self.ranges[0].vc_dim,
+            reduce=True,
+        )
+        self.assertTrue(is_hitting_set(hitting_set, self.rangespace))
+
+    def test_prune_candidates_halfspaces(self):
+        ranges = []
+        for _ in range(self.m):
+            a = (random.uniform(-1, 1), random.uniform(-1, 1))
+            ranges.append(HalfspaceRange(a, random.uniform(-1, 0.5)))
+        rangespace = get_range_space(self.points, ranges)
+        # The greedy needs non-empty ranges
+        ranges = [h for h, r in zip(ranges, rangespace) if r]
+        rangespace = [r for r in rangespace if r]
+        candidates, restricted = prune_candidates(self.points, rangespace, ranges)
+        self.assertLess(len(candidates), len(self.points) // 4)
+        for r, kept in zip(rangespace, restricted):
+            self.assertTrue(kept <= r)
+            self.assertEqual(bool(kept), bool(r))
+
+        for strategy, kwargs in [
+            (HittingSetStrategy.GREEDY, {}),
+            (HittingSetStrategy.GEOMETRIC, {"vc": 3}),
+        ]:
+            hitting_set = find_hitting_set(
+                strategy=strategy,
+                points=self.points,
+                rangespace=rangespace,
+                ranges=ranges,
+                **kwargs,
+            )
+            self.assertTrue(set(hitting_set) <= set(candidates))
+            self.assertTrue(is_hitting_set(hitting_set, rangespace))
+
+    def test_prune_candidates_anchored_rectangles(self):
+        # Anchored at the lower left corner: only the staircase of minimal points is needed
+        ranges = [
+            RectangleRange(-1, random.uniform(0, 1), -1, random.uniform(0, 1))
+            for _ in range(self.m)
+        ]
+        rangespace = get_range_space(self.points, ranges)
+        candidates, restricted = prune_candidates(self.points, rangespace, ranges)
+        self.assertLess(len(candidates), len(self.points) // 4)
+        for c in candidates:
+            self.assertFalse(
+                any(q.point[0] <= c.point[0] and q.point[1] <= c.point[1] and q.point != c.point for q in self.points)
+            )
+        for r, kept in zip(rangespace, restricted):
+            self.assertEqual(bool(kept), bool(r))
+
+    def test_prune_candidates_other_ranges(self):
+        ranges = self.ranges[:4] + [BallRange(Point((0.5, 0.5), None), 0.2)]
+        rangespace = get_range_space(self.points, ranges)
+        candidates, _ = prune_candidates(self.points, rangespace, ranges)
+        self.assertEqual(len(candidates), len(self.points))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+import random
+
+from core.stabbing import RangeStabbingIndex, extend_range_space
+from core.ranges import (
+    RectangleRange,
+    HyperRectangleRange,
+    BallRange,
+    HalfspaceRange,
+    get_range_space,
+)
+from core.points import Point
+
+
+class TestStabbing(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(42)  # For reproducibility
+
+        self.n = 2**9
+        self.m = 2**8
+        self.points = [
+            Point((random.uniform(0, 1), random.uniform(0, 1)), 0) for _ in range(self.n)
+        ]
+        self.ranges = [
+            RectangleRange(
+                random.uniform(0, 0.5),  # x_min
+                random.uniform(0.5, 1),  # x_max
+                random.uniform(0, 0.5),  # y_min
+                random.uniform(0.5, 1),  # y_max
+            )
+            for _ in range(self.m)
+        ]
+        small = []
+        for _ in range(self.m):
+            x, y = random.uniform(0, 1), random.uniform(0, 1)
+            small.append(RectangleRange(x, x + 0.05, y, y + 0.05))
+        balls = [
+            BallRange(Point((random.uniform(0, 1), random.uniform(0, 1)), None), random.uniform(0, 0.2))
+            for _ in range(self.m)
+        ]
+        halfspaces = [HalfspaceRange([1, 1], random.uniform(0, 2)) for _ in range(8)]
+        self.ranges += small + balls + halfspaces
+
+    def test_stab(self):
+        index = RangeStabbingIndex(self.ranges)
+        self.assertEqual(len(index.unbounded), 8)
+        for p in self.points[:100]:
+            expected = [j for j, r in enumerate(self.ranges) if r.contains(p)]
+            self.assertEqual(index.stab(p), expected)
+
+    def test_hyperrectangles(self):
+        ranges = []
+        for _ in range(self.m):
+            mins = [random.uniform(0, 0.8) for _ in range(3)]
+            ranges.append(HyperRectangleRange(mins, [x + 0.2 for x in mins]))
+        index = RangeStabbingIndex(ranges, node_size=4)
+        for _ in range(100):
+            p = Point(tuple(random.uniform(0, 1) for _ in range(3)), 0)
+            self.assertEqual(index.stab(p), [j for j, r in enumerate(ranges) if r.contains(p)])
+
+        single = RangeStabbingIndex(ranges[:1])
+        self.assertEqual(single.stab(p), [0] if ranges[0].contains(p) else [])
+
+    def test_extend_range_space(self):
+        old, new = self.points[: self.n // 2], self.points[self.n // 2 :]
+        rangespace = get_range_space(old, self.ranges)
+        hits = extend_range_space(rangespace, RangeStabbingIndex(self.ranges), new)
+        self.assertEqual(rangespace, get_range_space(self.points, self.ranges))
+        self.assertEqual(len(hits), len(new))
+
+
+if __name__ == "__main__":
+    unittest.main()
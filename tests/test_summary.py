@@ -0,0 +1,130 @@
+import unittest
+import random
+
+from algorithms.summary import EpsNetSummary, build_summary, merge, build_epsnet_sharded
+from algorithms.summary import reduce_summaries_to_root, merge_many
+from algorithms.epsnet import build_epsnet_sample
+from core.verification import is_epsnet_counting
+from core.ranges import RectangleRange
+from core.points import Point
+from core.fairness import FairConfig, FairnessMeasure
+
+
+class TestEpsNetSummary(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(42)  # For reproducibility
+
+        self.n = 2**9
+        self.m = 2**5
+        self.points = [
+            Point((random.uniform(0, 1), random.uniform(0, 1)), i % 2)
+            for i in range(self.n)
+        ]
+        self.epsilon = 0.7
+
+        self.ranges = [
+            RectangleRange(
+                random.uniform(0, 0.5),  # x_min
+                random.uniform(0.5, 1),  # x_max
+                random.uniform(0, 0.5),  # y_min
+                random.uniform(0.5, 1),  # y_max
+            )
+            for _ in range(self.m)
+        ]
+        self.shards = [self.points[i : i + 128] for i in range(0, self.n, 128)]
+
+    def test_encoding(self):
+        summary = build_summary(self.shards[0], self.ranges, size=32)
+        decoded = EpsNetSummary.from_bytes(summary.to_bytes())
+        self.assertEqual(decoded.level, summary.level)
+        self.assertEqual(decoded.weights, summary.weights)
+        self.assertEqual(
+            [(p.point, p.color) for p in decoded.points],
+            [(tuple(p.point), p.color) for p in summary.points],
+        )
+
+    def test_merge_levels(self):
+        a = build_summary(self.shards[0], self.ranges, size=32)
+        b = build_summary(self.shards[1], self.ranges, size=64)
+        merged = merge(a, b, self.ranges)
+        self.assertEqual(merged.level, max(a.level, b.level) + 1)
+        self.assertEqual(len(merged), 32)
+
+    def test_epsnet_sharded(self):
+        epsnet = build_epsnet_sharded(
+            self.shards,
+            self.ranges,
+            vc=self.ranges[0].vc_dim,
+            epsilon=self.epsilon,
+            workers=2,
+        )
+        self.assertTrue(
+            is_epsnet_counting(epsnet, self.points, self.ranges, self.epsilon)
+        )
+
+    def test_fair_epsnet_sharded(self):
+        fairconfig = FairConfig(k=2, fairness=FairnessMeasure.DP)
+        epsnet = build_epsnet_sharded(
+            self.shards,
+            self.ranges,
+            vc=self.ranges[0].vc_dim,
+            epsilon=self.epsilon,
+            fairconfig=fairconfig,
+        )
+        self.assertTrue(
+            is_epsnet_counting(epsnet, self.points, self.ranges, self.epsilon)
+        )
+        red = len([p for p in epsnet if p.color == 1])
+        self.assertEqual(red, len(epsnet) - red)
+
+    def test_weighted_merge(self):
+        # Uneven shards, merged directly without halving the smaller one first
+        a = build_summary(self.points[:400], self.ranges, size=64, weighted=True)
+        b = build_summary(self.points[400:], self.ranges, size=64, weighted=True)
+        self.assertNotEqual(a.level, b.level)
+        self.assertAlmostEqual(sum(a.weights), 400)
+        merged = merge(a, b, self.ranges, weighted=True)
+        self.assertEqual(len(merged), (len(a) + len(b) + 1) // 2)
+        self.assertAlmostEqual(sum(merged.weights), self.n)
+
+    def test_merge_many(self):
+        summaries = [build_summary(s, self.ranges, size=32) for s in self.shards[:3]]
+        merged = merge_many(summaries, self.ranges)
+        self.assertEqual(len(merged), 24)  # 96 -> 48 -> 24
+        self.assertEqual(merged.level, summaries[0].level + 2)
+
+    def test_epsnet_sharded_fan_in(self):
+        epsnet = build_epsnet_sharded(
+            self.shards,
+            self.ranges,
+            vc=self.ranges[0].vc_dim,
+            epsilon=self.epsilon,
+            fan_in=3,
+        )
+        self.assertTrue(
+            is_epsnet_counting(epsnet, self.points, self.ranges, self.epsilon)
+        )
+
+    def test_weighted_root_as_sample_input(self):
+        shards = [self.points[:300], self.points[300:420], self.points[420:]]
+        summaries = [build_summary(s, self.ranges, size=32, weighted=True) for s in shards]
+        root = reduce_summaries_to_root(
+            summaries, self.ranges, vc=self.ranges[0].vc_dim, epsilon=self.epsilon, weighted=True
+        )
+        self.assertAlmostEqual(sum(root.weights), self.n)
+        self.assertTrue(
+            is_epsnet_counting(root.points, self.points, self.ranges, self.epsilon)
+        )
+        sample = build_epsnet_sample(
+            points=root.points,
+            rangespace=None,
+            vc=self.ranges[0].vc_dim,
+            epsilon=self.epsilon,
+            weights=root.weights,
+        )
+        self.assertTrue(set(sample) <= set(root.points))
+
+
+if __name__ == "__main__":
+    unittest.main()